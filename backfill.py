@@ -0,0 +1,209 @@
+# backfill.py
+"""
+과거 영수증·은행 메모 일괄 입력 (화면 없이 실행하는 배치 작업).
+
+    uv run python backfill.py <폴더 | 파일.csv> [--spender 공동] [--batch-size 8]
+    uv run python backfill.py receipts/ --dry-run          # 저장 없이 추출 결과만 확인
+
+- 폴더: *.jpg/*.jpeg/*.png 영수증 + *.txt 메모(빈 줄 제외 한 줄 = 메모 1건)
+- CSV : memo(또는 text/내용) 열 필수, date·spender 열은 선택 (date는 메모 앞에 붙여 힌트로 전달)
+- 입력을 batch-size개씩 묶어 한 요청으로 보내고, 묶음들은 GEMINI_LIMITER 한도 안에서 동시에 처리합니다.
+- 묶음이 저장될 때마다 체크포인트(<입력>.backfill.json)를 갱신해, 중단 후 다시 실행하면 남은 입력부터 이어갑니다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+from datetime import date
+
+import llm
+from config import get_flat_categories
+from core import metrics
+from core.extraction import build_batch_prompt, build_expense_schema, salvage_items, to_entry
+from core.receipt import submit_preprocess
+from database import get_categories, init_db, insert_expense
+
+SITE = "backfill"
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+MEMO_COLUMNS = ("memo", "text", "내용", "메모")
+
+
+# ── 입력 수집 ───────────────────────────────────────────────────
+
+def collect_inputs(source: str, default_spender: str) -> list[dict]:
+    """입력 → [{key, kind: 'text'|'image', text|path, spender}] (key는 체크포인트 식별자)."""
+    inputs = []
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if name.lower().endswith(IMAGE_EXTS):
+                inputs.append({"key": name, "kind": "image", "path": path, "spender": default_spender})
+            elif name.lower().endswith(".txt"):
+                with open(path, encoding="utf-8") as f:
+                    for lineno, line in enumerate(f, 1):
+                        if line.strip():
+                            inputs.append({
+                                "key": f"{name}:{lineno}", "kind": "text",
+                                "text": line.strip(), "spender": default_spender,
+                            })
+    else:
+        with open(source, encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            memo_col = next((c for c in MEMO_COLUMNS if c in (reader.fieldnames or [])), None)
+            if memo_col is None:
+                raise ValueError(f"CSV에 메모 열이 없습니다. 다음 중 하나가 필요합니다: {', '.join(MEMO_COLUMNS)}")
+            for rowno, row in enumerate(reader, 2):
+                memo = (row.get(memo_col) or "").strip()
+                if not memo:
+                    continue
+                if row.get("date"):
+                    memo = f"{row['date']} {memo}"
+                inputs.append({
+                    "key": f"row:{rowno}", "kind": "text", "text": memo,
+                    "spender": row.get("spender") or default_spender,
+                })
+    return inputs
+
+
+# ── 체크포인트 ─────────────────────────────────────────────────
+
+class Checkpoint:
+    """처리 완료된 입력 key 목록을 JSON 파일에 보관. 묶음 저장 직후 원자적으로(rename) 갱신."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: set[str] = set()
+        self.failed: dict[str, str] = {}
+        self.inserted = 0
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.done = set(state.get("done", []))
+            self.failed = state.get("failed", {})
+            self.inserted = state.get("inserted", 0)
+
+    def mark(self, keys: list[str], inserted: int) -> None:
+        self.done.update(keys)
+        for key in keys:
+            self.failed.pop(key, None)
+        self.inserted += inserted
+        self.save()
+
+    def fail(self, keys: list[str], error: str) -> None:
+        for key in keys:
+            self.failed[key] = error
+        self.save()
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"done": sorted(self.done), "failed": self.failed, "inserted": self.inserted},
+                f, ensure_ascii=False, indent=1,
+            )
+        os.replace(tmp, self.path)
+
+
+# ── 묶음 처리 ──────────────────────────────────────────────────
+
+async def extract_batch(batch: list[dict], categories: list[str], today_str: str) -> list[dict]:
+    """입력 묶음 1개 → expenses 행 리스트. source 번호로 입력별 spender를 되찾습니다."""
+    labels, images = [], []
+    for item in batch:
+        if item["kind"] == "image":
+            prepared = await asyncio.wrap_future(submit_preprocess(item["path"], site=SITE))
+            images.append(llm.image_part(prepared["data"], prepared["mime_type"]))
+            labels.append(f"(이미지 {len(images)}번째 첨부: {os.path.basename(item['path'])})")
+        else:
+            labels.append(item["text"])
+
+    prompt = build_batch_prompt(categories, today_str, int(today_str[:4]), labels)
+    text = await llm.agenerate(
+        [prompt.user, *images], site=SITE,
+        schema=build_expense_schema(categories, with_source=True), system=prompt.system,
+    )
+    items, failed = salvage_items(text)
+    metrics.record(SITE, "parse_failure", 1 if failed else 0)
+
+    entries = []
+    for obj in items:
+        source = obj.get("source")
+        owner = batch[source] if isinstance(source, int) and 0 <= source < len(batch) else batch[0]
+        entries.append(to_entry(obj, owner["spender"], today_str))
+    return entries
+
+
+async def run(inputs: list[dict], checkpoint: Checkpoint, batch_size: int, dry_run: bool) -> dict:
+    categories = get_categories() or get_flat_categories()
+    today_str = date.today().isoformat()
+    pending = [item for item in inputs if item["key"] not in checkpoint.done]
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    started = time.perf_counter()
+    totals = {"inputs": len(pending), "skipped": len(inputs) - len(pending), "items": 0, "failed": 0}
+
+    async def worker(batch):
+        keys = [item["key"] for item in batch]
+        try:
+            entries = await extract_batch(batch, categories, today_str)
+        except Exception as e:
+            checkpoint.fail(keys, str(e)[:200])
+            totals["failed"] += len(batch)
+            print(f"  ✗ {keys[0]} 외 {len(keys) - 1}건: {e}")
+            return
+        if dry_run:
+            for entry in entries:
+                print(f"  {entry['date']}  {entry['item']:<20} {entry['amount']:>10,}  {entry['category']}")
+        elif not await asyncio.to_thread(insert_expense, entries):
+            checkpoint.fail(keys, "DB 저장 실패")
+            totals["failed"] += len(batch)
+            return
+        if not dry_run:
+            checkpoint.mark(keys, len(entries))
+        totals["items"] += len(entries)
+        print(f"  ✓ {keys[0]} 외 {len(keys) - 1}건 → {len(entries)}건 (누적 {totals['items']}건)")
+
+    # 묶음 수만큼 태스크를 만들되 실제 동시 호출 수는 llm 백엔드의 리미터가 제한
+    await asyncio.gather(*(worker(batch) for batch in batches))
+
+    elapsed = time.perf_counter() - started
+    totals["elapsed_sec"] = round(elapsed, 2)
+    totals["inputs_per_min"] = round(totals["inputs"] / elapsed * 60, 1) if elapsed else 0.0
+    totals["items_per_min"] = round(totals["items"] / elapsed * 60, 1) if elapsed else 0.0
+    return totals
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="영수증·메모 일괄 입력")
+    parser.add_argument("source", help="영수증/메모 폴더 또는 CSV 파일")
+    parser.add_argument("--spender", default="공동", help="지출 주체 기본값 (CSV spender 열이 우선)")
+    parser.add_argument("--batch-size", type=int, default=8, help="한 요청에 묶을 입력 수")
+    parser.add_argument("--checkpoint", help="체크포인트 파일 (기본: <입력>.backfill.json)")
+    parser.add_argument("--dry-run", action="store_true", help="저장·체크포인트 없이 추출 결과만 출력")
+    args = parser.parse_args(argv)
+
+    init_db()
+    error = llm.configuration_error()
+    if error:
+        raise SystemExit(error)
+
+    inputs = collect_inputs(args.source, args.spender)
+    checkpoint = Checkpoint(args.checkpoint or args.source.rstrip("/\\") + ".backfill.json")
+    print(f"{len(inputs)}건 입력 (이미 처리됨 {len(checkpoint.done & {i['key'] for i in inputs})}건)")
+
+    totals = asyncio.run(run(inputs, checkpoint, args.batch_size, args.dry_run))
+    print(
+        f"완료: {totals['items']}건 저장, 실패 입력 {totals['failed']}건, "
+        f"{totals['elapsed_sec']}초 ({totals['inputs_per_min']} 입력/분, {totals['items_per_min']} 건/분)"
+    )
+    if checkpoint.failed:
+        print(f"실패한 입력은 체크포인트에 기록되었습니다. 다시 실행하면 재시도합니다: {checkpoint.path}")
+    return totals
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_backfill.py
+"""
+일괄 입력(backfill.py) 처리량 벤치마크: 묶음 크기별 입력/분·항목/분.
+
+    uv run python benchmarks/bench_backfill.py [메모 수]
+
+임시 DB와 합성 메모 CSV를 만들어 로컬 대역(FakeBackend, 요청당 고정 지연 + 동시 3건 한도)으로 실행합니다.
+요청 수가 병목인 상황(무료 티어 동시 3건)에서 묶음 크기가 처리량에 미치는 영향을 봅니다.
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import os
+import random
+import sys
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import backfill
+import database
+import llm
+from core.ratelimit import RateLimiter
+
+REQUEST_LATENCY_MS = 400
+MAX_CONCURRENT     = 3
+ITEMS = ["스타벅스", "택시", "이마트", "약국", "관리비", "쿠팡", "점심", "주유", "다이소", "넷플릭스"]
+
+
+def make_memo_csv(path: str, n: int) -> None:
+    rng = random.Random(0)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "memo", "spender"])
+        for i in range(n):
+            writer.writerow([
+                f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                f"{rng.choice(ITEMS)} {rng.randrange(10, 900) * 100:,}원",
+                rng.choice(["공동", "남편", "아내"]),
+            ])
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 240
+    backend = llm.FakeBackend(latency_ms=REQUEST_LATENCY_MS)
+    backend.limiter = RateLimiter(max_concurrent=MAX_CONCURRENT, per_minute=1_000_000)
+    llm.set_backend(backend)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "memos.csv")
+        make_memo_csv(source, n)
+        inputs = backfill.collect_inputs(source, "공동")
+
+        print(f"{n} memos, fake backend {REQUEST_LATENCY_MS}ms/request, {MAX_CONCURRENT} concurrent")
+        print(f"{'batch':>6}{'requests':>10}{'wall s':>9}{'inputs/min':>12}{'items/min':>11}")
+        for batch_size in (1, 4, 8, 16):
+            database.DB_NAME = os.path.join(tmp, f"ledger_{batch_size}.db")
+            database.init_db()
+            checkpoint = backfill.Checkpoint(os.path.join(tmp, f"ckpt_{batch_size}.json"))
+            sys.stdout, real_stdout = open(os.devnull, "w"), sys.stdout   # 진행 로그 생략
+            try:
+                totals = asyncio.run(backfill.run(inputs, checkpoint, batch_size, dry_run=False))
+            finally:
+                sys.stdout.close()
+                sys.stdout = real_stdout
+            print(
+                f"{batch_size:>6}{-(-n // batch_size):>10}{totals['elapsed_sec']:>9.2f}"
+                f"{totals['inputs_per_min']:>12,.0f}{totals['items_per_min']:>11,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_category_dim.py
+"""
+지출 행 소비성향 붙이기: 행 단위 lambda 매핑(변경 전) vs 카테고리 차원(core.categories.CategoryDim).
+
+    uv run python benchmarks/bench_category_dim.py [최대 행 수]
+
+임시 DB의 기본 카테고리에 없는 이름·결측을 조금 섞은 합성 카테고리 열로
+get_category_mapping 구성 비용(iterrows vs 캐시)과 행 수별 매핑 시간을 재고 결과가 같은지 확인합니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import database
+
+
+def mapping_iterrows() -> dict:
+    """변경 전 get_category_mapping."""
+    conn = database.get_connection()
+    try:
+        df = pd.read_sql("SELECT name, type FROM categories", conn)
+        return {row["name"]: (row["type"] if row["type"] else "미분류") for _, row in df.iterrows()}
+    finally:
+        conn.close()
+
+
+def make_categories(n: int, names: list[str]) -> pd.Series:
+    rng = np.random.default_rng(0)
+    pool = np.array(names + ["삭제된카테고리"], dtype=object)
+    values = pd.Series(pool[rng.integers(0, len(pool), n)], dtype="string")
+    values[rng.random(n) < 0.001] = None
+    return values
+
+
+def ms(fn, repeat: int = 3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main() -> None:
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "ledger.db")
+        database.init_db()
+
+        build_ms, mapping = ms(mapping_iterrows)
+        cold_ms, dim = ms(lambda: (database.invalidate_category_dim(), database.get_category_dim())[1], 1)
+        warm_ms, _ = ms(database.get_category_dim)
+        print(f"{len(dim)} categories: iterrows mapping {build_ms:.2f} ms, "
+              f"dim cold {cold_ms:.2f} ms, dim cached {warm_ms * 1000:.1f} µs")
+
+        print(f"{'rows':>10}{'lambda ms':>11}{'dim ms':>9}{'speedup':>9}  same")
+        for n in sorted({n for n in (10_000, 100_000, 1_000_000) if n < max_rows} | {max_rows}):
+            categories = make_categories(n, database.get_categories())
+            lambda_ms, before = ms(lambda: categories.map(lambda x: mapping.get(x, "미분류")))
+            dim_ms, after = ms(lambda: dim.type_of(categories))
+            same = before.fillna("미분류").astype(object).tolist() == after.tolist()
+            print(f"{n:>10,}{lambda_ms:>11.1f}{dim_ms:>9.1f}{lambda_ms / dim_ms:>8.0f}x  {same}")
+
+        database.add_category("벤치카테고리", "선택소비 (Wants)")
+        fresh = database.get_category_dim()
+        print(f"add_category invalidates: {fresh is not dim and fresh.mapping.get('벤치카테고리') == '선택소비 (Wants)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/bench_cube.py
+"""
+집계 큐브(core.cube.LedgerCube / database.get_cube) 마이크로벤치마크.
+
+    uv run python benchmarks/bench_cube.py [행 수]
+
+합성 지출 데이터(기본 120,000행, 5년치)로 큐브 구성 시간, 조회 1회 비용(µs),
+쓰기 1건 후 get_cube() 증분 갱신 비용을 재고, 같은 조회를 원본 행 pandas groupby로 한 값과 비교합니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import database
+from core.cube import LedgerCube
+
+MONTH    = "2024-06"
+SPENDERS = ["공동", "남편", "아내", "아이"]
+
+
+def make_frame(n: int, categories: list[str]) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2020-01-01", periods=5 * 365, freq="D").strftime("%Y-%m-%d")
+    return pd.DataFrame({
+        "date":     np.asarray(days)[rng.integers(0, len(days), n)],
+        "item":     "합성",
+        "amount":   rng.integers(10, 2000, n) * 100,
+        "category": np.array(categories)[rng.integers(0, len(categories), n)],
+        "spender":  np.array(SPENDERS)[rng.integers(0, len(SPENDERS), n)],
+    })
+
+
+def per_call_us(fn, number: int = 2000) -> float:
+    return timeit.timeit(fn, number=number) / number * 1e6
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 120_000
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "ledger.db")
+        database.init_db()
+        mapping = database.get_category_mapping()
+        df = make_frame(n, database.get_categories())
+
+        start = time.perf_counter()
+        cube = LedgerCube.from_frame(df)
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"{n:,} rows → cube {cube.amount.shape} built in {build_ms:.1f} ms")
+
+        month_df = df[df["date"].str.startswith(MONTH)]
+        queries = [
+            ("month total",
+             lambda: cube.sum(month=MONTH),
+             lambda: month_df["amount"].sum()),
+            ("month × spender total",
+             lambda: cube.sum(month=MONTH, spender="남편"),
+             lambda: month_df[month_df["spender"] == "남편"]["amount"].sum()),
+            ("category roll-up",
+             lambda: cube.rollup("category", month=MONTH),
+             lambda: month_df.groupby("category")["amount"].sum()),
+            ("needs/wants split",
+             lambda: cube.rollup_types(mapping, month=MONTH),
+             lambda: month_df.groupby(month_df["category"].map(lambda c: mapping.get(c, "미분류")))["amount"].sum()),
+            ("all-time by month",
+             lambda: cube.rollup("month"),
+             lambda: df.groupby(df["date"].str.slice(0, 7))["amount"].sum()),
+        ]
+        print(f"{'query':<24}{'cube µs':>10}{'pandas µs':>12}  same")
+        for name, cube_fn, pandas_fn in queries:
+            a, b = cube_fn(), pandas_fn()
+            same = (a == b) if np.isscalar(a) else \
+                (dict(a) if isinstance(a, dict) else a.to_dict()) == {k: int(v) for k, v in b.items()}
+            print(f"{name:<24}{per_call_us(cube_fn):>10.1f}{per_call_us(pandas_fn, 50):>12.1f}  {same}")
+
+        # DB 경유: 첫 호출은 전체 구성, 이후는 변경 로그만 반영
+        conn = database.get_connection()
+        df[["date", "item", "amount", "category", "spender"]].to_sql("expenses", conn, if_exists="append", index=False)
+        conn.close()
+        start = time.perf_counter()
+        database.get_cube()
+        print(f"get_cube() cold build from DB: {(time.perf_counter() - start) * 1000:.1f} ms")
+        print(f"get_cube() no changes:        {per_call_us(database.get_cube, 200):.0f} µs")
+        entry = {"date": f"{MONTH}-15", "item": "커피", "amount": 4500, "category": df['category'][0], "spender": "공동"}
+        timings = []
+        for _ in range(50):
+            database.insert_expense([entry])
+            start = time.perf_counter()
+            database.get_cube()
+            timings.append((time.perf_counter() - start) * 1e6)
+        print(f"get_cube() after 1 insert:    {np.median(timings):.0f} µs")
+        expected = int(df[df["date"].str.startswith(MONTH)]["amount"].sum()) + 50 * 4500
+        print(f"month total matches DB after inserts: {database.get_cube().sum(month=MONTH) == expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_daily_totals.py
+"""
+캘린더 히트맵 입력: expenses 전체 읽기 + pandas 일별 집계(변경 전 방식) vs daily_totals 일별 합계(get_daily_totals).
+
+    uv run python benchmarks/bench_daily_totals.py [하루 건수]
+
+임시 DB에 5년치 합성 가계부(bench_dashboard_sql.make_ledger)를 만들고 두 방식의 읽기 시간·행 수를 비교해
+결과가 같은지 확인합니다. 쓰기 쪽 비용은 daily_totals 트리거가 있을 때와 지웠을 때 1건 insert_expense 시간으로 잽니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import database
+from bench_dashboard_sql import make_ledger
+
+REPEATS = 10
+
+
+def from_expenses(spender: str) -> pd.DataFrame:
+    """변경 전: 원본 행을 모두 읽어 (날짜, 소비성향)별 합계."""
+    df = database.load_data("전체 기간", spender)
+    df["type"] = database.get_category_dim().type_of(df["category"])
+    return (df.groupby(["date", "type"]).agg(amount=("amount", "sum"), count=("amount", "size"))
+              .reset_index())
+
+
+def timed(fn, repeats: int = REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (time.perf_counter() - start) / repeats * 1000, result
+
+
+def insert_us(n: int = 200) -> float:
+    entry = {"date": "2024-06-15", "item": "커피", "amount": 4500, "category": database.get_categories()[0], "spender": "공동"}
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        database.insert_expense([entry])
+        timings.append((time.perf_counter() - start) * 1e6)
+    return float(np.median(timings))
+
+
+def main() -> None:
+    per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "ledger.db")
+        database.init_db()
+        n = make_ledger(per_day)
+        print(f"{n:,} expenses")
+
+        print(f"{'spender':<8}{'expenses ms':>13}{'daily ms':>10}{'rows read':>11}  same")
+        for spender in ("전체", "남편"):
+            before_ms, before = timed(lambda: from_expenses(spender))
+            after_ms, after = timed(lambda: database.get_daily_totals(spender, by="type"))
+            same = before.astype(object).values.tolist() == after.astype(object).values.tolist()
+            print(f"{spender:<8}{before_ms:>13.1f}{after_ms:>10.1f}{len(after):>11,}  {same}")
+
+        with_triggers = insert_us()
+        conn = database.get_connection()
+        for name in ("trg_daily_totals_ins", "trg_daily_totals_upd", "trg_daily_totals_del"):
+            conn.execute(f"DROP TRIGGER {name}")
+        conn.commit()
+        conn.close()
+        print(f"insert_expense (1 row): {with_triggers:.0f} µs with daily_totals triggers, {insert_us():.0f} µs without")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/bench_dashboard_sql.py
+"""
+대시보드 재실행 1회 비용: 전체 기간 pandas 집계 vs 집계 큐브 + 선택 월 SQL 집계.
+
+    uv run python benchmarks/bench_dashboard_sql.py [하루 건수]
+
+임시 DB에 5년치 합성 가계부를 만들고, 예전 방식(전체 기간 load_data → strftime 필터로 전월 합계,
+월 데이터 pandas 집계)과 지금 방식(get_cube 합계·성향별 합계, get_weekly_summary·get_top_expenses)을
+같은 달에 대해 반복 실행해 평균 시간을 비교합니다. 두 방식의 결과가 같은지도 함께 확인합니다.
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import database
+
+YEARS   = 5
+REPEATS = 20
+MONTH   = "2024-06"
+PREV    = "2024-05"
+ITEMS   = ["스타벅스", "택시", "이마트", "약국", "관리비", "쿠팡", "점심", "주유", "다이소", "넷플릭스"]
+
+
+def make_ledger(per_day: int) -> int:
+    rng = random.Random(0)
+    categories = database.get_categories()
+    start = date(2020, 1, 1)
+    rows = []
+    for day in range(YEARS * 365):
+        d = (start + timedelta(days=day)).isoformat()
+        for _ in range(rng.randint(per_day // 2, per_day * 3 // 2)):
+            rows.append((
+                d, rng.choice(ITEMS), rng.randrange(10, 2000) * 100,
+                rng.choice(categories), rng.choice(["공동", "남편", "아내"]),
+            ))
+    conn = database.get_connection()
+    conn.executemany(
+        "INSERT INTO expenses (date, item, amount, category, spender) VALUES (?, ?, ?, ?, ?)", rows
+    )
+    conn.commit()
+    conn.close()
+    return len(rows)
+
+
+def pandas_path(spender):
+    """변경 전 dashboard.py 흐름."""
+    full_df = database.load_data("전체 기간", spender)
+    full_df["date"] = pd.to_datetime(full_df["date"])
+    df = database.load_data(MONTH, spender)
+    df["date"] = pd.to_datetime(df["date"])
+    mapping = database.get_category_mapping()
+    df["소비성향"] = df["category"].map(lambda x: mapping.get(x, "미분류"))
+
+    total = df["amount"].sum()
+    needs = df[df["소비성향"] == "필수소비 (Needs)"]["amount"].sum()
+    wants = df[df["소비성향"] == "선택소비 (Wants)"]["amount"].sum()
+    prev_total = full_df[full_df["date"].dt.strftime("%Y-%m") == PREV]["amount"].sum()
+
+    week_start = df["date"] - pd.to_timedelta(df["date"].dt.weekday, unit="D")
+    weekly = df.groupby(week_start.dt.strftime("%Y-%m-%d")).agg(지출건수=("id", "count"), 총합계=("amount", "sum"))
+    top = df.sort_values("amount", ascending=False)[["date", "item", "category", "amount"]].head(10)
+    return int(total), int(needs), int(wants), int(prev_total), weekly["총합계"].tolist(), top["amount"].tolist()
+
+
+def sql_path(spender):
+    """변경 후: 합계는 큐브, 주차별·Top 10은 선택 월 행만 읽는 SQL 집계."""
+    cube = database.get_cube()
+    types = cube.rollup_types(database.get_category_mapping(), month=MONTH, spender=spender)
+    prev_total = cube.sum(month=PREV, spender=spender)
+    weekly = database.get_weekly_summary(MONTH, spender)
+    top = database.get_top_expenses(MONTH, spender, limit=10)
+    return (
+        sum(types.values()), types.get("필수소비 (Needs)", 0), types.get("선택소비 (Wants)", 0),
+        prev_total, weekly["총합계"].tolist(), top["amount"].tolist(),
+    )
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main() -> None:
+    per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "ledger.db")
+        database.init_db()
+        n = make_ledger(per_day)
+        print(f"{n:,} rows over {YEARS} years, month={MONTH}, {REPEATS} repeats")
+        print(f"{'spender':>8}{'pandas ms':>11}{'sql ms':>9}{'speedup':>9}  same")
+        for spender in ("전체", "공동"):
+            same = pandas_path(spender)[:5] == sql_path(spender)[:5]
+            same = same and sorted(pandas_path(spender)[5]) == sorted(sql_path(spender)[5])
+            old_ms, new_ms = timed(pandas_path, spender), timed(sql_path, spender)
+            print(f"{spender:>8}{old_ms:>11.1f}{new_ms:>9.1f}{old_ms / new_ms:>8.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
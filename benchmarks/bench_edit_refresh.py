@@ -0,0 +1,47 @@
+# benchmarks/bench_edit_refresh.py
+"""
+대시보드 편집 1건 후 추이 집계 갱신: 전체 재집계(period_top_items) vs 변경분 반영(patch_period_top_items).
+
+    uv run python benchmarks/bench_edit_refresh.py [연수] [하루 건수]
+
+합성 지출 데이터에서 한 행의 금액·날짜를 바꾼 뒤 집계 단위별로 두 방식의 시간을 재고 결과가 같은지 확인합니다.
+(상단 합계·파이는 집계 큐브가 변경 로그로 따라오므로 bench_cube.py의 get_cube() 갱신 시간을 참고)
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_trend_chart import make_frame
+from core.aggregates import patch_period_top_items, period_top_items
+
+
+def ms(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main() -> None:
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    df = make_frame(years, per_day).reset_index(names="id")
+    print(f"{len(df):,} rows")
+    print(f"{'granularity':<12}{'full ms':>9}{'patch ms':>10}  same")
+    for granularity in ("D", "W", "M"):
+        trend = period_top_items(df, granularity)
+        edited = df.copy()
+        old_date, new_date = edited.at[100, "date"], pd.Timestamp("2021-03-03")
+        edited.loc[100, ["amount", "date"]] = [99_999_900, new_date]
+        full_ms, full = ms(lambda: period_top_items(edited, granularity))
+        patch_ms, patched = ms(lambda: patch_period_top_items(trend, edited, granularity, [old_date, new_date]))
+        print(f"{granularity:<12}{full_ms:>9.1f}{patch_ms:>10.1f}  {patched.equals(full)}")
+
+
+if __name__ == "__main__":
+    main()
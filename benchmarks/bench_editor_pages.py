@@ -0,0 +1,89 @@
+# benchmarks/bench_editor_pages.py
+"""
+상세 내역 편집기 페이지 조회: 전체 기간 load_data(변경 전) vs keyset 페이지(load_expense_page) vs OFFSET.
+
+    uv run python benchmarks/bench_editor_pages.py [행 수]
+
+임시 DB에 합성 지출(기본 100,000행)을 넣고, 정렬별로 앞쪽·뒤쪽 페이지를 읽는 시간을 비교합니다.
+keyset은 직전 페이지 마지막 (정렬값, id)에서 이어 읽으므로 페이지 위치와 무관하게 일정해야 합니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import database
+
+PAGE = 100
+
+
+def make_rows(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2020-01-01", periods=5 * 365, freq="D").strftime("%Y-%m-%d")
+    return pd.DataFrame({
+        "date":     np.asarray(days)[rng.integers(0, len(days), n)],
+        "item":     "합성",
+        "amount":   rng.integers(10, 2000, n) * 100,
+        "category": "식비",
+        "spender":  "공동",
+    })
+
+
+def offset_page(sort_col: str, order: str, offset: int) -> pd.DataFrame:
+    conn = database.get_connection()
+    try:
+        return pd.read_sql(
+            f"SELECT id, date, item, amount, category, spender FROM expenses "
+            f"ORDER BY {database.EXPENSE_SORT_KEYS[sort_col]} {order}, id {order} LIMIT ? OFFSET ?",
+            conn, params=(PAGE, offset),
+        )
+    finally:
+        conn.close()
+
+
+def ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "ledger.db")
+        database.init_db()
+        conn = database.get_connection()
+        make_rows(n).to_sql("expenses", conn, if_exists="append", index=False)
+        conn.close()
+
+        print(f"{n:,} rows, page size {PAGE}")
+        print(f"full load_data('전체 기간'): {ms(lambda: database.load_data('전체 기간')):.1f} ms (변경 전 편집기 입력)")
+        print(f"{'sort':<12}{'page':>7}{'keyset ms':>11}{'offset ms':>11}  same")
+        for sort_col, descending in (("date", True), ("amount", False)):
+            order = "DESC" if descending else "ASC"
+            after, page_no, checkpoints = None, 0, {1, 10, 100, n // PAGE // 2, n // PAGE - 1}
+            while True:
+                page_no += 1
+                start = time.perf_counter()
+                page = database.load_expense_page(sort_col=sort_col, descending=descending, after=after, limit=PAGE)
+                keyset_ms = (time.perf_counter() - start) * 1000
+                if page_no in checkpoints:
+                    start = time.perf_counter()
+                    ref = offset_page(sort_col, order, (page_no - 1) * PAGE)
+                    offset_ms = (time.perf_counter() - start) * 1000
+                    same = page["id"].tolist() == ref["id"].tolist()
+                    print(f"{sort_col + ' ' + order.lower():<12}{page_no:>7,}{keyset_ms:>11.2f}{offset_ms:>11.2f}  {same}")
+                if len(page) < PAGE or page_no >= max(checkpoints):
+                    break
+                after = database.expense_page_cursor(page.iloc[-1], sort_col)
+
+
+if __name__ == "__main__":
+    main()
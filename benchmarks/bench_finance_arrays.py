@@ -0,0 +1,84 @@
+# benchmarks/bench_finance_arrays.py
+"""
+core.finance / core.real_estate 배열 버전(*_array) 대량 파라미터 속도.
+
+    uv run python benchmarks/bench_finance_arrays.py [파라미터 수]
+
+N개(기본 1,000,000) 파라미터 조합을 스칼라 함수 리스트 컴프리헨션과 배열 버전 1회로 계산해 시간을 비교합니다.
+원소별 동치성 검사는 tests/test_finance_arrays.py에 있습니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.finance import (
+    calculate_asset_fv, calculate_asset_fv_array,
+    calculate_fv, calculate_fv_array,
+    calculate_max_loan, calculate_max_loan_array,
+    opportunity_cost, opportunity_cost_array,
+)
+from core.real_estate import project_price, project_price_array
+
+# 수익률 경계값: 0(별도 분기), 음수, 0에 아주 가까운 값
+EDGE_RATES = np.array([0.0, 0.0, -0.02, 1e-12])
+
+
+def money(rng, shape):
+    return rng.choice([0.0, 1.0, 3_250_000.0, 5e8, -1e6], shape) * rng.uniform(0.5, 2.0, shape)
+
+
+def rates(rng, shape):
+    r = rng.uniform(-0.1, 0.3, shape)
+    edge = rng.random(shape) < 0.2
+    return np.where(edge, rng.choice(EDGE_RATES, shape), r)
+
+
+def months(rng, shape):
+    return rng.integers(0, 481, shape)
+
+
+def years(rng, shape):
+    return rng.integers(0, 41, shape)
+
+
+# 함수 이름 → (스칼라, 배열, 인자별 표본 생성기)
+CASES = {
+    "calculate_fv":       (calculate_fv, calculate_fv_array, (money, rates, months)),
+    "calculate_asset_fv": (calculate_asset_fv, calculate_asset_fv_array, (money, rates, months)),
+    "calculate_max_loan": (calculate_max_loan, calculate_max_loan_array, (money, rates, years)),
+    "opportunity_cost":   (opportunity_cost, opportunity_cost_array, (money, rates, years)),
+    "project_price":      (project_price, project_price_array, (money, rates, years)),
+}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def compare_speed(n: int, rng) -> None:
+    print(f"{n:,} parameter sets")
+    print(f"{'function':<20}{'scalar ms':>11}{'array ms':>10}{'speedup':>9}  same")
+    for name, (scalar, vector, gens) in CASES.items():
+        args = [g(rng, n) for g in gens]
+        lists = [a.tolist() for a in args]
+        scalar_ms, want = timed(lambda: [scalar(*a) for a in zip(*lists)])
+        vector_ms, got = timed(lambda: vector(*args))
+        same = np.allclose(got, want, rtol=1e-9, atol=1e-6)
+        print(f"{name:<20}{scalar_ms:>11.1f}{vector_ms:>10.1f}{scalar_ms / vector_ms:>8.0f}×  {same}")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    compare_speed(n, np.random.default_rng(0))
+
+
+if __name__ == "__main__":
+    main()
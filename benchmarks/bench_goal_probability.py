@@ -0,0 +1,52 @@
+# benchmarks/bench_goal_probability.py
+"""
+목표 달성 확률 몬테카를로(core.finance.simulate_goal_probability) 속도·정합성.
+
+    uv run python benchmarks/bench_goal_probability.py [경로 수]
+
+기본 100,000개 경로로 목표 시점까지 개월 수별 실행 시간(직렬 / 스레드 4개)을 재고,
+변동성 0·저축액 1개일 때 중앙값이 calculate_total_equity와 같은지, 변경 전 지표(예상/목표 비율)와 어떻게 다른지 보여 줍니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.finance import calculate_total_equity, simulate_goal_probability
+
+TARGET     = 500_000_000
+INVESTMENT = 50_000_000
+FIXED      = 285_000_000
+SAVINGS    = [2_400_000, 2_900_000, 3_100_000, 3_300_000, 3_600_000, 4_100_000]   # 최근 실적 예시
+
+
+def main() -> None:
+    n_paths = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    exact = calculate_total_equity(3_250_000, 0.06, 28, INVESTMENT, FIXED, 0)
+    flat = simulate_goal_probability(TARGET, 28, 3_250_000, INVESTMENT, FIXED, r_vol=0.0, n_paths=1_000)
+    print(f"zero volatility p50 {flat['p50']:,.0f} vs calculate_total_equity {exact:,.0f}: "
+          f"{abs(flat['p50'] - exact) < 1e-3}")
+
+    print(f"{n_paths:,} paths")
+    print(f"{'months':>7}{'serial ms':>11}{'4 threads ms':>14}{'prob %':>9}{'95% CI':>16}{'old ratio %':>13}")
+    for months in (28, 60, 120, 360):
+        kwargs = dict(r_annual=0.06, r_vol=0.12, price_growth=0.03, price_vol=0.05, n_paths=n_paths)
+        start = time.perf_counter()
+        result = simulate_goal_probability(TARGET, months, SAVINGS, INVESTMENT, FIXED, **kwargs)
+        serial_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        threaded = simulate_goal_probability(TARGET, months, SAVINGS, INVESTMENT, FIXED, workers=4, **kwargs)
+        threaded_ms = (time.perf_counter() - start) * 1000
+        assert threaded == result, "workers 수에 따라 결과가 달라짐"
+        # 변경 전: (현재 자산 + 평균 저축 × 개월) / 목표
+        old = min((INVESTMENT + FIXED + sum(SAVINGS) / len(SAVINGS) * months) / TARGET * 100, 100.0)
+        ci = f"{result['ci_low']:.1f}~{result['ci_high']:.1f}"
+        print(f"{months:>7}{serial_ms:>11.0f}{threaded_ms:>14.0f}{result['prob']:>9.1f}{ci:>16}{old:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_goal_solvers.py
+"""
+목표 역산 솔버(core.finance.required_saving / earliest_month / required_return) 정확도·속도.
+
+    uv run python benchmarks/bench_goal_solvers.py [목표 수]
+
+무작위 목표(목표 자기자본 × 수익률 × 기간 × 현재 자산) N개(기본 1,000,000)를 배열로 한 번에 풀고,
+답을 calculate_total_equity에 다시 넣어 목표와 맞는지 확인합니다. 비교 대상은 슬라이더 시행착오에 해당하는
+스칼라 탐색(저축 5만 원 단위 증가, 개월 1씩 증가, 수익률 이분법)을 앞 1,000개 목표에 돌려 환산한 시간입니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.finance import calculate_total_equity, earliest_month, required_return, required_saving
+
+SAMPLE = 1_000
+
+
+def equity(s, r, n, pv, fixed):
+    return calculate_total_equity(s, r, int(n), pv, fixed, 0)
+
+
+def scan_saving(target, r, n, pv, fixed):
+    s = 0
+    while equity(s, r, n, pv, fixed) < target:
+        s += 50_000
+    return s
+
+
+def scan_month(target, s, r, pv, fixed):
+    n = 0
+    while equity(s, r, n, pv, fixed) < target and n < 1200:
+        n += 1
+    return n
+
+
+def bisect_return(target, s, n, pv, fixed):
+    lo, hi = 0.0, 0.5
+    if equity(s, lo, n, pv, fixed) >= target or equity(s, hi, n, pv, fixed) < target:
+        return lo
+    while hi - lo > 1e-9:
+        mid = (lo + hi) / 2
+        lo, hi = (mid, hi) if equity(s, mid, n, pv, fixed) < target else (lo, mid)
+    return hi
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main() -> None:
+    n_goals = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    target = rng.integers(3, 15, n_goals) * 100_000_000.0
+    rate   = rng.choice([0.0, 0.02, 0.03, 0.05, 0.07], n_goals)
+    months = rng.integers(12, 240, n_goals)
+    saving = rng.integers(100, 600, n_goals) * 10_000.0
+    pv     = rng.integers(0, 100, n_goals) * 1_000_000.0
+    fixed  = 285_000_000.0
+
+    print(f"{n_goals:,} goals (scalar search timed on {SAMPLE:,} and scaled)")
+    print(f"{'solver':<18}{'vector ms':>11}{'scalar est ms':>15}  max |E - target| (원)")
+    k = slice(0, SAMPLE)
+
+    ms, need = timed(lambda: required_saving(target, rate, months, pv, fixed))
+    scalar, _ = timed(lambda: [scan_saving(*a, fixed) for a in zip(target[k], rate[k], months[k], pv[k])])
+    ok = np.isfinite(need)
+    err = max(abs(equity(need[i], rate[i], months[i], pv[i], fixed) - target[i]) for i in np.flatnonzero(ok & (need > 0))[:SAMPLE])
+    print(f"{'required_saving':<18}{ms:>11.1f}{scalar * n_goals / SAMPLE:>15,.0f}  {err:.4f}")
+
+    ms, reach = timed(lambda: earliest_month(target, saving, rate, pv, fixed))
+    scalar, ref = timed(lambda: [scan_month(*a, fixed) for a in zip(target[k], saving[k], rate[k], pv[k])])
+    same = np.array_equal(np.minimum(reach[k], 1200), ref)
+    print(f"{'earliest_month':<18}{ms:>11.1f}{scalar * n_goals / SAMPLE:>15,.0f}  same months as scan: {same}")
+
+    ms, r = timed(lambda: required_return(target, saving, months, pv, fixed))
+    scalar, _ = timed(lambda: [bisect_return(*a, fixed) for a in zip(target[k], saving[k], months[k], pv[k])])
+    solved = np.flatnonzero(np.isfinite(r) & (r > 0))[:SAMPLE]
+    err = max(abs(equity(saving[i], r[i], months[i], pv[i], fixed) - target[i]) for i in solved)
+    print(f"{'required_return':<18}{ms:>11.1f}{scalar * n_goals / SAMPLE:>15,.0f}  {err:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_projection.py
+"""
+자기자본 추이 계산: 시나리오·월마다 calculate_fv/calculate_asset_fv를 부르는 루프(변경 전) vs core.finance.project_equity.
+
+    uv run python benchmarks/bench_projection.py [시나리오 수] [개월 수]
+
+기본 10,000개 시나리오(월 저축 × 수익률 × 현재 투자자산 무작위) × 360개월 경로를 한 번에 계산하고,
+루프 방식은 앞 LOOP_SAMPLE개 시나리오만 돌려 전체 시간을 환산한 뒤 같은 시나리오의 값이 일치하는지 확인합니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.finance import calculate_asset_fv, calculate_fv, equity_projection_frame, project_equity
+
+LOOP_SAMPLE = 300
+FIXED       = 285_000_000   # 청약 + 전세보증금 회수
+
+
+def loop_paths(pmt, rate, pv, n_months: int) -> np.ndarray:
+    """변경 전 build_yearly_chart·tab6 방식: 포인트마다 스칼라 함수 호출."""
+    out = np.empty((len(pmt), n_months + 1))
+    for i in range(len(pmt)):
+        for m in range(n_months + 1):
+            out[i, m] = calculate_fv(pmt[i], rate[i], m) + calculate_asset_fv(pv[i], rate[i], m) + FIXED
+    return out
+
+
+def main() -> None:
+    scenarios = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_months = int(sys.argv[2]) if len(sys.argv) > 2 else 360
+    rng = np.random.default_rng(0)
+    pmt  = rng.integers(100, 700, scenarios) * 10_000.0
+    rate = rng.choice([0.0, 0.02, 0.03, 0.045, 0.06, 0.08], scenarios)
+    pv   = rng.integers(0, 200, scenarios) * 1_000_000.0
+
+    start = time.perf_counter()
+    paths = project_equity(pmt, rate, n_months, pv, FIXED)
+    vec_s = time.perf_counter() - start
+
+    sample = min(LOOP_SAMPLE, scenarios)
+    start = time.perf_counter()
+    ref = loop_paths(pmt[:sample], rate[:sample], pv[:sample], n_months)
+    loop_s = (time.perf_counter() - start) / sample * scenarios
+
+    same = np.allclose(paths[:sample], ref, rtol=1e-12, atol=1e-3)
+    print(f"{scenarios:,} scenarios × {n_months + 1} months = {paths.size:,} points ({paths.nbytes / 2**20:.0f} MB)")
+    print(f"scalar loop (est. from {sample}): {loop_s:8.2f} s")
+    print(f"project_equity:                  {vec_s:8.3f} s  ({loop_s / vec_s:,.0f}x)  same: {same}")
+
+    # 페이지 1회분: 단일 시나리오 연도별 표
+    start = time.perf_counter()
+    for _ in range(200):
+        equity_projection_frame(date(2026, 1, 1), n_months, 3_250_000, 0.03, 50_000_000, FIXED)
+    print(f"equity_projection_frame (1 scenario, yearly rows): {(time.perf_counter() - start) / 200 * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
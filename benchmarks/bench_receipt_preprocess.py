@@ -0,0 +1,89 @@
+# benchmarks/bench_receipt_preprocess.py
+"""
+영수증 전처리 벤치마크: 원본 전송 vs 전처리 후 전송.
+
+    uv run python benchmarks/bench_receipt_preprocess.py [영수증_폴더]
+
+폴더를 생략하면 휴대폰 사진 크기(3024x4032)의 합성 영수증을 만들어 사용합니다.
+Gemini 대신 로컬 스텁 모델(업로드 대역폭 + 고정 추론 시간 시뮬레이션)을 호출합니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image, ImageDraw
+
+from core.extraction import parse_expense_response
+from core.receipt import preprocess_receipt
+
+UPLINK_BYTES_PER_SEC = 2_000_000   # 약 16Mbps 모바일 업로드
+MODEL_BASE_SEC       = 0.05        # 스텁 추론 고정 시간
+STUB_RESPONSE        = '```json\n[{"date": "%s", "item": "마트", "amount": "54,000", "category": "생활소비"}]\n```'
+
+
+def stub_model(payload: bytes) -> str:
+    time.sleep(MODEL_BASE_SEC + len(payload) / UPLINK_BYTES_PER_SEC)
+    return STUB_RESPONSE % date.today().isoformat()
+
+
+def make_synthetic_receipts(folder: str, n: int = 8) -> None:
+    for i in range(n):
+        img = Image.new("RGB", (3024, 4032), (70, 60, 55))           # 어두운 테이블
+        draw = ImageDraw.Draw(img)
+        draw.rectangle((700, 500, 2300, 3600), fill=(245, 243, 238))  # 영수증 용지
+        for line in range(40):
+            y = 600 + line * 70
+            draw.text((780, y), f"ITEM {line:02d} .......... {1000 * (line + i):,}", fill=(20, 20, 20))
+        img.save(os.path.join(folder, f"receipt_{i:02d}.jpg"), quality=95)
+
+
+def run(folder: str) -> None:
+    paths = sorted(
+        os.path.join(folder, f) for f in os.listdir(folder)
+        if f.lower().endswith((".jpg", ".jpeg", ".png"))
+    )
+    today_str = date.today().isoformat()
+
+    def raw_pipeline(path):
+        start = time.perf_counter()
+        payload = open(path, "rb").read()
+        parse_expense_response(stub_model(payload), "공동", today_str)
+        return len(payload), 0.0, time.perf_counter() - start
+
+    def prepared_pipeline(path):
+        start = time.perf_counter()
+        prepared = preprocess_receipt(path)
+        parse_expense_response(stub_model(prepared["data"]), "공동", today_str)
+        return prepared["bytes_sent"], prepared["elapsed_ms"], time.perf_counter() - start
+
+    print(f"{len(paths)} receipts from {folder}")
+    print(f"{'mode':<18}{'bytes/img':>12}{'prep ms':>10}{'e2e ms':>10}{'wall s (4 thr)':>16}")
+    for label, fn in [("raw upload", raw_pipeline), ("preprocessed", prepared_pipeline)]:
+        wall = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(fn, paths))
+        wall = time.perf_counter() - wall
+        n = len(results) or 1
+        print(
+            f"{label:<18}"
+            f"{sum(r[0] for r in results) / n:>12,.0f}"
+            f"{sum(r[1] for r in results) / n:>10.1f}"
+            f"{sum(r[2] for r in results) / n * 1000:>10.1f}"
+            f"{wall:>16.2f}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            make_synthetic_receipts(tmp)
+            run(tmp)
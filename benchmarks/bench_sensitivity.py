@@ -0,0 +1,55 @@
+# benchmarks/bench_sensitivity.py
+"""
+민감도 격자(월 저축 × 연수익률 × 기간) 계산: 칸마다 calculate_total_equity 호출(슬라이더 1회 = 1칸이던 방식의 전 격자 환산)
+vs core.finance.sensitivity_grid 한 번.
+
+    uv run python benchmarks/bench_sensitivity.py [저축 칸 수] [수익률 칸 수] [기간 칸 수]
+
+기본 격자는 페이지와 같은 29 × 17 × 기간 10칸. 격자 크기를 키워 가며 두 방식의 시간과 값 일치 여부를 출력합니다.
+페이지에서는 이 격자가 st.cache_data에 들어가므로 슬라이더 이동은 격자 슬라이스 조회입니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.finance import calculate_total_equity, sensitivity_grid
+
+PV, JEONSE, SUBSCRIPTION = 50_000_000, 260_000_000, 25_000_000
+
+
+def loop_grid(savings, returns, horizons) -> np.ndarray:
+    out = np.empty((len(savings), len(returns), len(horizons)))
+    for i, s in enumerate(savings):
+        for j, r in enumerate(returns):
+            for k, m in enumerate(horizons):
+                out[i, j, k] = calculate_total_equity(s, r, int(m), PV, JEONSE, SUBSCRIPTION)
+    return out
+
+
+def main() -> None:
+    n_s = int(sys.argv[1]) if len(sys.argv) > 1 else 29
+    n_r = int(sys.argv[2]) if len(sys.argv) > 2 else 17
+    n_h = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    print(f"{'grid':<18}{'cells':>9}{'loop ms':>10}{'grid ms':>10}  same")
+    for scale in (1, 4, 16):
+        savings = np.linspace(0, 7_000_000, n_s * scale)
+        returns = np.linspace(0, 0.08, n_r * scale)
+        horizons = np.linspace(12, 120, n_h).astype(int)
+        start = time.perf_counter()
+        fast = sensitivity_grid(savings, returns, horizons, PV, JEONSE + SUBSCRIPTION)
+        grid_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        ref = loop_grid(savings, returns, horizons)
+        loop_ms = (time.perf_counter() - start) * 1000
+        shape = f"{len(savings)}x{len(returns)}x{len(horizons)}"
+        print(f"{shape:<18}{fast.size:>9,}{loop_ms:>10.1f}{grid_ms:>10.2f}  {np.allclose(fast, ref, rtol=1e-12)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/bench_shared_frames.py
+"""
+동시 세션 50개의 대시보드 데이터 메모리: 세션별 복사본(변경 전) vs 공유 프레임 + 세션 오버레이.
+
+    uv run python benchmarks/bench_shared_frames.py [세션 수] [행 수]
+
+임시 DB에 합성 지출(기본 20,000행)을 넣고 세션마다 '전체 기간' 데이터를 들고 소비성향 열을 붙인 뒤,
+일부 세션(5개 중 1개)은 3건을 수정·1건을 삭제합니다. 세션 상태를 모두 살려 둔 채
+늘어난 메모리(tracemalloc: numpy·파이썬 객체, pyarrow: 문자열 열)를 비교합니다.
+"""
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import database
+from core.frames import SessionView
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def make_rows(n: int, categories: list[str]) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2020-01-01", periods=5 * 365, freq="D").strftime("%Y-%m-%d")
+    return pd.DataFrame({
+        "date":     np.asarray(days)[rng.integers(0, len(days), n)],
+        "item":     np.array(["스타벅스", "택시", "이마트", "약국", "관리비"])[rng.integers(0, 5, n)],
+        "amount":   rng.integers(10, 2000, n) * 100,
+        "category": np.array(categories)[rng.integers(0, len(categories), n)],
+        "spender":  "공동",
+    })
+
+
+def allocated() -> int:
+    arrow = pyarrow.total_allocated_bytes() if pyarrow else 0
+    return tracemalloc.get_traced_memory()[0] + arrow
+
+
+def copy_per_session(i: int, mapping: dict) -> dict:
+    """변경 전: 세션마다 load_data 결과를 들고, 수정은 세션 프레임에 .loc으로 직접 반영."""
+    df = database.load_data("전체 기간")
+    df["date"] = pd.to_datetime(df["date"])
+    df["소비성향"] = df["category"].map(lambda x: mapping.get(x, "미분류"))
+    if i % 5 == 0:
+        for row_id in df["id"].iloc[:3]:
+            df.loc[df["id"] == row_id, "amount"] = 1000
+        df = df[df["id"] != df["id"].iloc[3]].copy()
+    return {"dashboard_data": df}
+
+
+def shared_view(i: int, mapping: dict) -> dict:
+    """변경 후: 공유 프레임 + SessionView 오버레이, 소비성향은 카테고리 차원으로."""
+    base, version = database.load_shared("전체 기간", "전체")
+    view = SessionView(base, version)
+    if i % 5 == 0:
+        for row_id in base["id"].iloc[:3]:
+            view.edit(row_id, "amount", 1000)
+        view.delete(base["id"].iloc[3])
+    df = view.frame()
+    df["소비성향"] = database.get_category_dim().type_of(df["category"])
+    return {"dashboard_view": view}
+
+
+def measure(make_session, sessions: int, mapping: dict) -> tuple[float, float]:
+    gc.collect()
+    start_bytes, start = allocated(), time.perf_counter()
+    states = [make_session(i, mapping) for i in range(sessions)]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    used = allocated() - start_bytes
+    del states
+    return used / 2**20, elapsed
+
+
+def main() -> None:
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "ledger.db")
+        database.init_db()
+        conn = database.get_connection()
+        make_rows(n, database.get_categories()).to_sql("expenses", conn, if_exists="append", index=False)
+        conn.close()
+        mapping = database.get_category_mapping()
+
+        tracemalloc.start()
+        print(f"{sessions} sessions × {n:,} rows ('전체 기간'), every 5th session edits 3 rows + deletes 1")
+        print(f"{'mode':<26}{'MB held':>9}{'MB/session':>12}{'setup s':>9}")
+        for name, fn in (("copy per session (before)", copy_per_session), ("shared + overlay", shared_view)):
+            mb, elapsed = measure(fn, sessions, mapping)
+            print(f"{name:<26}{mb:>9.1f}{mb / sessions:>12.2f}{elapsed:>9.2f}")
+        print(f"shared frame loads: {database.SHARED_FRAMES.loads}")
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
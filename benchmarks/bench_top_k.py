@@ -0,0 +1,70 @@
+# benchmarks/bench_top_k.py
+"""
+일별 지출 추이 hover 라벨(일별 상위 3개 품목) 계산: groupby.apply vs core.aggregates.daily_top_items.
+
+    uv run python benchmarks/bench_top_k.py [행 수]
+
+합성 지출 데이터(기본 120,000행, 약 5년치 일자)로 두 구현을 실행해 시간을 비교하고 결과가 같은지 확인합니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.aggregates import daily_top_items
+
+ITEMS = ["스타벅스", "택시", "이마트 트레이더스 월계점", "약국", "관리비", "쿠팡", "점심", "주유", "다이소", "넷플릭스"]
+
+
+def make_frame(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2020-01-01", periods=5 * 365, freq="D")
+    return pd.DataFrame({
+        "id":     np.arange(n),
+        "date":   days[rng.integers(0, len(days), n)],
+        "item":   np.array(ITEMS)[rng.integers(0, len(ITEMS), n)],
+        # 동액이 없도록 끝자리를 id로 구분 (동액 순서는 구현마다 다를 수 있음)
+        "amount": rng.integers(10, 2000, n) * 1000 + np.arange(n) % 1000,
+    })
+
+
+def apply_version(df: pd.DataFrame) -> pd.DataFrame:
+    """변경 전 dashboard.py 구현."""
+    def format_item(item, amount):
+        short_item = item if len(item) <= 10 else item[:10] + ".."
+        return f"{short_item}({amount:,})"
+
+    return df.groupby('date').apply(
+        lambda x: pd.Series({
+            '총액': x['amount'].sum(),
+            'top_items': ' / '.join([format_item(row['item'], row['amount']) for _, row in x.sort_values('amount', ascending=False).head(3).iterrows()])
+        })
+    ).reset_index()
+
+
+def timed(fn, df) -> tuple[float, pd.DataFrame]:
+    start = time.perf_counter()
+    result = fn(df)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 120_000
+    df = make_frame(n)
+    old_ms, old = timed(apply_version, df)
+    new_ms, new = timed(daily_top_items, df)
+    same = old["top_items"].tolist() == new["top_items"].tolist() and \
+        old["총액"].astype(int).tolist() == new["총액"].astype(int).tolist()
+    print(f"{n:,} rows, {df['date'].nunique():,} days")
+    print(f"groupby.apply    {old_ms:>9.1f} ms")
+    print(f"daily_top_items  {new_ms:>9.1f} ms  ({old_ms / new_ms:.0f}x, same={same})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_trend_chart.py
+"""
+'전체 기간' 지출 추이 차트: 일별 spline Scatter(변경 전) vs 주/월 집계·LTTB + Scattergl.
+
+    uv run python benchmarks/bench_trend_chart.py [연수] [하루 건수]
+
+합성 지출 데이터로 모드별 그림을 만들어 점 수, 직렬화 JSON 크기(브라우저로 가는 payload),
+서버 측 생성+직렬화 시간, 캐시 적중 시 비용(JSON 파싱)을 비교합니다.
+브라우저 렌더링 시간은 여기서 잴 수 없으므로 점 수·payload 크기로 가늠합니다.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.aggregates import MAX_CHART_POINTS, WEBGL_POINTS, lttb_indices, period_top_items
+
+ITEMS = ["스타벅스", "택시", "이마트 트레이더스 월계점", "약국", "관리비", "쿠팡", "점심", "주유", "다이소", "넷플릭스"]
+
+
+def make_frame(years: int, per_day: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2020-01-01", periods=years * 365, freq="D")
+    n = len(days) * per_day
+    return pd.DataFrame({
+        "date":   days[rng.integers(0, len(days), n)],
+        "item":   np.array(ITEMS)[rng.integers(0, len(ITEMS), n)],
+        "amount": rng.integers(10, 2000, n) * 100,
+    })
+
+
+def figure_json(df: pd.DataFrame, granularity: str, adaptive: bool) -> tuple[str, int]:
+    trend_df = period_top_items(df, granularity, k=3)
+    if adaptive and len(trend_df) > MAX_CHART_POINTS:
+        x = trend_df["date"].to_numpy().astype("datetime64[D]").astype(float)
+        trend_df = trend_df.iloc[lttb_indices(x, trend_df["총액"].to_numpy(), MAX_CHART_POINTS)]
+    webgl = adaptive and len(trend_df) > WEBGL_POINTS
+    trace = go.Scattergl if webgl else go.Scatter
+    fig = go.Figure(trace(
+        x=trend_df["date"], y=trend_df["총액"] / 10000, mode="lines" if webgl else "lines+markers",
+        line=dict(shape="linear" if webgl else "spline"), fill="tozeroy",
+        customdata=trend_df[["총액", "top_items"]],
+        hovertemplate="%{customdata[0]:,.0f}원<br>%{customdata[1]}<extra></extra>",
+    ))
+    return fig.to_json(), len(trend_df)
+
+
+def main() -> None:
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    df = make_frame(years, per_day)
+    print(f"{len(df):,} rows, {df['date'].nunique():,} days")
+    print(f"{'mode':<22}{'points':>8}{'payload KB':>12}{'build ms':>10}{'cached ms':>11}")
+
+    for name, granularity, adaptive in [
+        ("daily spline (before)", "D", False),
+        ("daily LTTB + gl", "D", True),
+        ("weekly + gl", "W", True),
+        ("monthly", "M", True),
+    ]:
+        start = time.perf_counter()
+        payload, points = figure_json(df, granularity, adaptive)
+        build_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        json.loads(payload)
+        cached_ms = (time.perf_counter() - start) * 1000
+        print(f"{name:<22}{points:>8,}{len(payload.encode()) / 1024:>12,.1f}{build_ms:>10.1f}{cached_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/eval_router.py
+"""
+모델 라우팅 평가: 같은 평가셋을 lite / full / routed(라우터 선택) 로 재생해 등급별 지연·정확도를 비교합니다.
+
+    uv run python benchmarks/eval_router.py                # 로컬 대역(FakeBackend)
+    uv run python benchmarks/eval_router.py --live         # 실제 Gemini (GEMINI_API_KEY 필요)
+    uv run python benchmarks/eval_router.py --data my.jsonl
+
+평가셋(jsonl): {"id", "modality": "text", "input", "expected": [{"item", "amount"}, ...]}
+정확도는 금액 기준 F1 (항목명 표기는 모델마다 달라 비교하지 않음).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import date
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import llm
+from config import GEMINI_MODEL_LITE, GEMINI_MODEL_VER, get_flat_categories
+from core.extraction import build_expense_schema, build_extraction_prompt, parse_expense_response
+from core.local_parser import parse_local
+from core.routing import choose_model
+
+DEFAULT_DATA = os.path.join(os.path.dirname(__file__), "data", "router_eval.jsonl")
+
+
+def amount_f1(expected: list[dict], predicted: list[dict]) -> float:
+    exp = Counter(int(e["amount"]) for e in expected)
+    pred = Counter(int(p["amount"]) for p in predicted)
+    hit = sum((exp & pred).values())
+    if not hit:
+        return 0.0
+    precision = hit / sum(pred.values())
+    recall = hit / sum(exp.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def run_case(case: dict, model: str, categories: list[str], today_str: str) -> tuple[float, float]:
+    prompt = build_extraction_prompt(categories, today_str, int(today_str[:4]), case["input"])
+    started = time.perf_counter()
+    try:
+        text = llm.generate(
+            [prompt.user], site="router_eval", model=model,
+            schema=build_expense_schema(categories), system=prompt.system,
+        )
+        predicted = parse_expense_response(text, "공동", today_str)
+    except Exception:
+        predicted = []
+    return amount_f1(case["expected"], predicted), (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default=DEFAULT_DATA)
+    parser.add_argument("--live", action="store_true", help="FakeBackend 대신 실제 Gemini 호출")
+    args = parser.parse_args()
+
+    if not args.live:
+        llm.set_backend(llm.FakeBackend(model_latency_ms={GEMINI_MODEL_LITE: 120, GEMINI_MODEL_VER: 350}))
+
+    cases = [json.loads(line) for line in open(args.data, encoding="utf-8") if line.strip()]
+    categories = get_flat_categories()
+    today_str = date.today().isoformat()
+
+    rows = {"local": [], "lite": [], "full": [], "routed": []}
+    routed_lite = 0
+    for case in cases:
+        started = time.perf_counter()
+        local_items, confidence = parse_local(case["input"], categories, today_str)
+        rows["local"].append((amount_f1(case["expected"], local_items), (time.perf_counter() - started) * 1000))
+
+        rows["lite"].append(run_case(case, GEMINI_MODEL_LITE, categories, today_str))
+        rows["full"].append(run_case(case, GEMINI_MODEL_VER, categories, today_str))
+
+        route = choose_model(case["modality"], text=case["input"], local_confidence=confidence)
+        routed_lite += route.tier == "lite"
+        rows["routed"].append(rows[route.tier][-1])   # 같은 입력·같은 모델 결과 재사용
+
+    print(f"{len(cases)} cases from {args.data} ({'live' if args.live else 'fake backend'})")
+    print(f"{'tier':<10}{'accuracy':>10}{'mean ms':>10}{'p95 ms':>10}")
+    for tier, results in rows.items():
+        acc = sum(r[0] for r in results) / len(results)
+        lat = sorted(r[1] for r in results)
+        print(f"{tier:<10}{acc:>10.3f}{sum(lat) / len(lat):>10.1f}{lat[int(0.95 * (len(lat) - 1))]:>10.1f}")
+    print(f"router sent {routed_lite}/{len(cases)} to lite ({GEMINI_MODEL_LITE}), rest to {GEMINI_MODEL_VER}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
+import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 
 
 def make_radar_chart(df, theta_cols) -> go.Figure:
@@ -75,3 +78,65 @@ def make_equity_progress_chart(monthly_data) -> go.Figure:
         yaxis_title="억원",
     )
     return fig
+
+
+def make_calendar_heatmap(daily, value="amount", unit="원") -> go.Figure:
+    """일별 합계(date, value) → 연도별 달력 히트맵 (행: 월~일, 열: 주차). 지출 없는 날은 빈 칸."""
+    dates = pd.to_datetime(daily["date"])
+    values = daily[value].to_numpy(dtype=float)
+    years = sorted(dates.dt.year.unique().tolist(), reverse=True) or [pd.Timestamp.today().year]
+    fig = make_subplots(rows=len(years), cols=1, subplot_titles=[f"{y}년" for y in years], vertical_spacing=0.25 / len(years))
+    zmax = float(np.nanpercentile(values, 98)) if len(values) else 1.0
+    weekdays = ["월", "화", "수", "목", "금", "토", "일"]
+
+    for row, year in enumerate(years, start=1):
+        # 그 해 1월 1일이 속한 주의 월요일부터 7일씩 → 열 번호
+        jan1 = pd.Timestamp(year=year, month=1, day=1)
+        origin = jan1 - pd.Timedelta(days=jan1.weekday())
+        all_days = pd.date_range(jan1, f"{year}-12-31", freq="D")
+        cols = (all_days - origin).days // 7
+        z = np.full((7, cols.max() + 1), np.nan)
+        text = np.full(z.shape, "", dtype=object)
+        labels = np.asarray(all_days.strftime("%Y-%m-%d"), dtype=object)
+        text[all_days.weekday, cols] = labels + " (" + np.array(weekdays, dtype=object)[all_days.weekday] + ")"
+
+        mask = (dates.dt.year == year).to_numpy()
+        in_year = dates[mask]
+        day_cols = (in_year - origin).dt.days // 7
+        z[in_year.dt.weekday.to_numpy(), day_cols.to_numpy()] = values[mask]
+        fig.add_trace(go.Heatmap(
+            z=z, text=text, x=np.arange(z.shape[1]), y=weekdays,
+            zmin=0, zmax=zmax, colorscale="Reds", showscale=row == 1, xgap=2, ygap=2,
+            hovertemplate="%{text}<br>%{z:,.0f}" + unit + "<extra></extra>",
+        ), row=row, col=1)
+
+        # 월 시작 주차에 월 라벨
+        month_starts = pd.date_range(jan1, periods=12, freq="MS")
+        fig.update_xaxes(
+            tickvals=((month_starts - origin).days // 7).tolist(),
+            ticktext=[f"{m}월" for m in range(1, 13)],
+            showgrid=False, row=row, col=1,
+        )
+        fig.update_yaxes(autorange="reversed", showgrid=False, row=row, col=1)
+
+    fig.update_layout(height=190 * len(years) + 40, margin=dict(l=30, r=10, t=40, b=10))
+    return fig
+
+
+def make_sensitivity_heatmap(z, savings, returns, title="", colorscale="Blues", marker=None, unit="억") -> go.Figure:
+    """월 저축(x, 원) × 연수익률(y, 소수) 격자 값 z[저축, 수익률] 히트맵. marker=(저축, 수익률)이면 현재 선택 표시."""
+    fig = go.Figure(go.Heatmap(
+        z=np.asarray(z).T, x=np.asarray(savings) / 10_000, y=np.asarray(returns) * 100,
+        colorscale=colorscale, colorbar=dict(title=unit),
+        hovertemplate="월 저축 %{x:,.0f}만<br>수익률 %{y:.1f}%<br>%{z:,.2f}" + unit + "<extra></extra>",
+    ))
+    if marker is not None:
+        fig.add_trace(go.Scatter(
+            x=[marker[0] / 10_000], y=[marker[1] * 100], mode="markers", name="현재 설정",
+            marker=dict(symbol="x", size=12, color="black"), hoverinfo="skip",
+        ))
+    fig.update_layout(
+        title=title, xaxis_title="월 저축 (만원)", yaxis_title="연수익률 (%)",
+        showlegend=False, margin=dict(l=10, r=10, t=40, b=10), height=380,
+    )
+    return fig
@@ -0,0 +1,15 @@
+import numpy as np
+import streamlit as st
+
+from core.finance import sensitivity_grid
+
+# 민감도 격자 축: 저축·수익률 슬라이더 범위 전체 (월 저축 0~700만 × 연수익률 0~8%)
+# 슬라이더를 움직여도 캐시 키는 그대로 → 조회만. 현금흐름·부동산 페이지가 같은 격자를 공유.
+SENS_SAVINGS = np.arange(0, 701, 25) * 10_000
+SENS_RETURNS = np.arange(0, 17) * 0.005
+
+
+@st.cache_data(show_spinner=False)
+def sensitivity_table(pv, fixed_assets, horizons: tuple):
+    """월 저축 × 수익률 × horizons(개월) 만기 자기자본 격자 (입력별 캐시)."""
+    return sensitivity_grid(SENS_SAVINGS, SENS_RETURNS, horizons, pv, fixed_assets)
@@ -182,4 +182,8 @@ def get_ledger_status_message(last_date_str):
 # GEMINI Model
 # ==========================================
 
-GEMINI_MODEL_VER = 'gemini-2.5-flash'
\ No newline at end of file
+GEMINI_MODEL_VER = 'gemini-2.5-flash'
+
+# 복잡도 라우팅용 경량 모델 (짧은 텍스트·항목 수가 적은 입력). core/routing.py 참고
+GEMINI_MODEL_LITE = os.getenv("GEMINI_MODEL_LITE", "gemini-2.5-flash-lite")
+ROUTER_ENABLED    = os.getenv("ROUTER_ENABLED", "1") == "1"
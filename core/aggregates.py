@@ -0,0 +1,129 @@
+# core/aggregates.py
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+# ── 대시보드 그룹 집계 (groupby.apply 없이 벡터 연산) ────────────
+MAX_CHART_POINTS = 400   # 추이 차트 한 개에 그리는 최대 점 수 (넘으면 주/월 집계 또는 LTTB)
+WEBGL_POINTS     = 200   # 이 점 수를 넘으면 SVG 대신 WebGL(Scattergl)로 그림
+
+
+def top_k_per_group(
+    df: pd.DataFrame,
+    by: str,
+    value: str,
+    label: Callable[[pd.DataFrame], pd.Series],
+    k: int = 3,
+    sep: str = " / ",
+) -> pd.Series:
+    """
+    그룹별 value 상위 k개 행의 라벨을 큰 순서대로 sep로 이어붙임 → Series(index=그룹 값, 정렬됨).
+    label: 상위 k개로 걸러진 DataFrame을 받아 행별 라벨 Series를 돌려주는 함수
+           (걸러진 행에만 적용되므로 문자열 포맷 비용이 그룹 수 × k로 제한됨).
+    """
+    if df.empty:
+        return pd.Series(dtype=object)
+    # 전체는 value 한 키로만 정렬하고, 그룹 내 순번으로 상위 k개를 고른 뒤 작은 결과만 그룹 순 정렬
+    ordered = df.sort_values(value, ascending=False, kind="stable")
+    rank = ordered.groupby(by, sort=False).cumcount()
+    keep = rank < k
+    top, rank = ordered[keep], rank[keep]
+
+    # 순위별 열로 펼친 뒤(그룹 × k) 열 단위로 이어붙임 — 그룹마다 Python join을 부르지 않음
+    wide = label(top).set_axis(pd.MultiIndex.from_arrays([top[by], rank])).unstack()
+    joined = wide[0]
+    for r in range(1, wide.shape[1]):
+        joined = joined + (sep + wide[r]).fillna("")
+    return joined.sort_index()
+
+
+def item_amount_labels(top: pd.DataFrame, max_len: int = 10) -> pd.Series:
+    """'품목(12,345)' 라벨. 품목명은 max_len자를 넘으면 잘라 '..'을 붙임."""
+    items = top["item"].astype(str)
+    short = items.where(items.str.len() <= max_len, items.str.slice(0, max_len) + "..")
+    return short + "(" + top["amount"].map("{:,}".format) + ")"
+
+
+def daily_top_items(df: pd.DataFrame, k: int = 3) -> pd.DataFrame:
+    """일별 총액과 상위 k개 지출 라벨 → DataFrame[date, 총액, top_items]."""
+    return period_top_items(df, "D", k=k)
+
+
+def period_top_items(df: pd.DataFrame, freq: str, k: int = 3) -> pd.DataFrame:
+    """
+    기간별 총액과 상위 k개 지출 라벨 → DataFrame[date, 총액, top_items].
+    freq: 'D' 일, 'W' 주(월요일 시작), 'M' 월(1일). date 열은 각 기간의 시작일.
+    """
+    bucketed = df.assign(date=bucket_start(df["date"], freq))
+    totals = bucketed.groupby("date")["amount"].sum().rename("총액").to_frame()
+    totals["top_items"] = top_k_per_group(bucketed, "date", "amount", item_amount_labels, k=k)
+    return totals.reset_index()
+
+
+def _as_datetime(dates: pd.Series) -> pd.Series:
+    # 이미 datetime이면 그대로 (to_datetime은 변환할 게 없어도 캐시 판단에 전체를 훑음)
+    return dates if pd.api.types.is_datetime64_any_dtype(dates) else pd.to_datetime(dates)
+
+
+def bucket_start(dates: pd.Series, freq: str) -> pd.Series:
+    """날짜 → 속한 기간의 시작일 ('D' 당일, 'W' 그 주 월요일, 'M' 그 달 1일)."""
+    dates = _as_datetime(pd.Series(dates)).dt.normalize()
+    if freq == "W":
+        return dates - pd.to_timedelta(dates.dt.weekday, unit="D")
+    if freq == "M":
+        return dates.dt.to_period("M").dt.start_time
+    return dates
+
+
+def patch_period_top_items(trend: pd.DataFrame, df: pd.DataFrame, freq: str, dates, k: int = 3) -> pd.DataFrame:
+    """
+    수정·삭제로 값이 바뀐 날짜(dates)가 속한 기간만 df(수정 반영 후 원본 행)에서 다시 집계해
+    period_top_items 결과(trend)에 끼워 넣음. 나머지 기간은 그대로 재사용합니다.
+    """
+    starts = bucket_start(pd.Series(list(dates)), freq).drop_duplicates()
+    ends = starts + (pd.offsets.MonthBegin(1) if freq == "M" else pd.Timedelta(days=7 if freq == "W" else 1))
+    row_dates = _as_datetime(df["date"])
+    mask = np.zeros(len(df), dtype=bool)
+    for start, end in zip(starts, ends):
+        mask |= ((row_dates >= start) & (row_dates < end)).to_numpy()
+    fresh = period_top_items(df[mask], freq, k=k) if mask.any() else trend.iloc[:0]
+    kept = trend[~trend["date"].isin(starts)]
+    return pd.concat([kept, fresh], ignore_index=True).sort_values("date", ignore_index=True)
+
+
+def choose_granularity(n_days: int, max_points: int = MAX_CHART_POINTS) -> str:
+    """일 단위 점 수가 max_points 이하가 되는 가장 세밀한 단위 ('D' → 'W' → 'M')."""
+    if n_days <= max_points:
+        return "D"
+    if n_days / 7 <= max_points:
+        return "W"
+    return "M"
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링 → 남길 점의 인덱스 (x 오름차순 가정).
+    양 끝 점은 항상 남기고, 가운데는 n_out-2개 구간마다 이전 선택점·다음 구간 평균과
+    이루는 삼각형 넓이가 가장 큰 점을 골라 급등·급락 같은 모양을 보존합니다.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    picked = np.empty(n_out, dtype=int)
+    picked[0], picked[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[hi:next_hi].mean(), y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        picked[i + 1] = a
+    return picked
@@ -0,0 +1,127 @@
+# core/audio.py
+from __future__ import annotations
+
+import io
+import time
+import wave
+
+import numpy as np
+
+# ── 음성 메모 전처리 ─────────────────────────────────────────
+# 녹음기(audio-recorder-streamlit)가 주는 44.1/48kHz WAV를 받아쓰기에 충분한
+# 16kHz 모노 16bit로 줄이고, 앞뒤 무음을 자른 뒤 긴 녹음은 조용한 지점에서 나눕니다.
+TARGET_SAMPLE_RATE = 16_000
+CHUNK_SEC          = 30       # 청크 최대 길이 (요청 1건당 오디오 길이)
+SPLIT_SEARCH_SEC   = 3        # 청크 끝 이 구간 안에서 가장 조용한 지점을 찾아 자름
+FRAME_MS           = 20       # 에너지 계산 프레임
+SILENCE_RATIO      = 0.05     # 최대 프레임 에너지 대비 이 비율 이하를 무음으로 간주
+
+TRANSCRIBE_PROMPT = (
+    "첨부된 음성 메모를 한국어로 그대로 받아쓰세요. "
+    "금액은 '4500원'처럼 숫자와 '원'으로 적고, 설명 없이 받아쓴 문장만 출력하세요."
+)
+
+
+def decode_wav(data: bytes) -> tuple[np.ndarray, int]:
+    """WAV 바이트 → (-1~1 float32 모노 샘플, 샘플레이트)."""
+    with wave.open(io.BytesIO(data)) as wf:
+        rate, channels, width = wf.getframerate(), wf.getnchannels(), wf.getsampwidth()
+        raw = wf.readframes(wf.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"지원하지 않는 WAV 샘플 폭: {width * 8}bit")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, rate
+
+
+def encode_wav(samples: np.ndarray, rate: int) -> bytes:
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+def resample(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """선형 보간 리샘플링. 다운샘플 전 이동평균으로 고역을 줄여 에일리어싱을 완화."""
+    if src_rate == dst_rate or len(samples) == 0:
+        return samples
+    if src_rate > dst_rate:
+        width = int(round(src_rate / dst_rate))
+        if width > 1:
+            samples = np.convolve(samples, np.ones(width, dtype=np.float32) / width, mode="same")
+    n_out = int(len(samples) * dst_rate / src_rate)
+    x_out = np.linspace(0, len(samples) - 1, n_out)
+    return np.interp(x_out, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def frame_energy(samples: np.ndarray, rate: int) -> np.ndarray:
+    frame = max(int(rate * FRAME_MS / 1000), 1)
+    n = len(samples) // frame
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.sqrt((samples[:n * frame].reshape(n, frame) ** 2).mean(axis=1))
+
+
+def trim_silence(samples: np.ndarray, rate: int) -> np.ndarray:
+    energy = frame_energy(samples, rate)
+    if len(energy) == 0 or energy.max() == 0:
+        return samples[:0]
+    voiced = np.flatnonzero(energy > energy.max() * SILENCE_RATIO)
+    frame = max(int(rate * FRAME_MS / 1000), 1)
+    # 앞뒤로 한 프레임씩 여유를 둬 첫·끝 음절이 잘리지 않게 함
+    start = max(voiced[0] - 1, 0) * frame
+    end = min((voiced[-1] + 2) * frame, len(samples))
+    return samples[start:end]
+
+
+def split_chunks(samples: np.ndarray, rate: int, chunk_sec: float = CHUNK_SEC) -> list[np.ndarray]:
+    """chunk_sec 이하 조각으로 분할. 각 경계는 끝 SPLIT_SEARCH_SEC 구간의 최저 에너지 프레임."""
+    max_len = int(chunk_sec * rate)
+    if len(samples) <= max_len:
+        return [samples]
+
+    frame = max(int(rate * FRAME_MS / 1000), 1)
+    search = int(SPLIT_SEARCH_SEC * rate)
+    chunks, start = [], 0
+    while len(samples) - start > max_len:
+        window = samples[start + max_len - search:start + max_len]
+        energy = frame_energy(window, rate)
+        cut = start + max_len - search + int(energy.argmin()) * frame if len(energy) else start + max_len
+        chunks.append(samples[start:cut])
+        start = cut
+    chunks.append(samples[start:])
+    return chunks
+
+
+def prepare_audio(data: bytes, chunk_sec: float = CHUNK_SEC) -> dict:
+    """
+    녹음 WAV → 16kHz 모노 WAV 청크 리스트.
+    반환: {chunks: [bytes], duration_sec, original_bytes, bytes_sent, elapsed_ms}
+    """
+    start = time.perf_counter()
+    samples, rate = decode_wav(data)
+    samples = resample(samples, rate, TARGET_SAMPLE_RATE)
+    samples = trim_silence(samples, TARGET_SAMPLE_RATE)
+    chunks = [
+        encode_wav(chunk, TARGET_SAMPLE_RATE)
+        for chunk in split_chunks(samples, TARGET_SAMPLE_RATE, chunk_sec) if len(chunk)
+    ]
+    return {
+        "chunks":         chunks,
+        "duration_sec":   len(samples) / TARGET_SAMPLE_RATE,
+        "original_bytes": len(data),
+        "bytes_sent":     sum(len(c) for c in chunks),
+        "elapsed_ms":     (time.perf_counter() - start) * 1000,
+    }
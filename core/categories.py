@@ -0,0 +1,45 @@
+# core/categories.py
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# ── 카테고리 차원 (id, name, type) ────────────────────────────
+# 카테고리 이름 → 정수 코드 → 소비성향 배열로 바꿔 두고, 행 단위 lambda 매핑 대신
+# get_indexer + take 한 번으로 지출 행 전체의 소비성향을 붙입니다.
+# 코드 -1(테이블에 없는 카테고리)은 마지막 칸의 '미분류'로 떨어집니다.
+UNCLASSIFIED = "미분류"
+
+
+class CategoryDim:
+    def __init__(self, ids, names, types):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.names = pd.Index(list(names), dtype=object)
+        filled = [t if t else UNCLASSIFIED for t in types]
+        self.types = np.asarray(filled + [UNCLASSIFIED], dtype=object)
+        self.mapping = dict(zip(self.names, filled))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "CategoryDim":
+        """categories 행(id, name, type) → 차원. type 결측은 '미분류'."""
+        types = df["type"].astype(object).where(df["type"].notna(), None).tolist()
+        return cls(df["id"].to_numpy(), df["name"].tolist(), types)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def codes(self, categories) -> np.ndarray:
+        """카테고리 이름 → 정수 코드 (없는 이름·결측은 '미분류' 칸 = len(self))."""
+        # 행마다 해시하지 않도록 고유값만 사전에서 찾고, 행 코드는 factorize 코드로 take
+        if not isinstance(categories, (pd.Series, pd.Index)):
+            categories = np.asarray(categories, dtype=object)
+        row_codes, uniques = pd.factorize(categories)
+        lookup = self.names.get_indexer(uniques)
+        lookup = np.append(np.where(lookup < 0, len(self.names), lookup), len(self.names))
+        return lookup.take(row_codes)            # row_codes -1(결측) → 마지막 칸
+
+    def type_of(self, categories) -> pd.Series:
+        """카테고리 열 → 소비성향 열 (입력이 Series면 인덱스 유지)."""
+        index = categories.index if isinstance(categories, pd.Series) else None
+        # dtype=object 명시: 생략하면 pandas가 문자열 추론·변환으로 take보다 몇 배 더 씀
+        return pd.Series(self.types.take(self.codes(categories)), index=index, name="소비성향", dtype=object)
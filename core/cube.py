@@ -0,0 +1,112 @@
+# core/cube.py
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# ── 월 × 카테고리 × 지출자 집계 큐브 ───────────────────────────
+# 합계·건수를 (월, 카테고리, 지출자) 3차원 배열로 들고 있다가 쓰기 변경분(±금액)만 더해 갱신합니다.
+# 페이지마다 원본 행을 groupby 하던 월 합계, 카테고리별 합계, 필수/선택 비율을 배열 합으로 바로 꺼냅니다.
+# 선택 인자: None·"전체"·"전체 기간" = 전체, 문자열 = 한 값, 리스트 = 여러 값.
+ALL = (None, "전체", "전체 기간")
+AXES = ("month", "category", "spender")
+
+
+def _labels(values, default: str, width: int | None = None):
+    """축 라벨 정리 (결측 → default, width가 있으면 앞 width자). 큰 입력은 Series 벡터 연산, 작은 변경분은 리스트."""
+    if isinstance(values, pd.Series):
+        labels = values.fillna(default).astype(str)
+        return labels.str.slice(0, width) if width else labels
+    labels = [default if v is None or v != v else str(v) for v in values]   # v != v: NaN
+    return [v[:width] for v in labels] if width else labels
+
+
+class LedgerCube:
+    def __init__(self):
+        self.labels: dict[str, list[str]] = {axis: [] for axis in AXES}
+        self._index: dict[str, dict[str, int]] = {axis: {} for axis in AXES}
+        self.amount = np.zeros((0, 0, 0), dtype=np.int64)
+        self.count = np.zeros((0, 0, 0), dtype=np.int64)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "LedgerCube":
+        """expenses 행(date, category, spender, amount) → 큐브."""
+        cube = cls()
+        if not df.empty:
+            cube.apply(df["date"], df["category"], df["spender"], df["amount"])
+        return cube
+
+    # ── 갱신 ──────────────────────────────────────────────────
+
+    def _codes(self, axis: str, values) -> np.ndarray:
+        """라벨 → 축 인덱스. 처음 보는 라벨은 축 끝에 추가하고 배열을 늘림."""
+        index, labels = self._index[axis], self.labels[axis]
+        inverse, uniques = pd.factorize(values if isinstance(values, pd.Series) else np.asarray(values, dtype=object))
+        new = [u for u in uniques if u not in index]
+        if new:
+            for label in new:
+                index[label] = len(labels)
+                labels.append(label)
+            pad = [(0, 0)] * 3
+            pad[AXES.index(axis)] = (0, len(new))
+            self.amount = np.pad(self.amount, pad)
+            self.count = np.pad(self.count, pad)
+        return np.array([index[u] for u in uniques], dtype=np.intp)[inverse]
+
+    def apply(self, dates, categories, spenders, amounts, signs=1) -> None:
+        """
+        변경분 반영. signs: 행별 +1(추가) / -1(삭제), 스칼라면 전체에 적용.
+        수정은 이전 값 -1, 새 값 +1 두 행으로 넘기면 됩니다.
+        """
+        m = self._codes("month", _labels(dates, "", width=7))
+        c = self._codes("category", _labels(categories, "미분류"))
+        s = self._codes("spender", _labels(spenders, "공동"))
+        signs = np.broadcast_to(np.asarray(signs, dtype=np.int64), m.shape)
+        amounts = np.nan_to_num(np.asarray(amounts, dtype=float)).astype(np.int64)
+        np.add.at(self.amount, (m, c, s), amounts * signs)
+        np.add.at(self.count, (m, c, s), signs)
+
+    # ── 조회 ──────────────────────────────────────────────────
+
+    def _selector(self, axis: str, value):
+        if value in ALL:
+            return slice(None)
+        values = [value] if isinstance(value, str) else list(value)
+        index = self._index[axis]
+        return np.array([index[v] for v in values if v in index], dtype=np.intp)
+
+    def _view(self, array: np.ndarray, month=None, category=None, spender=None) -> np.ndarray:
+        view = array
+        for pos, (axis, value) in enumerate(zip(AXES, (month, category, spender))):
+            selector = self._selector(axis, value)
+            if not isinstance(selector, slice):
+                view = np.take(view, selector, axis=pos)
+        return view
+
+    def sum(self, month=None, category=None, spender=None) -> int:
+        return int(self._view(self.amount, month, category, spender).sum())
+
+    def total_count(self, month=None, category=None, spender=None) -> int:
+        return int(self._view(self.count, month, category, spender).sum())
+
+    def rollup(self, axis: str, month=None, category=None, spender=None) -> pd.Series:
+        """axis별 합계 Series (나머지 축은 합산, 건수 0인 라벨 제외)."""
+        pos = AXES.index(axis)
+        others = tuple(i for i in range(3) if i != pos)
+        amount = self._view(self.amount, month, category, spender).sum(axis=others)
+        count = self._view(self.count, month, category, spender).sum(axis=others)
+        selector = self._selector(axis, (month, category, spender)[pos])
+        labels = np.asarray(self.labels[axis], dtype=object)[selector]
+        keep = count != 0
+        return pd.Series(amount[keep], index=labels[keep], name="amount", dtype=np.int64)
+
+    def rollup_types(self, mapping: dict, month=None, spender=None) -> dict:
+        """카테고리 → 소비성향 매핑으로 묶은 합계 {소비성향: amount}. 매핑에 없는 카테고리는 '미분류'."""
+        amount = self._view(self.amount, month, None, spender).sum(axis=(0, 2))
+        count = self._view(self.count, month, None, spender).sum(axis=(0, 2))
+        totals: dict[str, int] = {}
+        for label, value, n in zip(self.labels["category"], amount.tolist(), count.tolist()):
+            if n:
+                key = mapping.get(label, "미분류")
+                totals[key] = totals.get(key, 0) + value
+        return totals
@@ -0,0 +1,278 @@
+# core/extraction.py
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime
+
+from dateutil.relativedelta import relativedelta
+
+from core import metrics
+from core.prompts import Prompt
+
+# ── 지출 추출 프롬프트 / 응답 해석 ─────────────────────────────
+# home.py(단건 입력)와 벤치마크 스크립트가 같은 로직을 공유하도록 분리했습니다.
+
+
+def build_extraction_system(categories: list[str]) -> str:
+    """호출 간 불변인 정적 접두부 (역할·규칙·예시·카테고리 목록). 캐시 대상."""
+    return f"""
+    당신은 가계부 정리 전문가입니다.
+
+    [기준 정보]
+    - 가능 카테고리: {", ".join(categories)} (이 중에서만 선택, 없으면 '기타')
+    - 날짜가 없거나 연도가 생략된 경우 사용자 입력에 주어진 작성 기준일·기준 연도를 따르세요.
+
+    [추출 항목]
+    1. date (YYYY-MM-DD)
+    2. item (항목명)
+    3. amount (금액, 숫자만)
+    4. category (위 목록 중 하나)
+
+    입력된 내용에 여러 건의 지출이 있다면 반드시 배열([])로 반환하세요.
+    JSON 예시: [{{"date": "YYYY-MM-DD", "item": "커피", "amount": 4500, "category": "외식"}}, {{"date": "YYYY-MM-DD", "item": "택시", "amount": 12000, "category": "교통비"}}]
+    응답은 반드시 순수한 JSON 문자열이어야 합니다.
+    """
+
+
+def build_extraction_prompt(categories: list[str], today_str: str, year: int, user_content: str = "") -> Prompt:
+    """정적 접두부(system) + 호출별 데이터(user: 기준일·입력 내용)."""
+    user = f"- 작성 기준일: {today_str}\n- 기준 연도: {year}년"
+    if user_content:
+        user += f"\n\n{user_content}"
+    return Prompt(build_extraction_system(categories), user)
+
+
+# ── 구조화 출력 스키마 ───────────────────────────────────────
+# Gemini response_schema(OpenAPI 부분집합)로 전달해 date/item/amount/category/spender만 받도록 강제합니다.
+SPENDERS = ["공동", "남편", "아내", "아이"]
+MAX_REPAIR_ATTEMPTS = 2
+
+
+def build_expense_schema(categories: list[str], with_source: bool = False) -> dict:
+    """with_source=True: 여러 입력을 한 요청에 묶을 때 각 항목이 몇 번 입력에서 나왔는지(source) 함께 받음."""
+    item_schema = {
+        "type": "OBJECT",
+        "properties": {
+            "date":     {"type": "STRING", "description": "YYYY-MM-DD"},
+            "item":     {"type": "STRING"},
+            "amount":   {"type": "INTEGER"},
+            "category": {"type": "STRING", "enum": list(categories)},
+            "spender":  {"type": "STRING", "enum": SPENDERS},
+        },
+        "required": ["date", "item", "amount", "category"],
+    }
+    if with_source:
+        item_schema["properties"]["source"] = {"type": "INTEGER", "description": "입력 번호 [n]"}
+        item_schema["required"].append("source")
+    return {"type": "ARRAY", "items": item_schema}
+
+
+def build_batch_prompt(categories: list[str], today_str: str, year: int, labels: list[str]) -> Prompt:
+    """
+    여러 입력을 한 요청으로 묶는 프롬프트. labels[n]은 n번 입력 (텍스트 메모 또는 '이미지 n번째' 안내).
+    정적 접두부는 단건 추출과 같아서 캐시를 그대로 공유합니다.
+    """
+    listing = "\n".join(f"[{n}] {label}" for n, label in enumerate(labels))
+    user = (
+        f"- 작성 기준일: {today_str}\n- 기준 연도: {year}년\n\n"
+        f"아래 {len(labels)}개 입력에서 지출을 모두 추출하고, 각 항목의 source에 입력 번호 n을 넣으세요.\n"
+        f"이미지는 첨부된 순서대로 번호가 매겨져 있습니다.\n\n{listing}"
+    )
+    return Prompt(build_extraction_system(categories), user)
+
+
+def build_repair_prompt(fragment: str) -> str:
+    return f"""아래는 가계부 지출 1건을 나타내려던 JSON 조각인데 형식이 깨졌습니다.
+같은 내용을 date(YYYY-MM-DD), item, amount(정수), category 키를 가진 올바른 JSON 객체 하나로만 고쳐서 반환하세요.
+설명 없이 JSON만 출력하세요.
+
+{fragment}"""
+
+
+def to_entry(item: dict, spender: str, today_str: str) -> dict:
+    """모델이 돌려준 dict 1건을 expenses 테이블 스키마에 맞게 정규화합니다."""
+    return {
+        "date":     item.get("date", today_str),
+        "item":     item.get("item", "알 수 없음"),
+        "amount":   int(str(item.get("amount", 0)).replace(",", "")),
+        "category": item.get("category", "기타"),
+        "spender":  spender,
+    }
+
+
+def is_valid_item(obj) -> bool:
+    if not isinstance(obj, dict) or "amount" not in obj:
+        return False
+    try:
+        int(str(obj["amount"]).replace(",", ""))
+    except ValueError:
+        return False
+    return True
+
+
+class JsonItemStream:
+    """
+    응답 텍스트를 조각(chunk) 단위로 받아 완성된 최상위 JSON 객체({...})를 즉시 꺼내는 파서.
+
+    - 중괄호 깊이와 문자열/이스케이프 상태만 추적하므로 ```json 펜스, 앞뒤 설명문,
+      배열 괄호가 섞여 있어도 객체 단위로 분리됩니다.
+    - 객체 하나가 json.loads / 검증에 실패해도 나머지는 살리고, 실패 조각은 failed에 모읍니다.
+    """
+
+    def __init__(self):
+        self._buf: list[str] = []
+        self._depth = 0
+        self._in_str = False
+        self._escape = False
+        self.failed: list[str] = []
+
+    def feed(self, chunk: str) -> list[dict]:
+        items = []
+        for ch in chunk:
+            if self._depth == 0 and ch != "{":
+                continue
+            self._buf.append(ch)
+            if self._in_str:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_str = False
+            elif ch == '"':
+                self._in_str = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    fragment = "".join(self._buf)
+                    self._buf = []
+                    try:
+                        obj = json.loads(fragment)
+                    except json.JSONDecodeError:
+                        obj = None
+                    if is_valid_item(obj):
+                        items.append(obj)
+                    else:
+                        self.failed.append(fragment)
+        return items
+
+    def close(self) -> list[str]:
+        """스트림 종료. 닫히지 않은 채 끊긴 마지막 조각까지 포함한 실패 목록 반환."""
+        if self._buf:
+            self.failed.append("".join(self._buf))
+            self._buf = []
+            self._depth = 0
+            self._in_str = self._escape = False
+        return self.failed
+
+
+def salvage_items(text: str) -> tuple[list[dict], list[str]]:
+    stream = JsonItemStream()
+    items = stream.feed(text or "")
+    return items, stream.close()
+
+
+def repair_fragments(fragments: list[str], generate_text, site: str | None = None) -> list[dict]:
+    """
+    실패한 조각만 모델에 다시 보내 복구합니다 (조각당 최대 MAX_REPAIR_ATTEMPTS회).
+    generate_text: prompt(str) → 응답 텍스트(str) 콜러블
+    """
+    recovered = []
+    for fragment in fragments:
+        for _ in range(MAX_REPAIR_ATTEMPTS):
+            if site:
+                metrics.record(site, "repair_retry", 1)
+            try:
+                items, _ = salvage_items(generate_text(build_repair_prompt(fragment)))
+            except Exception:
+                items = []
+            if items:
+                recovered.append(items[0])
+                break
+        if site:
+            metrics.record(site, "repair_recovered", 1 if items else 0)
+    return recovered
+
+
+def parse_expense_response(
+    text: str, spender: str, today_str: str, generate_text=None, site: str | None = None,
+) -> list[dict]:
+    """
+    응답 → expenses 행 리스트. 깨진 객체가 있어도 유효한 항목은 살리고,
+    generate_text가 주어지면 실패 조각만 재요청해 복구합니다.
+    """
+    if not text:
+        raise ValueError("Gemini로부터 빈 응답이 왔습니다.")
+
+    items, failed = salvage_items(text)
+    if site:
+        metrics.record(site, "parse_items_ok", len(items))
+        metrics.record(site, "parse_failure", 1 if failed else 0)
+
+    if failed and generate_text is not None:
+        items += repair_fragments(failed, generate_text, site)
+
+    if not items:
+        raise ValueError(f"응답에서 지출 항목을 찾지 못했습니다: {text[:200]}")
+    return [to_entry(item, spender, today_str) for item in items]
+
+
+def stream_expense_entries(
+    chunks, spender: str, today_str: str, generate_text=None, site: str | None = None,
+):
+    """
+    스트리밍 응답 조각(텍스트 iterable)을 받아 완성된 expenses 행을 도착 즉시 yield 합니다.
+    첫 항목까지 걸린 시간(ttfi_ms)과 전체 완료 시간(complete_ms)을 site 지표로 기록합니다.
+    """
+    stream = JsonItemStream()
+    started = time.perf_counter()
+    n_items = 0
+
+    for chunk in chunks:
+        for item in stream.feed(chunk):
+            if n_items == 0 and site:
+                metrics.record(site, "ttfi_ms", (time.perf_counter() - started) * 1000)
+            n_items += 1
+            yield to_entry(item, spender, today_str)
+
+    failed = stream.close()
+    if site:
+        metrics.record(site, "parse_items_ok", n_items)
+        metrics.record(site, "parse_failure", 1 if failed else 0)
+
+    if failed and generate_text is not None:
+        for item in repair_fragments(failed, generate_text, site):
+            n_items += 1
+            yield to_entry(item, spender, today_str)
+
+    if site:
+        metrics.record(site, "complete_ms", (time.perf_counter() - started) * 1000)
+    if n_items == 0:
+        raise ValueError("응답에서 지출 항목을 찾지 못했습니다.")
+
+
+def apply_installments(entries: list[dict], installment_months: int) -> list[dict]:
+    """할부 개월 수만큼 월별로 금액을 나눠 행을 펼칩니다. 1개월이면 그대로 반환."""
+    if installment_months <= 1:
+        return entries
+
+    final_entries = []
+    for entry in entries:
+        total_amt = entry["amount"]
+        try:
+            base_date = datetime.strptime(entry["date"], "%Y-%m-%d")
+        except Exception:
+            base_date = datetime.now()
+
+        monthly_amt = total_amt // installment_months
+        for i in range(installment_months):
+            next_date = base_date + relativedelta(months=i)
+            inst_entry = entry.copy()
+            inst_entry["date"] = next_date.strftime("%Y-%m-%d")
+            inst_entry["amount"] = monthly_amt
+            inst_entry["item"] = f"{entry['item']} ({i+1}/{installment_months})"
+            final_entries.append(inst_entry)
+    return final_entries
@@ -1,6 +1,13 @@
 # core/finance.py
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
 def calculate_fv(pmt: float, r_annual: float, n_months: int) -> float:
     if r_annual == 0:
         return pmt * n_months
@@ -30,6 +37,246 @@ def calculate_total_equity(
         + subscription
     )
 
+# ── 배열 버전 (브로드캐스트) ──────────────────────────────────
+# 위 스칼라 함수와 같은 식·같은 분기(r = 0)를 배열 인자에 원소별로 적용합니다.
+# 인자끼리 브로드캐스트되고, 모두 스칼라면 np.float64(float 하위형)를 돌려줍니다.
+
+def _f(x) -> np.ndarray:
+    return np.asarray(x, dtype=float)
+
+
+def calculate_fv_array(pmt, r_annual, n_months):
+    pmt, r, n = np.broadcast_arrays(_f(pmt), _f(r_annual) / 12, _f(n_months))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fv = np.where(r == 0, pmt * n, pmt * ((1 + r) ** n - 1) / r)
+    return fv[()]
+
+
+def calculate_asset_fv_array(pv, r_annual, n_months):
+    return (_f(pv) * (1 + _f(r_annual) / 12) ** _f(n_months))[()]
+
+
+def calculate_max_loan_array(monthly_income, rate_annual, years):
+    annual_limit = _f(monthly_income) * 12 * 0.4
+    r = _f(rate_annual) / 12
+    n = _f(years) * 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        loan = np.where(r == 0, annual_limit / 12 * n, (annual_limit / 12) / r * (1 - (1 + r) ** -n))
+    return loan[()]
+
+
+def opportunity_cost_array(tax_amount, r_annual, years):
+    tax = _f(tax_amount)
+    return (tax * (1 + _f(r_annual)) ** _f(years) - tax)[()]
+
+
+# ── 자기자본 추이 엔진 (벡터화) ──────────────────────────────
+# calculate_total_equity를 0~n개월 전 구간, 여러 파라미터 조합에 대해 한 번에 계산합니다.
+# 스칼라·배열 인자는 서로 브로드캐스트되고, 마지막 축이 개월(0..n_months)입니다.
+
+def project_equity(
+    monthly_saving, r_annual, n_months: int, current_investment, fixed_assets=0.0,
+) -> np.ndarray:
+    """월별 자기자본 경로 → shape (*인자 브로드캐스트 shape, n_months + 1)."""
+    return _equity_at(monthly_saving, r_annual, np.arange(n_months + 1), current_investment, fixed_assets)
+
+
+def _equity_at(monthly_saving, r_annual, months: np.ndarray, current_investment, fixed_assets) -> np.ndarray:
+    """months(정수 배열) 시점들의 자기자본 → 마지막 축이 months."""
+    pmt, rate, pv, fixed = (
+        np.asarray(a, dtype=float)[..., None]
+        for a in (monthly_saving, r_annual, current_investment, fixed_assets)
+    )
+    growth, annuity = _growth_annuity(rate, months)
+    return pmt * annuity + pv * growth + fixed
+
+
+def _growth_annuity(r_annual, n_months):
+    """원소별 (일시금 성장 배수 (1+r/12)^n, 적립식 FV 계수). r = 0이면 계수는 개월 수 (calculate_fv와 동일)."""
+    r = np.asarray(r_annual, dtype=float) / 12
+    growth = (1 + r) ** n_months
+    annuity = np.array(np.broadcast_to(n_months, growth.shape), dtype=float)
+    np.divide(growth - 1, r, out=annuity, where=r != 0)
+    return growth, annuity
+
+
+def equity_projection_frame(
+    start: date, n_months: int, monthly_saving: float, r_annual: float,
+    current_investment: float, fixed_assets: float = 0.0, step: int = 12,
+) -> pd.DataFrame:
+    """
+    단일 시나리오 자기자본 추이 표: start 월부터 step개월 간격 + 마지막(n_months) 월.
+    columns: date(YYYY-MM), year, months, 적립금, 투자자산, 총 자기자본
+    """
+    n_months = max(int(n_months), 0)
+    months = np.union1d(np.arange(0, n_months + 1, step), [n_months])
+    total = _equity_at(monthly_saving, r_annual, months, current_investment, fixed_assets)
+    saving = _equity_at(monthly_saving, r_annual, months, 0.0, 0.0)
+    periods = pd.Period(start, freq="M") + months
+    return pd.DataFrame({
+        "date":        [p.strftime("%Y-%m") for p in periods],
+        "year":        [p.year for p in periods],
+        "months":      months,
+        "적립금":      saving,
+        "투자자산":    total - saving - fixed_assets,
+        "총 자기자본": total,
+    })
+
+
+def sensitivity_grid(
+    savings, returns, horizons, current_investment: float, fixed_assets: float = 0.0,
+) -> np.ndarray:
+    """
+    월 저축 × 연수익률 × 기간(개월) 조합 전체의 만기 자기자본 → shape (len(savings), len(returns), len(horizons)).
+    경로 전체가 아니라 horizons 시점만 계산.
+    """
+    savings, returns = np.asarray(savings, dtype=float), np.asarray(returns, dtype=float)
+    return _equity_at(savings[:, None], returns[None, :], np.asarray(horizons, dtype=int),
+                      current_investment, fixed_assets)
+
+
+# ── 목표 역산 (필요 저축·최단 시점·필요 수익률) ───────────────
+# calculate_total_equity = 저축 × 적립계수 + 투자자산 × 성장배수 + 고정자산 을 목표값에 대해 풀어 줍니다.
+# 모든 인자는 브로드캐스트되므로 목표 여러 개를 배열로 한 번에 풀 수 있습니다.
+
+def required_saving(target_equity, r_annual, n_months, current_investment, fixed_assets=0.0) -> np.ndarray:
+    """n_months 뒤 목표에 닿는 최소 월 저축 (닫힌 해). 이미 닿으면 0, 기간 0인데 모자라면 inf."""
+    growth, annuity = _growth_annuity(r_annual, np.asarray(n_months, dtype=float))
+    gap = np.asarray(target_equity, dtype=float) - np.asarray(current_investment) * growth - fixed_assets
+    with np.errstate(divide="ignore", invalid="ignore"):   # 기간 0: gap/0 (inf) · 0/0 (이미 닿음)
+        need = np.where(gap > 0, gap / annuity, 0.0)
+    return np.where((gap > 0) & (annuity == 0), np.inf, need)
+
+
+def earliest_month(target_equity, monthly_saving, r_annual, current_investment, fixed_assets=0.0) -> np.ndarray:
+    """
+    목표에 처음 닿는 개월 수 (닫힌 해, 올림). 이미 닿으면 0, 영원히 못 닿으면 inf.
+    r > 0: (pv + s/i)(1+i)^n = 목표 - 고정 + s/i 를 n에 대해 로그로, r = 0: 선형.
+    """
+    target, s, rate, pv = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (
+        target_equity, monthly_saving, r_annual, current_investment)))
+    gap = target - fixed_assets
+    i = rate / 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        level = np.where(i != 0, s / i, 0.0)
+        ratio = (gap + level) / (pv + level)
+        n_growth = np.log(ratio) / np.log1p(i)
+        n_linear = (gap - pv) / s
+        n = np.where(i != 0, n_growth, n_linear)
+    n = np.where(np.isfinite(n) & (n >= 0) & ((i != 0) | (s > 0)), np.ceil(n - 1e-9), np.inf)
+    return np.where(pv >= gap, 0.0, n)
+
+
+def required_return(
+    target_equity, monthly_saving, n_months, current_investment, fixed_assets=0.0,
+    r_max: float = 0.5, tol: float = 1.0, max_iter: int = 60,
+) -> np.ndarray:
+    """
+    n_months 뒤 목표에 닿는 최소 연수익률 (닫힌 해 없음 → 뉴턴 + 이분법 보호).
+    0% 로도 닿으면 0, r_max(연 50%)로도 못 닿으면 nan. tol: 목표와의 허용 오차(원).
+    """
+    target, s, n, pv = (a.ravel() for a in np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+        target_equity, monthly_saving, n_months, current_investment))))
+    gap = target - fixed_assets
+
+    def excess(r, k):
+        growth, annuity = _growth_annuity(r, n[k])
+        return s[k] * annuity + pv[k] * growth - gap[k]
+
+    everything = np.arange(len(gap))
+    solved = excess(np.zeros(len(gap)), everything) >= 0
+    feasible = excess(np.full(len(gap), r_max), everything) >= 0
+    r = np.where(solved, 0.0, r_max / 2)
+    lo, hi = np.zeros(len(gap)), np.full(len(gap), r_max)
+    # 아직 안 풀린 목표만 골라 반복 (수렴한 목표는 다시 계산하지 않음)
+    k = np.flatnonzero(feasible & ~solved)
+    for _ in range(max_iter):
+        if not len(k):
+            break
+        f = excess(r[k], k)
+        k, f = k[np.abs(f) > tol], f[np.abs(f) > tol]
+        # 부호로 구간 좁히기 (E(r)는 저축·자산이 0 이상이면 r에 대해 증가)
+        lo[k] = np.where(f < 0, r[k], lo[k])
+        hi[k] = np.where(f > 0, r[k], hi[k])
+        # 뉴턴 스텝: 수치미분 dE/dr, 구간을 벗어나면 이분법
+        h = 1e-7
+        slope = (excess(r[k] + h, k) - f) / h
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = r[k] - f / slope
+        inside = (newton > lo[k]) & (newton < hi[k]) & np.isfinite(newton)
+        r[k] = np.where(inside, newton, (lo[k] + hi[k]) / 2)
+    shape = np.broadcast_shapes(*(np.shape(x) for x in (target_equity, monthly_saving, n_months, current_investment)))
+    return np.where(feasible, r, np.nan).reshape(shape)
+
+
+# ── 목표 달성 확률 (몬테카를로) ───────────────────────────────
+MC_CHUNK = 16_384   # 경로 묶음 크기: 묶음 배열이 CPU 캐시에 머물러 한 번에 전부 돌리는 것보다 빠름
+
+
+def _simulate_equity_chunk(seed, n_paths: int, n_months: int, samples: np.ndarray,
+                           current_investment: float, mu: float, sigma: float) -> np.ndarray:
+    """경로 n_paths개의 만기 투자자산. 수익률 충격은 대조변량(+z, -z 짝)으로 난수 절반만 생성."""
+    rng = np.random.default_rng(seed)
+    half = (n_paths + 1) // 2
+    wealth = np.full(n_paths, float(current_investment))
+    z = np.empty(half)
+    growth = np.empty(n_paths)
+    for _ in range(n_months):
+        rng.standard_normal(out=z)
+        growth[:half] = z
+        np.negative(z[: n_paths - half], out=growth[half:])
+        growth *= sigma
+        growth += 1 + mu
+        wealth *= growth
+        wealth += samples.take(rng.integers(0, len(samples), n_paths)) if len(samples) > 1 else samples[0]
+    return wealth
+
+
+def simulate_goal_probability(
+    target_equity: float, n_months: int, saving_samples, current_investment: float,
+    fixed_assets: float = 0.0, r_annual: float = 0.06, r_vol: float = 0.12,
+    price_growth: float = 0.0, price_vol: float = 0.0,
+    n_paths: int = 100_000, seed: int | None = 0, confidence: float = 0.95, workers: int = 1,
+) -> dict:
+    """
+    n_months 뒤 자기자본이 목표에 닿을 확률을 n_paths개 경로로 추정.
+    - 투자자산: 매월 수익률 ~ N(r_annual/12, r_vol/√12) 복리, 월말에 saving_samples에서 복원추출한 저축액 적립
+      (r_vol = 0이고 저축액이 하나면 calculate_total_equity와 같은 값)
+    - 목표: target_equity × 주택가격 배수 (연 price_growth, 변동성 price_vol의 로그정규)
+    - workers > 1이면 경로 묶음을 스레드로 나눠 실행 (NumPy 연산은 GIL을 놓음). 결과는 workers와 무관.
+    반환: prob·ci_low·ci_high (%, Wilson 신뢰구간), 만기 자기자본 p10·p50·p90, n_paths
+    """
+    n_months = max(int(n_months), 0)
+    samples = np.atleast_1d(np.asarray(saving_samples, dtype=float))
+    mu, sigma = r_annual / 12, r_vol / np.sqrt(12)
+
+    # 묶음마다 독립 난수열 (SeedSequence.spawn) → 직렬·병렬 실행 결과가 같음
+    sizes = [min(MC_CHUNK, n_paths - i) for i in range(0, n_paths, MC_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes) + 1)
+    run = lambda args: _simulate_equity_chunk(args[0], args[1], n_months, samples, current_investment, mu, sigma)
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(run, zip(seeds, sizes)))
+    else:
+        chunks = [run(args) for args in zip(seeds, sizes)]
+    equity = np.concatenate(chunks) + fixed_assets
+
+    years = n_months / 12
+    log_price = np.random.default_rng(seeds[-1]).normal(years * np.log1p(price_growth), price_vol * np.sqrt(years), n_paths)
+    hit = equity >= target_equity * np.exp(log_price)
+
+    # Wilson 구간은 독립 표본 기준 — 대조변량 짝은 분산을 줄이므로 보수적인 구간
+    p = float(hit.mean())
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    center = (p + z * z / (2 * n_paths)) / (1 + z * z / n_paths)
+    half = z * np.sqrt(p * (1 - p) / n_paths + z * z / (4 * n_paths ** 2)) / (1 + z * z / n_paths)
+    p10, p50, p90 = np.percentile(equity, [10, 50, 90])
+    return dict(
+        prob=p * 100, ci_low=float(max(center - half, 0.0)) * 100, ci_high=float(min(center + half, 1.0)) * 100,
+        p10=float(p10), p50=float(p50), p90=float(p90), n_paths=n_paths,
+    )
+
+
 def opportunity_cost(tax_amount: float, r_annual: float, years: int) -> float:
     """취득세를 복리 운용 시 기회비용 (원금 제외 순이익)."""
     return tax_amount * (1 + r_annual) ** years - tax_amount
@@ -54,24 +301,21 @@ def simulate_scenario_a(
     n_total = loan_years * 12
     monthly_payment = loan * r / (1 - (1 + r) ** -n_total) if r > 0 else loan / n_total
 
-    result = []
-    for t in range(1, sim_years + 1):
-        asset_value = purchase_price * (1 + price_growth_rate) ** t
-        cumulative_cost = monthly_payment * 12 * t
-        # 잔여 대출 잔액: 원리금 균등상환 잔액 공식
-        n_paid = min(t * 12, n_total)
-        if r > 0:
-            remaining_loan = loan * ((1 + r) ** n_total - (1 + r) ** n_paid) / ((1 + r) ** n_total - 1)
-        else:
-            remaining_loan = max(loan - (loan / n_total) * n_paid, 0)
-        net_asset = asset_value - remaining_loan
-        result.append({
-            "year": 2026 + t,
-            "asset_value": asset_value,
-            "cumulative_cost": cumulative_cost,
-            "net_asset": net_asset,
-        })
-    return result
+    t = np.arange(1, sim_years + 1)
+    asset_value = purchase_price * (1 + price_growth_rate) ** t.astype(float)
+    cumulative_cost = monthly_payment * 12 * t
+    # 잔여 대출 잔액: 원리금 균등상환 잔액 공식
+    n_paid = np.minimum(t * 12, n_total)
+    if r > 0:
+        remaining_loan = loan * ((1 + r) ** n_total - (1 + r) ** n_paid.astype(float)) / ((1 + r) ** n_total - 1)
+    else:
+        remaining_loan = np.maximum(loan - (loan / n_total) * n_paid, 0)
+    return pd.DataFrame({
+        "year": 2026 + t,
+        "asset_value": asset_value,
+        "cumulative_cost": cumulative_cost,
+        "net_asset": asset_value - remaining_loan,
+    }).to_dict("records")
 
 
 def simulate_scenario_b(
@@ -85,18 +329,15 @@ def simulate_scenario_b(
     시나리오 B: 의정부 실거주 + 절약분 투자
     연도별 {year, house_value, invest_fv, net_asset} 반환
     """
-    result = []
-    for t in range(1, sim_years + 1):
-        house_value = uijeongbu_price * (1 + uijeongbu_growth) ** t
-        invest_fv = calculate_fv(monthly_rent_saving, invest_rate, t * 12)
-        net_asset = house_value + invest_fv
-        result.append({
-            "year": 2026 + t,
-            "house_value": house_value,
-            "invest_fv": invest_fv,
-            "net_asset": net_asset,
-        })
-    return result
+    t = np.arange(1, sim_years + 1)
+    house_value = uijeongbu_price * (1 + uijeongbu_growth) ** t.astype(float)
+    invest_fv = calculate_fv_array(monthly_rent_saving, invest_rate, t * 12)
+    return pd.DataFrame({
+        "year": 2026 + t,
+        "house_value": house_value,
+        "invest_fv": invest_fv,
+        "net_asset": house_value + invest_fv,
+    }).to_dict("records")
 
 
 def calc_education_opportunity_cost(
@@ -0,0 +1,97 @@
+# core/frames.py
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+
+import pandas as pd
+
+# ── 세션 간 공유 프레임 + 세션별 오버레이 ──────────────────────
+# 같은 (월, 지출자) 데이터를 세션마다 복사해 두지 않고 프로세스에 버전별로 1벌만 둡니다.
+# 공유 프레임은 절대 제자리 수정하지 않고, 세션의 수정은 SessionView 오버레이에 쌓았다가
+# 바뀐 열만 복사해 보여 줍니다.
+
+
+class SharedFrames:
+    """키별 최신 버전 프레임 1벌 보관. 같은 키를 여러 세션이 동시에 요청해도 로드는 1번."""
+
+    def __init__(self):
+        self._frames: dict = {}            # key → (version, frame)
+        self._lock = threading.Lock()
+        self._key_locks = defaultdict(threading.Lock)
+        self.loads = 0
+
+    def get(self, key, version: int, loader) -> pd.DataFrame:
+        with self._key_locks[key]:
+            with self._lock:
+                hit = self._frames.get(key)
+            if hit and hit[0] == version:
+                return hit[1]
+            frame = loader()
+            self.loads += 1
+            self.put(key, version, frame)
+            return frame
+
+    def put(self, key, version: int, frame: pd.DataFrame) -> None:
+        """version 프레임 등록. 데이터 버전은 테이블 전체 기준이므로 더 오래된 버전은 모두 버림."""
+        with self._lock:
+            current = self._frames.get(key)
+            if current and current[0] > version:
+                return
+            self._frames = {k: v for k, v in self._frames.items() if v[0] >= version}
+            self._frames[key] = (version, frame)
+
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(int(f.memory_usage(deep=True).sum()) for _, f in self._frames.values())
+
+
+class SessionView:
+    """
+    공유 프레임(base) 위에 이 세션이 DB에 반영한 수정·삭제를 겹쳐 보여 주는 뷰.
+    pending_ops: base 버전 이후 이 세션이 일으킨 행 변경 수 (데이터 버전과 비교해 다른 세션의 쓰기 여부 판단).
+    """
+
+    def __init__(self, base: pd.DataFrame, version: int):
+        self.base = base
+        self.version = version
+        self.edits: dict = {}              # id → {열: 값}
+        self.deleted: set = set()
+        self.pending_ops = 0
+        self._frame = None
+
+    def edit(self, row_id, column: str, value) -> None:
+        self.edits.setdefault(row_id, {})[column] = value
+        self.pending_ops += 1
+        self._frame = None
+
+    def delete(self, row_id) -> None:
+        self.deleted.add(row_id)
+        self.pending_ops += 1
+        self._frame = None
+
+    def frame(self) -> pd.DataFrame:
+        """세션 전용 프레임 (파생 열을 붙여도 공유 프레임에는 영향 없음). 오버레이가 바뀔 때만 다시 만듦."""
+        if self._frame is None:
+            self._frame = self.materialize()
+        return self._frame
+
+    def materialize(self) -> pd.DataFrame:
+        # 얕은 복사: 열 배열은 공유하고, 수정된 열만 새 배열로 교체
+        frame = self.base.copy(deep=False)
+        if self.edits:
+            positions = pd.Index(frame["id"]).get_indexer(list(self.edits))
+            by_column = defaultdict(lambda: ([], []))
+            for pos, changes in zip(positions, self.edits.values()):
+                if pos < 0:
+                    continue
+                for column, value in changes.items():
+                    by_column[column][0].append(pos)
+                    by_column[column][1].append(value)
+            for column, (rows, values) in by_column.items():
+                patched = frame[column].copy()
+                patched.iloc[rows] = values
+                frame[column] = patched
+        if self.deleted:
+            frame = frame[~frame["id"].isin(self.deleted)].reset_index(drop=True)
+        return frame
@@ -0,0 +1,105 @@
+# core/local_parser.py
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta
+
+# ── 규칙 기반 로컬 파서 (LLM 호출 전 fast-path) ────────────────
+# "커피 4500원, 택시 1.2만원" 같은 짧은 메모를 모델 없이 바로 행으로 바꿉니다.
+# 반환하는 confidence(0~1)는 라우터(core/routing.py)가 모델 등급을 고를 때 씁니다.
+
+_AMOUNT_RE = re.compile(r"(\d+(?:[.,]\d+)*)\s*(만\s*원|만|천\s*원|천|원)?")
+_MD_RE     = re.compile(r"(\d{1,2})\s*(?:/|월)\s*(\d{1,2})\s*일?")
+# 쉼표·줄바꿈 외에 "…원" 뒤 공백도 경계로 봄 (받아쓰기 결과는 쉼표가 없는 경우가 많음)
+_SPLIT_RE  = re.compile(r"[,\n;/]+(?!\d)|(?<=\d원)\s+|(?<=[만천]원)\s+")
+_RELATIVE_DAYS = {"그저께": 2, "그제": 2, "어제": 1, "오늘": 0}
+
+ACCEPT_CONFIDENCE = 0.9   # 이 이상이면 LLM 없이 로컬 결과를 그대로 사용 (fast-path)
+
+# 카테고리 키워드 사전 (DEFAULT_CATEGORIES 이름 기준, 목록에 없으면 '기타')
+CATEGORY_KEYWORDS = {
+    "외식/음료/간식": ["커피", "카페", "스타벅스", "점심", "저녁", "배달", "치킨", "피자", "빵", "간식", "식당", "맥주"],
+    "교통비":        ["택시", "버스", "지하철", "주유", "기름", "톨게이트", "주차", "ktx", "KTX"],
+    "생활소비":      ["마트", "편의점", "이마트", "쿠팡", "다이소", "생필품", "기저귀", "분유"],
+    "의료/미용":     ["병원", "약국", "약", "미용실", "치과", "소아과"],
+    "공과금/주거":   ["관리비", "전기", "가스", "수도", "통신비", "인터넷", "월세"],
+    "경조/교제비":   ["축의금", "부의금", "선물", "경조사"],
+    "문화/교육":     ["책", "영화", "학원", "교육", "공연", "넷플릭스"],
+    "쇼핑":          ["옷", "신발", "가방", "무신사"],
+    "내구소비":      ["가전", "가구", "노트북", "냉장고"],
+}
+
+
+def _parse_amount(number: str, unit: str | None) -> int | None:
+    try:
+        value = float(number.replace(",", ""))
+    except ValueError:
+        return None
+    unit = (unit or "").replace(" ", "")
+    if unit.startswith("만"):
+        value *= 10_000
+    elif unit.startswith("천"):
+        value *= 1_000
+    return int(value) if value > 0 else None
+
+
+def _guess_category(item: str, categories: list[str]) -> str | None:
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if category in categories and any(k in item for k in keywords):
+            return category
+    return None
+
+
+def _parse_date(segment: str, today: datetime) -> tuple[str, str]:
+    """세그먼트에서 날짜 표현을 떼어내고 (YYYY-MM-DD, 남은 문자열) 반환."""
+    for word, days in _RELATIVE_DAYS.items():
+        if word in segment:
+            return (today - timedelta(days=days)).strftime("%Y-%m-%d"), segment.replace(word, " ")
+    m = _MD_RE.search(segment)
+    if m:
+        try:
+            d = today.replace(month=int(m.group(1)), day=int(m.group(2)))
+            return d.strftime("%Y-%m-%d"), segment[:m.start()] + " " + segment[m.end():]
+        except ValueError:
+            pass
+    return today.strftime("%Y-%m-%d"), segment
+
+
+def parse_local(text: str, categories: list[str], today_str: str) -> tuple[list[dict], float]:
+    """
+    텍스트 메모 → ({date, item, amount, category} 리스트, confidence).
+
+    confidence: 세그먼트별 점수의 평균. 금액·항목·카테고리 모두 확정 1.0,
+    카테고리를 못 정하면 0.6, 금액이 여럿이면 0.3, 금액을 못 찾은 세그먼트는 0.
+    """
+    today = datetime.strptime(today_str, "%Y-%m-%d")
+    segments = [s.strip() for s in _SPLIT_RE.split(text or "") if s.strip()]
+    if not segments:
+        return [], 0.0
+
+    items, scores = [], []
+    for segment in segments:
+        date_str, rest = _parse_date(segment, today)
+        matches = [m for m in _AMOUNT_RE.finditer(rest) if m.group(2) or len(m.group(1)) >= 3]
+        if not matches:
+            scores.append(0.0)
+            continue
+        m = matches[-1]
+        amount = _parse_amount(m.group(1), m.group(2))
+        name = (rest[:m.start()] + rest[m.end():]).strip(" .:-~")
+        if amount is None or not name:
+            scores.append(0.0)
+            continue
+
+        category = _guess_category(name, categories)
+        if len(matches) > 1:
+            scores.append(0.3)   # 한 세그먼트에 금액이 여럿 → 어느 것이 결제액인지 모호
+        else:
+            scores.append(1.0 if category else 0.6)
+        items.append({
+            "date":     date_str,
+            "item":     name,
+            "amount":   amount,
+            "category": category or "기타",
+        })
+    return items, sum(scores) / len(scores)
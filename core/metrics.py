@@ -0,0 +1,63 @@
+# core/metrics.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+# ── 프로세스 단위 경량 지표 저장소 ─────────────────────────────
+# (site, metric) 별로 최근 N개 샘플만 보관합니다. Streamlit 세션 간 공유.
+_MAX_SAMPLES = 500
+_LOCK = threading.Lock()
+_SAMPLES: dict[tuple[str, str], deque] = defaultdict(lambda: deque(maxlen=_MAX_SAMPLES))
+
+
+def record(site: str, metric: str, value: float) -> None:
+    """지표 샘플 1건 기록. site: 호출 위치 (예: 'home'), metric: 지표명 (예: 'bytes_sent')."""
+    with _LOCK:
+        _SAMPLES[(site, metric)].append(float(value))
+
+
+@contextmanager
+def timer(site: str, metric: str):
+    """with 블록 실행 시간을 ms 단위로 기록합니다."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(site, metric, (time.perf_counter() - start) * 1000)
+
+
+def _percentile(sorted_vals: list[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(int(round(q * (len(sorted_vals) - 1))), len(sorted_vals) - 1)
+    return sorted_vals[idx]
+
+
+def summary(site: str | None = None) -> list[dict]:
+    """site별 지표 요약 {site, metric, count, mean, p50, p95, total} 리스트 반환."""
+    with _LOCK:
+        items = [(k, list(v)) for k, v in _SAMPLES.items() if site is None or k[0] == site]
+
+    rows = []
+    for (s, metric), vals in sorted(items):
+        ordered = sorted(vals)
+        total = sum(vals)
+        rows.append({
+            "site":   s,
+            "metric": metric,
+            "count":  len(vals),
+            "mean":   total / len(vals) if vals else 0.0,
+            "p50":    _percentile(ordered, 0.50),
+            "p95":    _percentile(ordered, 0.95),
+            "total":  total,
+        })
+    return rows
+
+
+def reset(site: str | None = None) -> None:
+    with _LOCK:
+        for key in [k for k in _SAMPLES if site is None or k[0] == site]:
+            del _SAMPLES[key]
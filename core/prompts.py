@@ -0,0 +1,51 @@
+# core/prompts.py
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import NamedTuple
+
+# ── 프롬프트 템플릿: 정적 접두부 / 호출별 데이터 분리 ───────────
+# system(역할·규칙·예시·카테고리 목록)은 호출 간에 바뀌지 않으므로 캐시 대상,
+# user(기준일·입력 내용·이달 수치)만 매번 새로 보냅니다.
+
+
+class Prompt(NamedTuple):
+    system: str   # 정적 접두부 — llm.generate(..., system=) 로 전달
+    user: str     # 호출별 데이터
+
+    def joined(self) -> str:
+        """캐시를 쓰지 않는 경로(단일 문자열 프롬프트)용."""
+        return f"{self.system}\n\n{self.user}"
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사치 (한국어 혼용 기준 약 2자당 1토큰). 캐시 최소 크기 판단에만 사용."""
+    return len(text) // 2
+
+
+def prefix_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class PrefixRegistry:
+    """
+    프로세스 내에서 이미 보낸 정적 접두부의 해시를 기억합니다.
+    제공자 캐시를 쓸 수 없는 백엔드에서도 '같은 접두부 재사용률'과 절감 가능 토큰을 집계하기 위한 로컬 대체 수단.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen: set[tuple[str, str]] = set()
+
+    def seen(self, model: str, text: str) -> bool:
+        """이미 본 접두부면 True, 처음이면 등록 후 False."""
+        key = (model, prefix_hash(text))
+        with self._lock:
+            if key in self._seen:
+                return True
+            self._seen.add(key)
+            return False
+
+
+PREFIXES = PrefixRegistry()
@@ -0,0 +1,63 @@
+# core/ratelimit.py
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+
+class RateLimiter:
+    """
+    동시 실행 수 + 분당 요청 수를 함께 제한하는 프로세스 공용 리미터.
+    Streamlit 세션·스레드 어디서 호출하든 같은 인스턴스를 쓰면 한도가 공유됩니다.
+    """
+
+    def __init__(self, max_concurrent: int, per_minute: int):
+        self.max_concurrent = max_concurrent
+        self.per_minute = per_minute
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._starts: deque[float] = deque()
+
+    def _reserve(self) -> float:
+        """분당 창에 자리가 있으면 예약하고 0, 없으면 기다려야 할 초를 반환."""
+        with self._lock:
+            now = time.monotonic()
+            while self._starts and now - self._starts[0] >= 60:
+                self._starts.popleft()
+            if len(self._starts) < self.per_minute:
+                self._starts.append(now)
+                return 0.0
+            return max(60 - (now - self._starts[0]), 0.05)
+
+    @contextmanager
+    def slot(self):
+        self._slots.acquire()
+        try:
+            while (wait := self._reserve()) > 0:
+                time.sleep(wait)
+            yield
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def aslot(self):
+        """async 호출용. 스레드를 점유하지 않고 이벤트 루프 위에서 폴링하며 대기합니다."""
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(0.01)
+        try:
+            while (wait := self._reserve()) > 0:
+                await asyncio.sleep(wait)
+            yield
+        finally:
+            self._slots.release()
+
+
+# Gemini 호출 공용 한도 (무료 티어 기본값: 동시 3건, 분당 10건)
+GEMINI_LIMITER = RateLimiter(
+    max_concurrent=int(os.getenv("GEMINI_MAX_CONCURRENCY", 3)),
+    per_minute=int(os.getenv("GEMINI_RPM", 10)),
+)
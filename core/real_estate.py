@@ -1,21 +1,26 @@
 # core/real_estate.py
 from __future__ import annotations
 
+import numpy as np
+
 def project_price(price_2026: float, growth_rate: float, years: int = 3) -> float:
     return price_2026 * (1 + growth_rate) ** years
 
+def project_price_array(price_2026, growth_rate, years=3):
+    """project_price의 브로드캐스트 버전 (모두 스칼라면 np.float64)."""
+    return (np.asarray(price_2026, dtype=float) * (1 + np.asarray(growth_rate, dtype=float))
+            ** np.asarray(years, dtype=float))[()]
+
 def calculate_gap_series(
     uijeongbu_price: float, uijeongbu_rate: float,
     seongbuk_price: float, seongbuk_rate: float,
     start_year: int = 2026, end_year: int = 2032,
 ) -> list[dict]:
-    result = []
-    for y in range(start_year, end_year + 1):
-        n = y - start_year
-        u = uijeongbu_price * (1 + uijeongbu_rate) ** n
-        s = seongbuk_price * (1 + seongbuk_rate) ** n
-        result.append({"year": y, "의정부": u, "성북구": s, "gap": s - u})
-    return result
+    years = np.arange(start_year, end_year + 1)
+    u = project_price_array(uijeongbu_price, uijeongbu_rate, years - start_year)
+    s = project_price_array(seongbuk_price, seongbuk_rate, years - start_year)
+    return [{"year": int(y), "의정부": float(a), "성북구": float(b), "gap": float(b - a)}
+            for y, a, b in zip(years, u, s)]
 
 def can_purchase(equity: float, loan: float, target_price: float, ltv: float = 0.7) -> bool:
     required_equity = target_price * (1 - ltv)
@@ -0,0 +1,140 @@
+# core/receipt.py
+from __future__ import annotations
+
+import io
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from PIL import Image, ImageOps, ImageStat
+
+from core import metrics
+
+# ── 영수증 이미지 전처리 기본값 ────────────────────────────────
+# 휴대폰 원본(4000px, 3~6MB)을 Gemini가 글자를 읽기에 충분한 크기로 축소합니다.
+TARGET_LONG_EDGE = 1600          # 긴 변 픽셀
+BYTE_BUDGET      = 300_000       # 재인코딩 후 최대 바이트
+MIN_QUALITY      = 40            # 이 품질 아래로는 해상도를 줄여서 맞춤
+CROP_MARGIN      = 0.03          # 자동 크롭 시 여백 (긴 변 대비 비율)
+CROP_MIN_AREA    = 0.15          # 감지 영역이 이보다 작으면 크롭 생략 (오탐 방지)
+
+# 재인코딩 형식 → 전송 MIME 타입 (그 밖의 형식은 Pillow 등록 정보 Image.MIME으로)
+IMAGE_MIME = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="receipt")
+
+
+def _content_bbox(gray: Image.Image) -> tuple[int, int, int, int] | None:
+    """
+    배경보다 밝은 영수증 용지 영역의 bbox를 찾습니다.
+    축소본에서 평균 밝기 기준 이진화 → getbbox()로 계산 후 원본 좌표로 환산.
+    """
+    small = gray.copy()
+    small.thumbnail((256, 256))
+    threshold = max(ImageStat.Stat(small).mean[0], 96)
+    mask = small.point(lambda p: 255 if p > threshold else 0)
+    bbox = mask.getbbox()
+    if not bbox:
+        return None
+
+    sx = gray.width / small.width
+    sy = gray.height / small.height
+    left, top, right, bottom = bbox
+    area_ratio = ((right - left) * (bottom - top)) / (small.width * small.height)
+    if area_ratio < CROP_MIN_AREA or area_ratio > 0.98:
+        return None
+
+    margin = int(max(gray.size) * CROP_MARGIN)
+    return (
+        max(int(left * sx) - margin, 0),
+        max(int(top * sy) - margin, 0),
+        min(int(right * sx) + margin, gray.width),
+        min(int(bottom * sy) + margin, gray.height),
+    )
+
+
+def _encode(img: Image.Image, fmt: str, byte_budget: int) -> tuple[bytes, int]:
+    """품질을 단계적으로 낮춰 byte_budget 이하가 될 때까지 재인코딩. 부족하면 해상도 축소."""
+    while True:
+        for quality in range(85, MIN_QUALITY - 1, -10):
+            buf = io.BytesIO()
+            img.save(buf, format=fmt, quality=quality, optimize=True)
+            data = buf.getvalue()
+            if len(data) <= byte_budget:
+                return data, quality
+        if max(img.size) <= 480:
+            return data, quality
+        img = img.resize((int(img.width * 0.85), int(img.height * 0.85)), Image.LANCZOS)
+
+
+def preprocess_receipt(
+    source,
+    target_long_edge: int = TARGET_LONG_EDGE,
+    byte_budget: int = BYTE_BUDGET,
+    fmt: str = "JPEG",
+    grayscale: bool = True,
+    crop: bool = True,
+) -> dict:
+    """
+    영수증 이미지 전처리: EXIF 회전 → 흑백 → 용지 영역 크롭 → 긴 변 축소 → 재인코딩.
+
+    source: 파일 경로 / 파일 객체(Streamlit UploadedFile 포함) / PIL.Image
+    반환: {data, mime_type, size, original_bytes, bytes_sent, quality, elapsed_ms}
+    """
+    start = time.perf_counter()
+
+    if isinstance(source, Image.Image):
+        img = source
+        original_bytes = len(img.tobytes())
+    else:
+        if hasattr(source, "getvalue"):
+            raw = source.getvalue()
+        else:
+            with open(source, "rb") as f:
+                raw = f.read()
+        original_bytes = len(raw)
+        img = Image.open(io.BytesIO(raw))
+        # JPEG은 디코딩 단계에서 1/2·1/4 스케일로 읽어 원본 전체 디코딩을 피함
+        long_edge = max(img.size)
+        if img.format == "JPEG" and long_edge > target_long_edge:
+            scale = target_long_edge / long_edge
+            img.draft("L" if grayscale else "RGB", (int(img.width * scale), int(img.height * scale)))
+
+    img = ImageOps.exif_transpose(img)
+    img = img.convert("L") if grayscale else img.convert("RGB")
+
+    if crop:
+        bbox = _content_bbox(img if grayscale else img.convert("L"))
+        if bbox:
+            img = img.crop(bbox)
+
+    if max(img.size) > target_long_edge:
+        img.thumbnail((target_long_edge, target_long_edge), Image.LANCZOS)
+
+    fmt = fmt.upper()
+    mime_type = IMAGE_MIME.get(fmt) or Image.MIME.get(fmt)
+    if mime_type is None:
+        raise ValueError(f"지원하지 않는 이미지 형식: {fmt}")
+    data, quality = _encode(img, fmt, byte_budget)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "data":           data,
+        "mime_type":      mime_type,
+        "size":           img.size,
+        "original_bytes": original_bytes,
+        "bytes_sent":     len(data),
+        "quality":        quality,
+        "elapsed_ms":     elapsed_ms,
+    }
+
+
+def submit_preprocess(source, site: str = "home", **kwargs) -> Future:
+    """전처리를 공용 스레드 풀에 제출. 완료 시 bytes_sent / preprocess_ms 지표를 기록합니다."""
+    def _run():
+        result = preprocess_receipt(source, **kwargs)
+        metrics.record(site, "bytes_original", result["original_bytes"])
+        metrics.record(site, "bytes_sent", result["bytes_sent"])
+        metrics.record(site, "preprocess_ms", result["elapsed_ms"])
+        return result
+
+    return _POOL.submit(_run)
@@ -0,0 +1,75 @@
+# core/routing.py
+from __future__ import annotations
+
+import re
+from typing import NamedTuple
+
+from config import GEMINI_MODEL_LITE, GEMINI_MODEL_VER, ROUTER_ENABLED
+from core import metrics
+
+# ── 입력 복잡도 기반 모델 라우팅 ──────────────────────────────
+# 한 줄짜리 텍스트는 경량 모델(lite)로, 여러 항목이 섞인 영수증 사진은 기본 모델(full)로 보냅니다.
+# 점수 = 모달리티 + 길이 + 예상 항목 수 + (1 - 로컬 파서 신뢰도) 가중합, FULL_THRESHOLD 이상이면 full.
+
+FULL_THRESHOLD = 0.35
+
+W_IMAGE      = 0.45   # 이미지 입력 기본 가산
+W_IMAGE_SIZE = 0.15   # 전처리 후 바이트가 클수록(글자 많은 긴 영수증) 가산
+W_LENGTH     = 0.15   # 텍스트 길이
+W_ITEMS      = 0.25   # 예상 항목 수
+W_LOCAL      = 0.35   # 로컬 파서가 확신하지 못할수록 가산
+
+LONG_TEXT_CHARS = 300
+MANY_ITEMS      = 6
+LARGE_IMAGE     = 250_000
+
+_NUMBER_RE = re.compile(r"\d[\d,.]*\s*(?:만\s*원|천\s*원|원|만|천)?")
+
+
+class Route(NamedTuple):
+    tier: str      # "lite" | "full"
+    model: str
+    score: float
+    reasons: dict  # 항목별 기여도 (디버깅·지표 표시용)
+
+
+def estimate_item_count(text: str) -> int:
+    """금액처럼 보이는 숫자 덩어리 수. 이미지는 알 수 없으므로 0."""
+    return len([m for m in _NUMBER_RE.findall(text or "") if len(m.strip()) >= 3])
+
+
+def score_complexity(
+    modality: str, text: str = "", image_bytes: int = 0, local_confidence: float = 0.0,
+) -> tuple[float, dict]:
+    reasons = {}
+    if modality == "image":
+        reasons["modality"] = W_IMAGE
+        reasons["image_size"] = W_IMAGE_SIZE * min(image_bytes / LARGE_IMAGE, 1.0)
+    else:
+        reasons["length"] = W_LENGTH * min(len(text) / LONG_TEXT_CHARS, 1.0)
+        reasons["items"] = W_ITEMS * min(estimate_item_count(text) / MANY_ITEMS, 1.0)
+        reasons["local"] = W_LOCAL * (1.0 - local_confidence)
+    return round(sum(reasons.values()), 3), reasons
+
+
+def choose_model(
+    modality: str, text: str = "", image_bytes: int = 0, local_confidence: float = 0.0,
+    lite_model: str | None = None, full_model: str | None = None, site: str | None = None,
+) -> Route:
+    """입력을 채점해 모델 등급을 고릅니다. site가 주어지면 등급 선택 비율(route_lite)을 기록."""
+    full_model = full_model or GEMINI_MODEL_VER
+    lite_model = lite_model or GEMINI_MODEL_LITE
+    score, reasons = score_complexity(modality, text, image_bytes, local_confidence)
+
+    if ROUTER_ENABLED and score < FULL_THRESHOLD:
+        route = Route("lite", lite_model, score, reasons)
+    else:
+        route = Route("full", full_model, score, reasons)
+    if site:
+        metrics.record(site, "route_lite", 1 if route.tier == "lite" else 0)
+        metrics.record(site, "route_score", score)
+    return route
+
+
+def record_tier_latency(site: str, route: Route, elapsed_ms: float) -> None:
+    metrics.record(site, f"tier_{route.tier}_ms", elapsed_ms)
@@ -0,0 +1,72 @@
+# core/speculation.py
+from __future__ import annotations
+
+# ── 로컬 선반영(speculative preview) 보정 ─────────────────────
+# 로컬 파서 결과를 먼저 보여주거나 저장해 두고, LLM 결과가 오면 달라진 필드만 고칩니다.
+
+FIELDS = ("date", "item", "amount", "category")
+
+
+def match_entries(local: list[dict], final: list[dict]) -> list[tuple[int | None, int | None]]:
+    """
+    로컬 항목과 LLM 항목을 짝지음 → [(local_idx | None, final_idx | None)].
+    금액이 같은 항목끼리 먼저 순서대로 묶고, 남은 항목은 등장 순서대로 묶습니다.
+    """
+    pairs = []
+    free_final = list(range(len(final)))
+    unmatched_local = []
+    for i, entry in enumerate(local):
+        j = next((j for j in free_final if final[j]["amount"] == entry["amount"]), None)
+        if j is None:
+            unmatched_local.append(i)
+        else:
+            free_final.remove(j)
+            pairs.append((i, j))
+
+    for i, j in zip(unmatched_local, free_final):
+        pairs.append((i, j))
+    n = min(len(unmatched_local), len(free_final))
+    pairs += [(i, None) for i in unmatched_local[n:]]
+    pairs += [(None, j) for j in free_final[n:]]
+    return pairs
+
+
+def diff_fields(a: dict, b: dict, fields=FIELDS) -> dict:
+    """a → b 로 바뀐 필드만 {필드: b값} 으로 반환."""
+    return {f: b[f] for f in fields if str(a.get(f)) != str(b.get(f))}
+
+
+def reconcile(local: list[dict], final: list[dict], ids: list[int] | None = None) -> dict:
+    """
+    보정 계획과 적중 통계.
+    ids가 주어지면(로컬 결과를 이미 저장한 경우) DB 반영용 updates/inserts/deletes를 채웁니다.
+
+    반환: {updates: [(id, col, val)], inserts: [entry], deletes: [id],
+           hit: 전부 일치 여부, field_accuracy: 비교 필드 중 일치 비율, patched_fields: 수정 필드 수}
+    """
+    updates, inserts, deletes = [], [], []
+    compared = matched = 0
+
+    for i, j in match_entries(local, final):
+        if i is not None and j is not None:
+            changes = diff_fields(local[i], final[j])
+            compared += len(FIELDS)
+            matched += len(FIELDS) - len(changes)
+            if ids is not None:
+                updates += [(ids[i], col, val) for col, val in changes.items()]
+        elif j is not None:
+            compared += len(FIELDS)
+            inserts.append(final[j])
+        else:
+            compared += len(FIELDS)
+            if ids is not None:
+                deletes.append(ids[i])
+
+    return {
+        "updates":        updates,
+        "inserts":        inserts,
+        "deletes":        deletes,
+        "hit":            compared > 0 and matched == compared,
+        "field_accuracy": matched / compared if compared else 0.0,
+        "patched_fields": compared - matched,
+    }
@@ -2,8 +2,12 @@ import sqlite3
 import pandas as pd
 import streamlit as st
 import os
+import threading
 
 from config import DEFAULT_CATEGORIES, get_flat_categories
+from core.categories import CategoryDim
+from core.cube import LedgerCube
+from core.frames import SharedFrames
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_NAME = os.path.join(BASE_DIR, "ledger.db")
@@ -79,12 +83,145 @@ def init_db():
     seed_categories()
 
 
+# ── daily_totals 트리거 본문 조각 (MIGRATIONS 17~22) ──────────────
+_DAILY_KEY = "ON CONFLICT (date, spender, type) DO UPDATE SET amount = amount + excluded.amount, count = count + excluded.count"
+
+
+def _daily_upsert(row: str, sign: int) -> str:
+    """expenses 행(NEW/OLD) 1건을 daily_totals에 ±반영."""
+    return f"""INSERT INTO daily_totals (date, spender, type, amount, count)
+            VALUES (substr({row}.date, 1, 10), COALESCE({row}.spender, '공동'),
+                    COALESCE((SELECT NULLIF(type, '') FROM categories WHERE name = {row}.category), '미분류'),
+                    {sign} * COALESCE({row}.amount, 0), {sign})
+            {_DAILY_KEY};"""
+
+
+def _daily_prune(row: str) -> str:
+    """±반영 후 건수가 0이 된 (날짜, 지출자, 성향) 칸 삭제."""
+    return f"""DELETE FROM daily_totals WHERE date = substr({row}.date, 1, 10)
+                AND spender = COALESCE({row}.spender, '공동') AND count = 0
+                AND type = COALESCE((SELECT NULLIF(type, '') FROM categories WHERE name = {row}.category), '미분류');"""
+
+
+def _daily_move(name: str, old_type: str, new_type: str) -> str:
+    """카테고리 name의 지출 전체를 old_type → new_type 성향으로 옮김 (드문 쓰기라 expenses 스캔)."""
+    moves = []
+    for type_expr, sign in ((old_type, -1), (new_type, 1)):
+        moves.append(f"""INSERT INTO daily_totals (date, spender, type, amount, count)
+            SELECT substr(date, 1, 10), COALESCE(spender, '공동'), COALESCE(NULLIF({type_expr}, ''), '미분류'),
+                   {sign} * SUM(COALESCE(amount, 0)), {sign} * COUNT(*)
+            FROM expenses WHERE category = {name} GROUP BY 1, 2
+            {_DAILY_KEY};""")
+    moves.append("DELETE FROM daily_totals WHERE count = 0;")
+    return "\n            ".join(moves)
+
+
 # ── 마이그레이션 정의 ─────────────────────────────────────────────
 # 새 마이그레이션 추가 시 MIGRATIONS dict에 다음 버전 번호로 한 줄 추가.
-# SQL은 반드시 멱등성을 보장하는 DDL만 사용 (ALTER TABLE, CREATE INDEX 등).
+# SQL은 반드시 멱등이어야 함: DDL(ALTER TABLE, CREATE ... IF NOT EXISTS 등) 또는
+# 다시 실행해도 결과가 같은 데이터 채움(INSERT OR IGNORE / INSERT OR REPLACE — 6, 16번).
 MIGRATIONS = {
     1: "ALTER TABLE categories ADD COLUMN type TEXT",
     2: "ALTER TABLE fixed_expenses ADD COLUMN type TEXT DEFAULT '지출'",
+    3: """CREATE TABLE IF NOT EXISTS ai_reports (
+            page TEXT NOT NULL,
+            month TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            model TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (page, month, fingerprint, model)
+        )""",
+    4: "CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date)",
+    # expenses 변경 시 1씩 증가하는 데이터 버전 (차트·집계 캐시 키). 트리거가 모든 쓰기 경로를 잡음.
+    5: """CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )""",
+    6: "INSERT OR IGNORE INTO data_versions (name, version) VALUES ('expenses', 0)",
+    7: """CREATE TRIGGER IF NOT EXISTS trg_expenses_version_ins AFTER INSERT ON expenses
+        BEGIN UPDATE data_versions SET version = version + 1 WHERE name = 'expenses'; END""",
+    8: """CREATE TRIGGER IF NOT EXISTS trg_expenses_version_upd AFTER UPDATE ON expenses
+        BEGIN UPDATE data_versions SET version = version + 1 WHERE name = 'expenses'; END""",
+    9: """CREATE TRIGGER IF NOT EXISTS trg_expenses_version_del AFTER DELETE ON expenses
+        BEGIN UPDATE data_versions SET version = version + 1 WHERE name = 'expenses'; END""",
+    # 집계 큐브(get_cube) 증분 갱신용 변경 로그: 추가 +1, 삭제 -1, 수정은 이전 값 -1 + 새 값 +1
+    10: """CREATE TABLE IF NOT EXISTS expense_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT,
+            category TEXT,
+            spender TEXT,
+            amount INTEGER,
+            sign INTEGER NOT NULL
+        )""",
+    11: """CREATE TRIGGER IF NOT EXISTS trg_expense_changes_ins AFTER INSERT ON expenses
+        BEGIN
+            INSERT INTO expense_changes (date, category, spender, amount, sign)
+            VALUES (NEW.date, NEW.category, NEW.spender, NEW.amount, 1);
+        END""",
+    12: """CREATE TRIGGER IF NOT EXISTS trg_expense_changes_upd
+        AFTER UPDATE OF date, category, spender, amount ON expenses
+        BEGIN
+            INSERT INTO expense_changes (date, category, spender, amount, sign)
+            VALUES (OLD.date, OLD.category, OLD.spender, OLD.amount, -1);
+            INSERT INTO expense_changes (date, category, spender, amount, sign)
+            VALUES (NEW.date, NEW.category, NEW.spender, NEW.amount, 1);
+        END""",
+    13: """CREATE TRIGGER IF NOT EXISTS trg_expense_changes_del AFTER DELETE ON expenses
+        BEGIN
+            INSERT INTO expense_changes (date, category, spender, amount, sign)
+            VALUES (OLD.date, OLD.category, OLD.spender, OLD.amount, -1);
+        END""",
+    14: "CREATE INDEX IF NOT EXISTS idx_expenses_amount ON expenses(amount)",
+    # 일별 합계 (날짜 × 지출자 × 소비성향): 캘린더 히트맵용. expenses·categories 트리거가 증분 유지.
+    # 소비성향은 쓰기 시점의 categories.type (없거나 빈 값 = '미분류')
+    15: """CREATE TABLE IF NOT EXISTS daily_totals (
+            date TEXT NOT NULL,
+            spender TEXT NOT NULL,
+            type TEXT NOT NULL,
+            amount INTEGER NOT NULL DEFAULT 0,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (date, spender, type)
+        ) WITHOUT ROWID""",
+    16: """INSERT OR REPLACE INTO daily_totals (date, spender, type, amount, count)
+        SELECT substr(e.date, 1, 10), COALESCE(e.spender, '공동'), COALESCE(NULLIF(c.type, ''), '미분류'),
+               SUM(COALESCE(e.amount, 0)), COUNT(*)
+        FROM expenses e LEFT JOIN categories c ON c.name = e.category
+        GROUP BY 1, 2, 3""",
+    17: f"""CREATE TRIGGER IF NOT EXISTS trg_daily_totals_ins AFTER INSERT ON expenses
+        BEGIN
+            {_daily_upsert("NEW", 1)}
+        END""",
+    18: f"""CREATE TRIGGER IF NOT EXISTS trg_daily_totals_upd
+        AFTER UPDATE OF date, category, spender, amount ON expenses
+        BEGIN
+            {_daily_upsert("OLD", -1)}
+            {_daily_upsert("NEW", 1)}
+            {_daily_prune("OLD")}
+        END""",
+    19: f"""CREATE TRIGGER IF NOT EXISTS trg_daily_totals_del AFTER DELETE ON expenses
+        BEGIN
+            {_daily_upsert("OLD", -1)}
+            {_daily_prune("OLD")}
+        END""",
+    # 카테고리 추가·성향 변경·삭제 시 그 카테고리 지출을 이전 성향 → 새 성향으로 옮김
+    20: f"""CREATE TRIGGER IF NOT EXISTS trg_daily_totals_cat_ins AFTER INSERT ON categories
+        WHEN COALESCE(NULLIF(NEW.type, ''), '미분류') <> '미분류'
+        BEGIN
+            {_daily_move("NEW.name", "'미분류'", "NEW.type")}
+        END""",
+    21: f"""CREATE TRIGGER IF NOT EXISTS trg_daily_totals_cat_upd AFTER UPDATE OF type ON categories
+        WHEN COALESCE(NULLIF(OLD.type, ''), '미분류') <> COALESCE(NULLIF(NEW.type, ''), '미분류')
+        BEGIN
+            {_daily_move("NEW.name", "OLD.type", "NEW.type")}
+        END""",
+    22: f"""CREATE TRIGGER IF NOT EXISTS trg_daily_totals_cat_del AFTER DELETE ON categories
+        WHEN COALESCE(NULLIF(OLD.type, ''), '미분류') <> '미분류'
+        BEGIN
+            {_daily_move("OLD.name", "OLD.type", "'미분류'")}
+        END""",
+    # 편집기 금액 정렬 키 (EXPENSE_SORT_KEYS): NULL 금액을 0으로 보고 정렬·keyset 비교
+    23: "CREATE INDEX IF NOT EXISTS idx_expenses_amount_key ON expenses(COALESCE(amount, 0))",
 }
 
 
@@ -165,6 +302,7 @@ def seed_categories():
 
         conn.commit()
         conn.close()
+        invalidate_category_dim()
     except Exception as e:
         st.error(f"초기 카테고리 설정 중 오류 발생: {e}")
 
@@ -182,15 +320,32 @@ def get_categories():
         conn.close()
 
 
-def get_category_mapping():
+# 카테고리 차원 캐시: 카테고리 쓰기(add_category·delete_category_safe·seed_categories)에서 비움
+_CATEGORY_DIM = {"dim": None, "db": None}
+
+
+def invalidate_category_dim():
+    _CATEGORY_DIM["dim"] = None
+
+
+def get_category_dim():
+    """(id=rowid, name, type) 카테고리 차원. 지출 행의 소비성향은 get_category_dim().type_of(df['category'])."""
+    dim = _CATEGORY_DIM["dim"]
+    if dim is not None and _CATEGORY_DIM["db"] == DB_NAME:
+        return dim
     conn = get_connection()
     try:
-        df = pd.read_sql("SELECT name, type FROM categories", conn)
-        return {row["name"]: (row["type"] if row["type"] else "미분류") for _, row in df.iterrows()}
+        dim = CategoryDim.from_frame(pd.read_sql("SELECT rowid AS id, name, type FROM categories ORDER BY rowid", conn))
     except:
-        return {}
+        return CategoryDim([], [], [])
     finally:
         conn.close()
+    _CATEGORY_DIM.update(dim=dim, db=DB_NAME)
+    return dim
+
+
+def get_category_mapping():
+    return get_category_dim().mapping
 
 
 def add_category(new_category, cat_type):
@@ -199,6 +354,7 @@ def add_category(new_category, cat_type):
     try:
         c.execute("INSERT INTO categories (name, type) VALUES (?, ?)", (new_category, cat_type))
         conn.commit()
+        invalidate_category_dim()
         return True
     except sqlite3.IntegrityError:
         st.warning("이미 존재하는 카테고리입니다.")
@@ -218,6 +374,7 @@ def delete_category_safe(category_name):
         c.execute("DELETE FROM budgets WHERE category = ?", (category_name,))
         c.execute("DELETE FROM categories WHERE name = ?", (category_name,))
         conn.commit()
+        invalidate_category_dim()
         return True
     except Exception as e:
         st.error(f"삭제 실패: {e}")
@@ -297,35 +454,96 @@ def get_last_entry_date():
 # --- 지출 함수 ---
 
 def insert_expense(data_list):
+    """여러 건을 단일 트랜잭션(executemany)으로 일괄 삽입. 한 건이라도 실패하면 전체 롤백."""
     conn = get_connection()
     c = conn.cursor()
     try:
+        c.executemany(
+            "INSERT INTO expenses (date, item, amount, category, spender) VALUES (?, ?, ?, ?, ?)",
+            [
+                (entry["date"], entry["item"], entry["amount"], entry["category"], entry.get("spender", "공동"))
+                for entry in data_list
+            ],
+        )
+        conn.commit()
+        return True
+    except:
+        return False
+    finally:
+        conn.close()
+
+
+def insert_expense_returning_ids(data_list):
+    """insert_expense와 같되 삽입된 행의 id 목록을 반환 (실패 시 None). 선반영 후 보정할 행 추적용."""
+    conn = get_connection()
+    c = conn.cursor()
+    try:
+        ids = []
         for entry in data_list:
-            spender = entry.get("spender", "공동")
             c.execute(
                 "INSERT INTO expenses (date, item, amount, category, spender) VALUES (?, ?, ?, ?, ?)",
-                (entry["date"], entry["item"], entry["amount"], entry["category"], spender),
+                (entry["date"], entry["item"], entry["amount"], entry["category"], entry.get("spender", "공동")),
             )
+            ids.append(c.lastrowid)
+        conn.commit()
+        return ids
+    except:
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+
+def apply_expense_patch(updates=(), inserts=(), deletes=()):
+    """
+    보정 내용을 단일 트랜잭션으로 반영.
+    updates: [(id, column, value)], inserts: [entry dict], deletes: [id]
+    """
+    conn = get_connection()
+    c = conn.cursor()
+    try:
+        for expense_id, column, value in updates:
+            if column not in ("date", "item", "amount", "category", "spender"):
+                raise ValueError(column)
+            c.execute(f"UPDATE expenses SET {column} = ? WHERE id = ?", (value, int(expense_id)))
+        c.executemany(
+            "INSERT INTO expenses (date, item, amount, category, spender) VALUES (?, ?, ?, ?, ?)",
+            [(e["date"], e["item"], e["amount"], e["category"], e.get("spender", "공동")) for e in inserts],
+        )
+        c.executemany("DELETE FROM expenses WHERE id = ?", [(int(i),) for i in deletes])
         conn.commit()
         return True
     except:
+        conn.rollback()
         return False
     finally:
         conn.close()
 
 
+def _expense_filter(month_str=None, spender_filter=None, alias=""):
+    """
+    월/지출자 조건 → (WHERE 절, params).
+    월 조건은 LIKE 대신 날짜 범위로 걸어 idx_expenses_date 인덱스를 타게 합니다.
+    """
+    col = f"{alias}." if alias else ""
+    where = " WHERE 1=1"
+    params = []
+    if month_str and month_str != "전체 기간":
+        year, month = map(int, month_str.split("-"))
+        next_month = f"{year + month // 12}-{month % 12 + 1:02d}"
+        where += f" AND {col}date >= ? AND {col}date < ?"
+        params += [f"{month_str}-01", f"{next_month}-01"]
+    if spender_filter and spender_filter != "전체":
+        where += f" AND {col}spender = ?"
+        params.append(spender_filter)
+    return where, params
+
+
 def load_data(month_str=None, spender_filter=None):
     conn = get_connection()
     try:
-        query = "SELECT * FROM expenses WHERE 1=1"
-        params = []
-        if month_str and month_str != "전체 기간":
-            query += " AND date LIKE ?"
-            params.append(f"{month_str}%")
-        if spender_filter and spender_filter != "전체":
-            query += " AND spender = ?"
-            params.append(spender_filter)
-        query += " ORDER BY date DESC"
+        where, params = _expense_filter(month_str, spender_filter)
+        query = "SELECT * FROM expenses" + where + " ORDER BY date DESC"
         return pd.read_sql(query, conn, params=params)
     except:
         return pd.DataFrame()
@@ -333,6 +551,214 @@ def load_data(month_str=None, spender_filter=None):
         conn.close()
 
 
+def get_data_version(name="expenses"):
+    """테이블 변경 카운터. 값이 같으면 마지막 조회 이후 해당 테이블이 바뀌지 않은 것."""
+    conn = get_connection()
+    try:
+        row = conn.execute("SELECT version FROM data_versions WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+    except:
+        return 0
+    finally:
+        conn.close()
+
+
+# ── 상세 내역 편집기 페이지 (keyset 페이지네이션) ─────────────────
+# OFFSET 없이 직전 페이지 마지막 행의 (정렬값, id) 다음부터 읽어 뒤쪽 페이지도 앞쪽과 같은 비용.
+
+def _editor_filter(month_str=None, spender_filter=None, category=None, search=None):
+    where, params = _expense_filter(month_str, spender_filter)
+    if category:
+        where += " AND category = ?"
+        params.append(category)
+    if search:
+        where += " AND item LIKE ?"
+        params.append(f"%{search}%")
+    return where, params
+
+
+# 편집기 정렬 열 → SQL 정렬 키. NULL 금액은 0으로 정렬해야 (키, id) keyset 비교에서 빠지지 않음
+EXPENSE_SORT_KEYS = {"date": "date", "amount": "COALESCE(amount, 0)"}
+
+
+def expense_page_cursor(row, sort_col):
+    """페이지 마지막 행 → 다음 페이지 after 커서 (정렬 키 값, id). NULL 금액은 0."""
+    if sort_col == "amount":
+        return (0 if pd.isna(row["amount"]) else int(row["amount"]), int(row["id"]))
+    return (row["date"], int(row["id"]))
+
+
+def load_expense_page(month_str=None, spender_filter=None, category=None, search=None,
+                      sort_col="date", descending=True, after=None, limit=100):
+    """
+    (sort_col, id) 순 한 페이지 → DataFrame (최대 limit행).
+    after: 직전 페이지 마지막 행의 커서 (expense_page_cursor). None이면 첫 페이지.
+    """
+    if sort_col not in EXPENSE_SORT_KEYS:
+        raise ValueError(sort_col)
+    key = EXPENSE_SORT_KEYS[sort_col]
+    conn = get_connection()
+    try:
+        where, params = _editor_filter(month_str, spender_filter, category, search)
+        if after is not None:
+            # (키, id) > (?, ?)와 같은 뜻. 행 값 비교는 식 인덱스로 범위 탐색을 못 하므로 키 범위 조건을 따로 둠
+            op = "<" if descending else ">"
+            where += f" AND {key} {op}= ? AND ({key} {op} ? OR id {op} ?)"
+            params += [after[0], after[0], after[1]]
+        order = "DESC" if descending else "ASC"
+        query = (
+            "SELECT id, date, item, amount, category, spender FROM expenses" + where +
+            f" ORDER BY {key} {order}, id {order} LIMIT ?"
+        )
+        return pd.read_sql(query, conn, params=params + [limit])
+    except:
+        return pd.DataFrame(columns=["id", "date", "item", "amount", "category", "spender"])
+    finally:
+        conn.close()
+
+
+def count_expenses(month_str=None, spender_filter=None, category=None, search=None):
+    conn = get_connection()
+    try:
+        where, params = _editor_filter(month_str, spender_filter, category, search)
+        return conn.execute("SELECT COUNT(*) FROM expenses" + where, params).fetchone()[0]
+    except:
+        return 0
+    finally:
+        conn.close()
+
+
+# ── 월 × 카테고리 × 지출자 집계 큐브 ───────────────────────────
+# 프로세스당 1개를 두고(세션 간 공유), 조회 때마다 expense_changes의 새 변경분만 더합니다.
+# 로그가 CHANGE_LOG_KEEP건을 넘으면 앞부분을 지우고, 지워진 구간을 놓친 큐브는 전체 재구성합니다.
+CHANGE_LOG_KEEP = 10_000
+_CUBE = {"cube": None, "seq": 0, "db": None}
+_CUBE_LOCK = threading.Lock()
+
+
+def get_cube():
+    """최신 상태로 맞춘 LedgerCube. 실패 시 빈 큐브."""
+    with _CUBE_LOCK:
+        conn = get_connection()
+        try:
+            # MIN/MAX를 한 SELECT에 함께 쓰면 전체 스캔이 되므로 각각 하위 쿼리로 (PK 끝 조회)
+            lo, hi = conn.execute(
+                "SELECT (SELECT MIN(seq) FROM expense_changes), (SELECT MAX(seq) FROM expense_changes)"
+            ).fetchone()
+            cube, seq = _CUBE["cube"], _CUBE["seq"]
+            stale = cube is None or _CUBE["db"] != DB_NAME or (lo is not None and lo > seq + 1)
+            if stale:
+                conn.execute("BEGIN")   # 전체 행과 로그 위치를 같은 스냅샷에서 읽음
+                df = pd.read_sql("SELECT date, category, spender, amount FROM expenses", conn)
+                seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM expense_changes").fetchone()[0]
+                conn.rollback()
+                cube = LedgerCube.from_frame(df)
+            elif hi is not None and hi > seq:
+                rows = conn.execute(
+                    "SELECT seq, date, category, spender, amount, sign FROM expense_changes WHERE seq > ?",
+                    (seq,),
+                ).fetchall()
+                seqs, dates, categories, spenders, amounts, signs = zip(*rows)
+                cube.apply(dates, categories, spenders, amounts, signs)
+                seq = max(seqs)
+            _CUBE.update(cube=cube, seq=seq, db=DB_NAME)
+
+            if hi is not None and lo is not None and hi - lo > CHANGE_LOG_KEEP * 2:
+                conn.execute("DELETE FROM expense_changes WHERE seq <= ?", (hi - CHANGE_LOG_KEEP,))
+                conn.commit()
+            return cube
+        except:
+            return LedgerCube()
+        finally:
+            conn.close()
+
+
+# ── 세션 간 공유 프레임 ─────────────────────────────────────────
+# (월, 지출자)별 expenses 프레임을 데이터 버전과 함께 프로세스에 1벌만 둠. 세션은 SessionView로 감싸서 사용.
+SHARED_FRAMES = SharedFrames()
+
+
+def load_shared(month_str=None, spender_filter=None):
+    """공유 프레임과 그 데이터 버전 → (DataFrame, version). date 열은 datetime. 반환 프레임은 수정 금지."""
+    # 버전을 먼저 읽어야 로드 도중 쓰기가 있어도 다음 조회에서 새 버전으로 다시 읽음
+    version = get_data_version()
+
+    def loader():
+        df = load_data(month_str, spender_filter)
+        if not df.empty:
+            df["date"] = pd.to_datetime(df["date"])
+        return df
+
+    return SHARED_FRAMES.get((month_str, spender_filter), version, loader), version
+
+
+# ── 대시보드 집계 (선택한 달의 행만 읽음) ─────────────────────────
+
+def get_weekly_summary(month_str, spender_filter=None):
+    """월요일 시작 주차별 지출건수·총합계 → DataFrame[주차(시작일), 지출건수, 총합계]."""
+    conn = get_connection()
+    try:
+        where, params = _expense_filter(month_str, spender_filter)
+        # date(d, '-6 days', 'weekday 1'): d 이전(당일 포함) 가장 가까운 월요일
+        return pd.read_sql(
+            "SELECT date(date, '-6 days', 'weekday 1') AS week_start, "
+            "COUNT(*) AS 지출건수, SUM(amount) AS 총합계 FROM expenses" + where +
+            " GROUP BY week_start ORDER BY week_start",
+            conn, params=params,
+        )
+    except:
+        return pd.DataFrame(columns=["week_start", "지출건수", "총합계"])
+    finally:
+        conn.close()
+
+
+def get_top_expenses(month_str, spender_filter=None, limit=10):
+    conn = get_connection()
+    try:
+        where, params = _expense_filter(month_str, spender_filter)
+        return pd.read_sql(
+            "SELECT date, item, category, amount FROM expenses" + where +
+            " ORDER BY amount DESC LIMIT ?",
+            conn, params=params + [limit],
+        )
+    except:
+        return pd.DataFrame(columns=["date", "item", "category", "amount"])
+    finally:
+        conn.close()
+
+
+def get_daily_totals(spender_filter=None, start=None, end=None, by=None):
+    """
+    daily_totals(트리거로 유지되는 일별 합계)에서 [start, end] 기간 일별 합계 → DataFrame[date, (by), amount, count].
+    by: None(날짜별) | "spender" | "type"(소비성향) | 둘 다 리스트. expenses 원본은 읽지 않음.
+    """
+    by = [by] if isinstance(by, str) else list(by or [])
+    group = ["date"] + [col for col in ("spender", "type") if col in by]
+    clauses, params = [], []
+    if spender_filter and spender_filter != "전체":
+        clauses.append("spender = ?")
+        params.append(spender_filter)
+    if start:
+        clauses.append("date >= ?")
+        params.append(str(start))
+    if end:
+        clauses.append("date <= ?")
+        params.append(str(end))
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    cols = ", ".join(group)
+    conn = get_connection()
+    try:
+        return pd.read_sql(
+            f"SELECT {cols}, SUM(amount) AS amount, SUM(count) AS count FROM daily_totals{where}"
+            f" GROUP BY {cols} ORDER BY {cols}",
+            conn, params=params,
+        )
+    except:
+        return pd.DataFrame(columns=group + ["amount", "count"])
+    finally:
+        conn.close()
+
+
 def get_available_months():
     conn = get_connection()
     try:
@@ -496,6 +922,39 @@ def save_setting(key, value):
         conn.close()
 
 
+# --- AI 리포트 캐시 ---
+
+def get_ai_report(page, month, fingerprint, model):
+    """(page, month, fingerprint, model)로 저장된 리포트 → {content, created_at} 또는 None."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT content, created_at FROM ai_reports "
+            "WHERE page = ? AND month = ? AND fingerprint = ? AND model = ?",
+            (page, month, fingerprint, model),
+        ).fetchone()
+        return dict(row) if row else None
+    except:
+        return None
+    finally:
+        conn.close()
+
+
+def save_ai_report(page, month, fingerprint, model, content):
+    conn = get_connection()
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO ai_reports (page, month, fingerprint, model, content) VALUES (?, ?, ?, ?, ?)",
+            (page, month, fingerprint, model, content),
+        )
+        conn.commit()
+        return True
+    except:
+        return False
+    finally:
+        conn.close()
+
+
 def get_setting(key, default_val=None):
     conn = get_connection()
     try:
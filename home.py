@@ -1,57 +1,309 @@
 import streamlit as st
-from google import genai
-import os
-from PIL import Image
-import json
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
-from database import init_db, insert_expense, load_data, get_budgets, get_categories, get_last_entry_date, get_setting, cleanup_old_income_settings
+from audio_recorder_streamlit import audio_recorder
+import llm
+from database import init_db, insert_expense, insert_expense_returning_ids, apply_expense_patch, load_data, get_budgets, get_categories, get_last_entry_date, get_setting, cleanup_old_income_settings
 from config import get_ledger_status_message
-
-# [수정] google.api_core 의존성을 제거하고, tenacity만 사용합니다.
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
+from core import metrics
+from core.extraction import (
+    build_extraction_prompt, build_expense_schema, parse_expense_response,
+    stream_expense_entries, apply_installments,
+)
+from core.audio import TARGET_SAMPLE_RATE, TRANSCRIBE_PROMPT, prepare_audio
+from core.local_parser import ACCEPT_CONFIDENCE, parse_local
+from core.receipt import submit_preprocess
+from core.routing import choose_model, record_tier_latency
+from core.speculation import reconcile
 
 st.set_page_config(page_title="AI 가계부 - 홈", page_icon="🏠")
 
-# ── 모듈 레벨: Gemini 클라이언트 초기화 (모든 페이지 로드 시 1회 실행) ──
-_api_error: str | None = None
-client = None
-try:
-    if "GEMINI_API_KEY" in st.secrets:
-        _api_key = st.secrets["GEMINI_API_KEY"]
-    else:
-        _api_key = os.getenv("GEMINI_API_KEY")
 
-    if not _api_key:
-        _api_error = "⚠️ API 키가 없습니다. GEMINI_API_KEY를 설정해주세요."
+def repair_fn(categories, site="home"):
+    """실패한 JSON 조각만 다시 보내는 콜백 (parse_expense_response의 generate_text)."""
+    item_schema = build_expense_schema(categories)["items"]
+    return lambda prompt: llm.generate(prompt, site=site, schema=item_schema)
+
+
+def extract_receipt(uploaded_file, prompt, spender, today_str, categories, site="home"):
+    """영수증 1장: 전처리 → Gemini 분석 → 파싱. 워커 스레드에서도 호출되므로 st.* 사용 금지."""
+    started = time.perf_counter()
+    prepared = submit_preprocess(uploaded_file, site=site).result()
+    route = choose_model("image", image_bytes=prepared["bytes_sent"], site=site)
+    llm_started = time.perf_counter()
+    text = llm.generate(
+        [prompt.user, llm.image_part(prepared["data"], prepared["mime_type"])],
+        site=site, model=route.model, schema=build_expense_schema(categories), system=prompt.system,
+    )
+    record_tier_latency(site, route, (time.perf_counter() - llm_started) * 1000)
+    entries = parse_expense_response(
+        text, spender, today_str, generate_text=repair_fn(categories, site), site=site,
+    )
+    metrics.record(site, "parse_latency_ms_image", (time.perf_counter() - started) * 1000)
+    return entries
+
+
+def render_metrics():
+    metric_rows = (
+        metrics.summary("home") + metrics.summary("home_batch")
+        + metrics.summary("home_voice") + metrics.summary("home_spec")
+    )
+    if metric_rows:
+        with st.expander("📈 처리 지표 (전송 용량 · 전처리 · 분석 지연)"):
+            st.dataframe(metric_rows, hide_index=True, use_container_width=True)
+            savings = llm.token_savings()
+            if savings:
+                st.caption("프롬프트 캐시 — 호출 위치별 입력 토큰 절감")
+                st.dataframe(savings, hide_index=True, use_container_width=True)
+
+
+# ── 영수증 일괄 업로드 ─────────────────────────────────────────
+def batch_receipt_section(categories, today, today_str):
+    st.write("👤 **누가 썼나요?**")
+    spender = st.radio(
+        "지출 주체", ["공동", "남편", "아내", "아이"], horizontal=True,
+        label_visibility="collapsed", key="batch_spender",
+    )
+    files = st.file_uploader(
+        "영수증 이미지 (여러 장 선택 가능)", type=["png", "jpg", "jpeg"],
+        accept_multiple_files=True, key="batch_files",
+    )
+
+    if files and st.button(f"🚀 {len(files)}장 동시 분석", use_container_width=True):
+        prompt = build_extraction_prompt(categories, today_str, today.year)
+        rows, failures = [], []
+        progress = st.progress(0.0, text=f"0/{len(files)}장 완료")
+        live_table = st.empty()
+
+        # 워커 수는 공용 한도와 같게 — 실제 동시 호출 수는 백엔드 리미터가 최종 보장
+        with ThreadPoolExecutor(max_workers=llm.get_backend().limiter.max_concurrent) as pool:
+            futures = {
+                pool.submit(extract_receipt, f, prompt, spender, today_str, categories, "home_batch"): f.name
+                for f in files
+            }
+            for done, fut in enumerate(as_completed(futures), start=1):
+                name = futures[fut]
+                try:
+                    rows.extend({"저장": True, "파일": name, **entry} for entry in fut.result())
+                except Exception as e:
+                    failures.append(f"{name}: {e}")
+                progress.progress(done / len(futures), text=f"{done}/{len(futures)}장 완료")
+                live_table.dataframe(rows, hide_index=True, use_container_width=True)
+
+        live_table.empty()
+        st.session_state["batch_rows"] = rows
+        st.session_state["batch_failures"] = failures
+
+    for msg in st.session_state.get("batch_failures", []):
+        st.error(f"❌ {msg}")
+
+    rows = st.session_state.get("batch_rows")
+    if not rows:
+        return
+
+    st.markdown("#### 🧾 분석 결과 검토")
+    st.caption("저장하지 않을 행은 체크를 해제하고, 잘못 읽힌 값은 표에서 바로 고치세요.")
+    edited = st.data_editor(
+        pd.DataFrame(rows),
+        column_config={
+            "저장":     st.column_config.CheckboxColumn("저장", default=True),
+            "파일":     st.column_config.TextColumn("파일", disabled=True),
+            "amount":   st.column_config.NumberColumn("금액", format="%d원"),
+            "category": st.column_config.SelectboxColumn("카테고리", options=categories),
+            "spender":  st.column_config.SelectboxColumn("사용자", options=["공동", "남편", "아내", "아이"]),
+        },
+        hide_index=True,
+        use_container_width=True,
+        key="batch_editor",
+    )
+    accepted = edited[edited["저장"]].drop(columns=["저장", "파일"])
+    # 표에서 금액을 지운 행은 저장 대상에서 제외 (빈 칸은 NaN → int 변환 불가)
+    blank = accepted["amount"].isna()
+    if blank.any():
+        st.warning(f"⚠️ 금액이 비어 있는 {int(blank.sum())}건은 저장하지 않습니다. 금액을 입력하면 함께 저장됩니다.")
+        accepted = accepted[~blank]
+
+    if st.button(f"💾 {len(accepted)}건 한 번에 저장", type="primary", disabled=accepted.empty):
+        entries = accepted.to_dict("records")
+        for entry in entries:
+            entry["amount"] = int(entry["amount"])
+        if insert_expense(entries):
+            st.session_state.pop("batch_rows", None)
+            st.session_state.pop("batch_failures", None)
+            st.success(f"✅ {len(entries)}건이 한 번에 저장되었습니다!")
+        else:
+            st.error("저장 중 오류가 발생해 아무 것도 저장되지 않았습니다.")
+
+
+# ── 음성 메모 입력 ─────────────────────────────────────────────
+def transcribe(chunks, site="home_voice"):
+    """오디오 청크를 동시에 받아쓰고 순서대로 이어 붙입니다. 백엔드는 llm 설정(gemini|fake)을 따름."""
+    with ThreadPoolExecutor(max_workers=llm.get_backend().limiter.max_concurrent) as pool:
+        texts = pool.map(
+            lambda chunk: llm.generate([TRANSCRIBE_PROMPT, llm.audio_part(chunk)], site=site),
+            chunks,
+        )
+        return " ".join(t.strip() for t in texts if t.strip())
+
+
+def extract_voice_memo(audio_bytes, spender, categories, today, today_str, site="home_voice"):
+    """
+    음성 1건: 압축·분할 → 받아쓰기 → 로컬 파서(fast-path) 또는 LLM 추출.
+    단계별 소요(ms)를 site 지표에 기록하고 (entries, transcript, stages) 반환.
+    """
+    stages = {}
+    started = time.perf_counter()
+
+    prepared = prepare_audio(audio_bytes)
+    stages["audio_prep_ms"] = prepared["elapsed_ms"]
+    metrics.record(site, "bytes_original", prepared["original_bytes"])
+    metrics.record(site, "bytes_sent", prepared["bytes_sent"])
+    if not prepared["chunks"]:
+        raise ValueError("녹음에서 음성을 찾지 못했습니다. 다시 녹음해주세요.")
+
+    t = time.perf_counter()
+    transcript = transcribe(prepared["chunks"], site)
+    stages["transcribe_ms"] = (time.perf_counter() - t) * 1000
+
+    t = time.perf_counter()
+    local_items, confidence = parse_local(transcript, categories, today_str)
+    metrics.record(site, "fast_path", 1 if local_items and confidence >= ACCEPT_CONFIDENCE else 0)
+    if local_items and confidence >= ACCEPT_CONFIDENCE:
+        entries = [{**item, "spender": spender} for item in local_items]
     else:
-        client = genai.Client(api_key=_api_key)
-except Exception as _e:
-    _api_error = f"⚠️ Gemini 설정 오류: {_e}"
+        prompt = build_extraction_prompt(categories, today_str, today.year, transcript)
+        route = choose_model("text", text=transcript, local_confidence=confidence, site=site)
+        text = llm.generate(
+            [prompt.user], site=site, model=route.model,
+            schema=build_expense_schema(categories), system=prompt.system,
+        )
+        entries = parse_expense_response(
+            text, spender, today_str, generate_text=repair_fn(categories, site), site=site,
+        )
+    stages["parse_ms"] = (time.perf_counter() - t) * 1000
 
-default_model_name = "gemini-2.5-flash"
+    t = time.perf_counter()
+    if not insert_expense(entries):
+        raise RuntimeError("DB 저장 중 오류가 발생했습니다.")
+    stages["insert_ms"] = (time.perf_counter() - t) * 1000
+    stages["e2e_ms"] = (time.perf_counter() - started) * 1000
 
+    for name, value in stages.items():
+        metrics.record(site, name, value)
+    return entries, transcript, stages
 
-def is_rate_limit_error(exception):
-    msg = str(exception)
-    return "429" in msg or "RESOURCE_EXHAUSTED" in msg
 
+def voice_memo_section(categories, today, today_str):
+    st.write("👤 **누가 썼나요?**")
+    spender = st.radio(
+        "지출 주체", ["공동", "남편", "아내", "아이"], horizontal=True,
+        label_visibility="collapsed", key="voice_spender",
+    )
+    st.caption("🎙️ 버튼을 누르고 말한 뒤 2초간 멈추면 녹음이 끝납니다. (예: \"점심 9천원, 커피 4500원\")")
+    audio_bytes = audio_recorder(
+        text="", pause_threshold=2.0, sample_rate=TARGET_SAMPLE_RATE, key="voice_recorder",
+    )
+    if not audio_bytes:
+        return
+    st.audio(audio_bytes, format="audio/wav")
+
+    if st.button("기록하기 🚀", use_container_width=True, key="voice_submit"):
+        with st.status("음성 메모 처리 중...", expanded=True) as status:
+            try:
+                entries, transcript, stages = extract_voice_memo(
+                    audio_bytes, spender, categories, today, today_str,
+                )
+                status.update(label="완료!", state="complete", expanded=False)
+                st.success(f"✅ {len(entries)}건이 [{spender}] 명의로 저장되었습니다!")
+                st.write(f"📝 받아쓰기: {transcript}")
+                st.json(entries)
+                st.caption(" · ".join(f"{k.removesuffix('_ms')} {v:,.0f}ms" for k, v in stages.items()))
+            except Exception as e:
+                if llm.is_rate_limit_error(e):
+                    status.update(label="🚨 한도 초과", state="error")
+                    st.error("오늘 사용량이 너무 많아 잠시 제한되었습니다. 1분 뒤에 다시 시도해주세요.")
+                else:
+                    status.update(label="❌ 오류 발생", state="error")
+                    st.error(f"상세 에러 내용: {e}")
+
+
+# ── 로컬 선반영 + LLM 확인 ──────────────────────────────────────
+def speculative_entry(user_content, spender, categories, today, today_str,
+                      installment_months=1, save_provisional=False, site="home_spec"):
+    """
+    로컬 파서 결과를 즉시 보여주고(선택 시 임시 저장), 같은 시점에 LLM 호출을 워커 스레드로 보냅니다.
+    LLM 결과가 오면 달라진 필드만 고치고, 적중률·체감 지연 단축을 site 지표로 남깁니다.
+    """
+    started = time.perf_counter()
+    prompt = build_extraction_prompt(categories, today_str, today.year, user_content)
+    local_items, confidence = parse_local(user_content, categories, today_str)
+    route = choose_model("text", text=user_content, local_confidence=confidence, site=site)
+    # 할부는 행이 여러 개로 펼쳐지므로 임시 저장 없이 확정 결과만 저장
+    save_provisional = save_provisional and installment_months <= 1
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(
+            llm.generate, [prompt.user], site=site, model=route.model,
+            schema=build_expense_schema(categories), system=prompt.system,
+        )
 
-@retry(
-    retry=retry_if_exception(is_rate_limit_error),
-    stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=2, min=4, max=60),
-    reraise=True,
-)
-def generate_content_with_retry(model, contents):
-    return client.models.generate_content(model=model, contents=contents)
+        local = [{**item, "spender": spender} for item in local_items]
+        preview_ms = (time.perf_counter() - started) * 1000
+        ids = None
+        if local:
+            metrics.record(site, "preview_ms", preview_ms)
+            if save_provisional:
+                ids = insert_expense_returning_ids(local)
+            label = "임시 저장됨" if ids else "미리보기"
+            st.caption(f"🔮 로컬 {label} ({preview_ms:,.0f}ms) — AI가 확인하는 중입니다...")
+            st.dataframe(local, hide_index=True, use_container_width=True)
+
+        try:
+            with st.spinner(f"AI 확인 중 (`{route.model}`)..."):
+                text = future.result()
+                final = parse_expense_response(
+                    text, spender, today_str, generate_text=repair_fn(categories, site), site=site,
+                )
+        except Exception as e:
+            if ids:
+                st.warning(f"AI 확인에 실패해 로컬 결과 {len(ids)}건이 그대로 저장되어 있습니다. ({e})")
+                return
+            raise
+
+    confirm_ms = (time.perf_counter() - started) * 1000
+    plan = reconcile(local, final, ids)
+    metrics.record(site, "confirm_ms", confirm_ms)
+    if local:
+        metrics.record(site, "spec_hit", 1 if plan["hit"] else 0)
+        metrics.record(site, "spec_field_accuracy", plan["field_accuracy"])
+        metrics.record(site, "perceived_saving_ms", confirm_ms - preview_ms)
+
+    if ids:
+        saved = apply_expense_patch(plan["updates"], plan["inserts"], plan["deletes"])
+        n_saved = len(final)
+    else:
+        final_entries = apply_installments(final, installment_months)
+        saved = insert_expense(final_entries)
+        n_saved = len(final_entries)
+    if not saved:
+        st.error("저장 중 오류가 발생했습니다.")
+        return
+
+    if local and plan["hit"]:
+        st.success(f"✅ 미리보기가 정확했습니다. {n_saved}건 저장 (AI 확인 {confirm_ms:,.0f}ms)")
+    else:
+        st.success(f"✅ AI 확인 결과로 {plan['patched_fields']}개 필드를 보정해 {n_saved}건 저장했습니다.")
+        st.dataframe(final, hide_index=True, use_container_width=True)
 
 
 # ── 홈 페이지 본문 함수 ────────────────────────────────────────
 def home_page():
     # API 오류 시 조기 반환
-    if _api_error:
-        st.error(_api_error)
+    api_error = llm.configuration_error()
+    if api_error:
+        st.error(api_error)
         return
 
     # ── 온보딩 완료 여부 체크 ──────────────────────────────────────
@@ -110,9 +362,33 @@ def home_page():
     st.caption("💡 팁: 여러 건을 한 번에 입력해도 됩니다. (예: 점심 9000원, 커피 4500원)")
 
     input_type = st.radio(
-        "입력 방식", ["텍스트", "이미지 캡처"], horizontal=True, label_visibility="collapsed"
+        "입력 방식", ["텍스트", "이미지 캡처", "영수증 여러 장", "음성 메모"],
+        horizontal=True, label_visibility="collapsed",
     )
 
+    if input_type == "영수증 여러 장":
+        batch_receipt_section(CATEGORIES, today, today_str)
+        render_metrics()
+        return
+
+    if input_type == "음성 메모":
+        voice_memo_section(CATEGORIES, today, today_str)
+        render_metrics()
+        return
+
+    streaming = st.toggle(
+        "⚡ 스트리밍 미리보기", value=True,
+        help="항목이 하나씩 완성되는 대로 표에 바로 표시합니다. 끄면 전체 응답을 받은 뒤 한 번에 처리합니다.",
+    )
+    speculative = save_provisional = False
+    if input_type == "텍스트":
+        speculative = st.toggle(
+            "🔮 로컬 미리보기 먼저", value=False,
+            help="규칙 기반 파서 결과를 바로 보여주고, AI 결과가 오면 달라진 부분만 고칩니다.",
+        )
+        if speculative:
+            save_provisional = st.checkbox("미리보기를 바로 저장 (AI 확인 후 자동 보정)", value=False)
+
     with st.form("expense_form", clear_on_submit=False):
         st.write("👤 **누가 썼나요?**")
         spender = st.radio(
@@ -133,9 +409,9 @@ def home_page():
         else:
             uploaded_file = st.file_uploader("이미지 업로드", type=["png", "jpg", "jpeg"])
             if uploaded_file:
-                user_content = Image.open(uploaded_file)
+                user_content = uploaded_file
                 content_type = "image"
-                st.image(user_content, caption="업로드된 이미지", width=300)
+                st.image(uploaded_file, caption="업로드된 이미지", width=300)
 
         col1, col2 = st.columns([1, 2])
         with col1:
@@ -149,78 +425,66 @@ def home_page():
     if submitted:
         if not user_content:
             st.warning("⚠️ 내용을 입력해주세요.")
+        elif content_type == "text" and speculative:
+            try:
+                speculative_entry(
+                    user_content, spender, CATEGORIES, today, today_str,
+                    installment_months, save_provisional,
+                )
+            except Exception as e:
+                if llm.is_rate_limit_error(e):
+                    st.error("오늘 사용량이 너무 많아 잠시 제한되었습니다. 1분 뒤에 다시 시도해주세요.")
+                else:
+                    st.error(f"상세 에러 내용: {e}")
         else:
             with st.status("AI가 분석 중입니다...", expanded=True) as status:
                 try:
                     status.write("⚙️ 1단계: 날짜 및 분류 기준 설정...")
 
-                    prompt = f"""
-                    당신은 가계부 정리 전문가입니다.
-
-                    [기준 정보]
-                    - 작성 기준일: {today_str}
-                    - 기준 연도: {today.year}년
-                    - 가능 카테고리: {", ".join(CATEGORIES)} (이 중에서만 선택, 없으면 '기타')
-
-                    [추출 항목]
-                    1. date (YYYY-MM-DD)
-                    2. item (항목명)
-                    3. amount (금액, 숫자만)
-                    4. category (위 목록 중 하나)
-
-                    입력된 내용에 여러 건의 지출이 있다면 반드시 배열([])로 반환하세요.
-                    JSON 예시: [{{"date": "{today_str}", "item": "커피", "amount": 4500, "category": "외식"}}, {{"date": "{today_str}", "item": "택시", "amount": 12000, "category": "교통비"}}]
-                    응답은 반드시 순수한 JSON 문자열이어야 합니다.
-                    """
-
+                    started = time.perf_counter()
                     if content_type == "text":
-                        contents = [prompt + "\n\n" + user_content]
+                        prompt = build_extraction_prompt(CATEGORIES, today_str, today.year, user_content)
+                        contents = [prompt.user]
+                        _, local_confidence = parse_local(user_content, CATEGORIES, today_str)
+                        route = choose_model(
+                            "text", text=user_content, local_confidence=local_confidence, site="home",
+                        )
                     else:
-                        contents = [prompt, user_content]
-
-                    status.write("📡 2단계: Gemini 분석 중 (재시도 기능 적용)...")
-                    response = generate_content_with_retry(default_model_name, contents)
-
-                    status.write("🔍 3단계: 응답 데이터 해석 중...")
-                    if not response.text:
-                        raise ValueError("Gemini로부터 빈 응답이 왔습니다.")
-
-                    clean_res = response.text.replace("```json", "").replace("```", "").strip()
-                    raw_data = json.loads(clean_res)
-
-                    new_entries = []
-                    items = raw_data if isinstance(raw_data, list) else [raw_data]
+                        # 원본 사진 대신 축소·재인코딩된 JPEG만 전송 (EXIF 회전/흑백/크롭 포함)
+                        status.write("🖼️ 이미지 전처리 중 (회전·크롭·압축)...")
+                        prepared = submit_preprocess(user_content, site="home").result()
+                        prompt = build_extraction_prompt(CATEGORIES, today_str, today.year)
+                        contents = [prompt.user, llm.image_part(prepared["data"], prepared["mime_type"])]
+                        route = choose_model("image", image_bytes=prepared["bytes_sent"], site="home")
+
+                    schema = build_expense_schema(CATEGORIES)
+                    status.write(f"🧭 모델 선택: `{route.model}` (복잡도 {route.score:.2f})")
+                    llm_started = time.perf_counter()
+                    if streaming:
+                        status.write("📡 2단계: Gemini 응답 수신 중 — 완성된 항목부터 표시합니다...")
+                        preview = status.empty()
+                        new_entries = []
+                        for entry in stream_expense_entries(
+                            llm.stream(contents, site="home", model=route.model, schema=schema, system=prompt.system),
+                            spender, today_str, generate_text=repair_fn(CATEGORIES), site="home",
+                        ):
+                            new_entries.append(entry)
+                            preview.dataframe(new_entries, hide_index=True, use_container_width=True)
+                    else:
+                        status.write("📡 2단계: Gemini 분석 중 (재시도 기능 적용)...")
+                        text = llm.generate(contents, site="home", model=route.model, schema=schema, system=prompt.system)
 
-                    for item in items:
-                        safe_entry = {
-                            "date": item.get("date", today_str),
-                            "item": item.get("item", "알 수 없음"),
-                            "amount": int(str(item.get("amount", 0)).replace(",", "")),
-                            "category": item.get("category", "기타"),
-                            "spender": spender,
-                        }
-                        new_entries.append(safe_entry)
+                        status.write("🔍 3단계: 응답 데이터 해석 중 (깨진 항목은 해당 조각만 재요청)...")
+                        new_entries = parse_expense_response(
+                            text, spender, today_str,
+                            generate_text=repair_fn(CATEGORIES), site="home",
+                        )
+                    record_tier_latency("home", route, (time.perf_counter() - llm_started) * 1000)
+                    metrics.record("home", f"parse_latency_ms_{content_type}", (time.perf_counter() - started) * 1000)
 
-                    final_entries = []
                     if installment_months > 1:
                         status.write(f"➗ {installment_months}개월 할부 계산 중...")
-                        for entry in new_entries:
-                            total_amt = entry["amount"]
-                            try:
-                                base_date = datetime.strptime(entry["date"], "%Y-%m-%d")
-                            except Exception:
-                                base_date = datetime.now()
-
-                            monthly_amt = total_amt // installment_months
-                            for i in range(installment_months):
-                                next_date = base_date + relativedelta(months=i)
-                                inst_entry = entry.copy()
-                                inst_entry["date"] = next_date.strftime("%Y-%m-%d")
-                                inst_entry["amount"] = monthly_amt
-                                inst_entry["item"] = f"{entry['item']} ({i+1}/{installment_months})"
-                                final_entries.append(inst_entry)
-                    else:
-                        final_entries = new_entries
+                    final_entries = apply_installments(new_entries, installment_months)
 
                     status.write("💾 4단계: 저장 중...")
                     if insert_expense(final_entries):
@@ -229,13 +493,16 @@ def home_page():
                         st.json(final_entries)
 
                 except Exception as e:
-                    if "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e):
+                    if llm.is_rate_limit_error(e):
                         status.update(label="🚨 한도 초과", state="error")
                         st.error("오늘 사용량이 너무 많아 잠시 제한되었습니다. 1분 뒤에 다시 시도해주세요.")
                     else:
                         status.update(label="❌ 오류 발생", state="error")
                         st.error(f"상세 에러 내용: {e}")
 
+    # --- 5. 처리 지표 ---
+    render_metrics()
+
 
 # ── Navigation (함수 정의 후에 선언) ──────────────────────────
 pg = st.navigation(
@@ -243,6 +510,7 @@ pg = st.navigation(
         "가계부": [
             st.Page(home_page,                   title="📝 지출 입력",          default=True),
             st.Page("pages/dashboard.py",        title="📊 소비 분석"),
+            st.Page("pages/calendar_heatmap.py", title="🗓️ 지출 캘린더"),
             st.Page("pages/fixed_expenses.py",   title="📌 고정 지출"),
             st.Page("pages/export_to_claude.py", title="📤 내보내기"),
         ],
@@ -0,0 +1,459 @@
+"""
+LLM 호출 공용 모듈.
+
+홈(지출 추출)·예산 진단·월간 리뷰가 모두 이 모듈을 통해 모델을 호출합니다.
+- 백엔드: gemini(기본) | fake(결정적 로컬 대역 — 테스트·벤치마크용). LLM_BACKEND 환경변수로 선택.
+- Gemini 클라이언트는 API 키별로 1개만 만들어 재사용 (내부 HTTP 커넥션 풀 공유).
+- 호출 위치(site)별 지연·토큰·오류를 core.metrics에 기록합니다.
+- system(정적 접두부)은 Gemini 컨텍스트 캐시로 재사용하고, 절감 토큰을 site별로 집계합니다 (token_savings).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import date
+
+from tenacity import Retrying, retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from config import GEMINI_MODEL_VER
+from core import metrics
+from core.prompts import PREFIXES, estimate_tokens, prefix_hash
+from core.ratelimit import GEMINI_LIMITER, RateLimiter
+
+DEFAULT_TIMEOUT = float(os.getenv("LLM_TIMEOUT_SEC", 60))
+CACHE_TTL_SEC = int(os.getenv("LLM_CACHE_TTL_SEC", 3600))
+CACHE_MIN_TOKENS = 1024   # Gemini 명시적 캐시 최소 크기 (미만은 2.5 계열의 암시적 캐시에 맡김)
+
+
+def image_part(data: bytes, mime_type: str) -> dict:
+    """백엔드 중립 이미지 입력. generate(contents=[prompt, image_part(...)]) 형태로 사용."""
+    return {"data": data, "mime_type": mime_type}
+
+
+def audio_part(data: bytes, mime_type: str = "audio/wav") -> dict:
+    """백엔드 중립 오디오 입력 (받아쓰기용). 형식은 image_part와 같습니다."""
+    return {"data": data, "mime_type": mime_type}
+
+
+def is_rate_limit_error(exception) -> bool:
+    msg = str(exception)
+    return "429" in msg or "RESOURCE_EXHAUSTED" in msg
+
+
+def get_api_key() -> str | None:
+    """st.secrets → 환경변수 → app_settings(예산 페이지에서 입력한 키) 순으로 조회."""
+    try:
+        import streamlit as st
+        if "GEMINI_API_KEY" in st.secrets:
+            return st.secrets["GEMINI_API_KEY"]
+    except Exception:
+        pass
+    key = os.getenv("GEMINI_API_KEY")
+    if key:
+        return key
+    from database import get_setting
+    return get_setting("gemini_api_key") or None
+
+
+# ── 백엔드 ──────────────────────────────────────────────────────
+
+class GeminiBackend:
+    name = "gemini"
+
+    def __init__(self, api_key: str, timeout: float = DEFAULT_TIMEOUT):
+        from google import genai
+        from google.genai import types
+
+        self._types = types
+        self.client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(timeout=int(timeout * 1000)),
+        )
+        self.limiter = GEMINI_LIMITER
+        self._cache_lock = threading.Lock()
+        self._caches: dict[tuple[str, str], tuple[str | None, float]] = {}
+
+    def _cached_content(self, model, system) -> str | None:
+        """
+        system을 명시적 컨텍스트 캐시로 등록하고 이름을 돌려줍니다 (model·접두부 해시별 1개, TTL 동안 재사용).
+        너무 짧거나 생성에 실패하면 None → system_instruction으로 인라인 전송.
+        """
+        if estimate_tokens(system) < CACHE_MIN_TOKENS:
+            return None
+        key = (model, prefix_hash(system))
+        now = time.time()
+        with self._cache_lock:
+            name, expires = self._caches.get(key, (None, 0.0))
+        if expires > now:
+            return name
+        # 생성(네트워크 왕복)은 잠금 밖에서 → 다른 접두부·캐시 적중 호출이 기다리지 않음
+        try:
+            cache = self.client.caches.create(
+                model=model,
+                config=self._types.CreateCachedContentConfig(
+                    system_instruction=system, ttl=f"{CACHE_TTL_SEC}s",
+                ),
+            )
+            name = cache.name
+        except Exception:
+            name = None
+        with self._cache_lock:
+            # 동시에 만든 다른 호출이 먼저 등록했으면 그쪽을 사용 (중복 캐시는 TTL로 만료)
+            current, expires = self._caches.get(key, (None, 0.0))
+            if expires > now and current:
+                return current
+            # 실패도 TTL 동안 기억해 매 호출마다 생성을 재시도하지 않음 (만료 1분 전 갱신)
+            self._caches[key] = (name, now + CACHE_TTL_SEC - 60)
+            return name
+
+    def _contents(self, contents):
+        if isinstance(contents, str):
+            return [contents]
+        return [
+            self._types.Part.from_bytes(data=c["data"], mime_type=c["mime_type"]) if isinstance(c, dict) else c
+            for c in contents
+        ]
+
+    def _config(self, model, schema, system, timeout=None):
+        if schema is None and system is None and timeout is None:
+            return None
+        kwargs = {}
+        if timeout is not None:
+            # 호출별 타임아웃: 클라이언트 기본값(DEFAULT_TIMEOUT)을 이 요청에만 덮어씀
+            kwargs["http_options"] = self._types.HttpOptions(timeout=int(timeout * 1000))
+        if schema is not None:
+            kwargs.update(response_mime_type="application/json", response_schema=schema)
+        if system is not None:
+            cached = self._cached_content(model, system)
+            if cached:
+                kwargs["cached_content"] = cached
+            else:
+                kwargs["system_instruction"] = system
+        return self._types.GenerateContentConfig(**kwargs)
+
+    @staticmethod
+    def _usage(response) -> dict:
+        usage = getattr(response, "usage_metadata", None)
+        return {
+            "input_tokens":  getattr(usage, "prompt_token_count", 0) or 0,
+            "output_tokens": getattr(usage, "candidates_token_count", 0) or 0,
+            "cached_tokens": getattr(usage, "cached_content_token_count", 0) or 0,
+        }
+
+    def generate(self, model, contents, schema=None, system=None, timeout=None) -> tuple[str, dict]:
+        response = self.client.models.generate_content(
+            model=model, contents=self._contents(contents), config=self._config(model, schema, system, timeout),
+        )
+        return response.text or "", self._usage(response)
+
+    def stream(self, model, contents, schema=None, system=None, timeout=None):
+        usage = {}
+        for chunk in self.client.models.generate_content_stream(
+            model=model, contents=self._contents(contents), config=self._config(model, schema, system, timeout),
+        ):
+            if getattr(chunk, "usage_metadata", None):
+                usage = self._usage(chunk)
+            if chunk.text:
+                yield chunk.text, None
+        yield "", usage
+
+    async def agenerate(self, model, contents, schema=None, system=None, timeout=None) -> tuple[str, dict]:
+        response = await asyncio.wait_for(
+            self.client.aio.models.generate_content(
+                model=model, contents=self._contents(contents), config=self._config(model, schema, system, timeout),
+            ),
+            timeout=timeout or DEFAULT_TIMEOUT,
+        )
+        return response.text or "", self._usage(response)
+
+
+class FakeBackend:
+    """
+    결정적 로컬 대역. 네트워크·API 키 없이 같은 입력에 항상 같은 응답을 돌려줍니다.
+
+    - schema가 있으면 입력 텍스트의 '항목 금액원' 패턴을 JSON 항목으로 변환
+      (이미지는 바이트 길이로 정해지는 영수증 1건)
+    - schema가 없으면 입력 해시 기반의 고정 마크다운 리포트 (오디오가 있으면 고정 받아쓰기 문장)
+    - latency_ms + 입력 바이트 / upload_bytes_per_sec 만큼 대기해 네트워크 지연을 흉내냄
+      (model_latency_ms로 모델 등급별 지연을 따로 줄 수 있음)
+    - 같은 system을 두 번째 보낼 때부터 그 토큰을 cached_tokens로 보고 (제공자 캐시 흉내)
+    """
+    name = "fake"
+    _ITEM_RE = re.compile(r"([^\s,.\d][^,\n\d]*?)\s*([\d,]+)\s*원")
+    _DATE_RE = re.compile(r"작성 기준일:\s*(\d{4}-\d{2}-\d{2})")
+    _SOURCE_RE = re.compile(r"^\[(\d+)\]\s*(.*)$", re.MULTILINE)
+
+    def __init__(self, latency_ms: float = 0.0, upload_bytes_per_sec: float = 0.0, chunk_size: int = 24,
+                 model_latency_ms: dict[str, float] | None = None):
+        self.latency_ms = latency_ms
+        self.model_latency_ms = model_latency_ms or {}
+        self.upload_bytes_per_sec = upload_bytes_per_sec
+        self.chunk_size = chunk_size
+        self.limiter = RateLimiter(max_concurrent=64, per_minute=1_000_000)
+        self._cache_lock = threading.Lock()
+        self._cached: set[tuple[str, str]] = set()
+
+    def _delay(self, model, contents) -> float:
+        parts = [contents] if isinstance(contents, str) else contents
+        n_bytes = sum(len(p["data"]) if isinstance(p, dict) else len(str(p).encode()) for p in parts)
+        upload = n_bytes / self.upload_bytes_per_sec if self.upload_bytes_per_sec else 0.0
+        return self.model_latency_ms.get(model, self.latency_ms) / 1000 + upload
+
+    def _respond(self, contents, schema, system) -> str:
+        parts = [contents] if isinstance(contents, str) else list(contents)
+        texts = ([system] if system else []) + [p for p in parts if isinstance(p, str)]
+        joined = "\n".join(texts)
+
+        audio = [p for p in parts if isinstance(p, dict) and p["mime_type"].startswith("audio/")]
+        if schema is None and audio:
+            # 받아쓰기 흉내: 청크 길이로 정해지는 금액 1건
+            return " ".join(f"커피 {(len(p['data']) % 90 + 10) * 100}원" for p in audio)
+        if schema is None:
+            digest = hashlib.sha256(joined.encode()).hexdigest()[:8]
+            return (
+                f"## 로컬 대역 응답 ({digest})\n"
+                "- 입력이 같으면 항상 같은 내용이 반환됩니다.\n"
+                "- 실제 분석은 LLM_BACKEND=gemini 로 실행하세요.\n"
+            )
+
+        today = self._DATE_RE.search(joined)
+        today_str = today.group(1) if today else date.today().isoformat()
+        user_text = "\n".join(p for p in parts if isinstance(p, str))
+        # 묶음 요청([n] 입력 목록)이면 줄마다 추출하고 source 번호를 붙임
+        sources = self._SOURCE_RE.findall(user_text) or [(None, user_text)]
+        items = []
+        for n, line in sources:
+            for name, amt in self._ITEM_RE.findall(line):
+                item = {"date": today_str, "item": name.strip(), "amount": int(amt.replace(",", "")), "category": "기타"}
+                if n is not None:
+                    item["source"] = int(n)
+                items.append(item)
+        images = [p for p in parts if isinstance(p, dict)]
+        image_sources = [int(n) for n, line in sources if n is not None and line.startswith("(이미지")]
+        for i, p in enumerate(images):
+            item = {"date": today_str, "item": "영수증", "amount": (len(p["data"]) % 97 + 1) * 1000, "category": "기타"}
+            if i < len(image_sources):
+                item["source"] = image_sources[i]
+            items.append(item)
+        if schema.get("type") == "OBJECT":
+            return json.dumps(items[0] if items else {}, ensure_ascii=False)
+        return json.dumps(items, ensure_ascii=False)
+
+    def _usage(self, model, contents, system, text) -> dict:
+        parts = [contents] if isinstance(contents, str) else contents
+        input_tokens = estimate_tokens("".join(p for p in parts if isinstance(p, str)))
+        cached_tokens = 0
+        if system:
+            input_tokens += estimate_tokens(system)
+            key = (model, prefix_hash(system))
+            with self._cache_lock:
+                if key in self._cached:
+                    cached_tokens = estimate_tokens(system)
+                self._cached.add(key)
+        return {"input_tokens": input_tokens, "output_tokens": estimate_tokens(text), "cached_tokens": cached_tokens}
+
+    def generate(self, model, contents, schema=None, system=None, timeout=None) -> tuple[str, dict]:
+        delay = self._delay(model, contents)
+        if timeout and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"fake backend timeout ({timeout}s)")
+        time.sleep(delay)
+        text = self._respond(contents, schema, system)
+        return text, self._usage(model, contents, system, text)
+
+    def stream(self, model, contents, schema=None, system=None, timeout=None):
+        delay = self._delay(model, contents)
+        if timeout and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"fake backend timeout ({timeout}s)")
+        time.sleep(delay)
+        text = self._respond(contents, schema, system)
+        for i in range(0, len(text), self.chunk_size):
+            yield text[i:i + self.chunk_size], None
+        yield "", self._usage(model, contents, system, text)
+
+    async def agenerate(self, model, contents, schema=None, system=None, timeout=None) -> tuple[str, dict]:
+        await asyncio.wait_for(asyncio.sleep(self._delay(model, contents)), timeout=timeout or DEFAULT_TIMEOUT)
+        text = self._respond(contents, schema, system)
+        return text, self._usage(model, contents, system, text)
+
+
+# ── 백엔드 선택 / 클라이언트 풀 ─────────────────────────────────
+
+_LOCK = threading.Lock()
+_BACKENDS: dict[tuple, object] = {}
+_OVERRIDE = None
+
+
+def set_backend(backend) -> None:
+    """벤치마크·배치 작업에서 백엔드를 직접 지정 (None이면 환경변수 기준으로 복귀)."""
+    global _OVERRIDE
+    _OVERRIDE = backend
+
+
+def get_backend():
+    if _OVERRIDE is not None:
+        return _OVERRIDE
+    kind = os.getenv("LLM_BACKEND", "gemini")
+    if kind == "fake":
+        key = ("fake",)
+        factory = lambda: FakeBackend(latency_ms=float(os.getenv("LLM_FAKE_LATENCY_MS", 0)))
+    else:
+        api_key = get_api_key()
+        if not api_key:
+            raise RuntimeError("API 키가 없습니다. GEMINI_API_KEY를 설정해주세요.")
+        key = ("gemini", api_key)
+        factory = lambda: GeminiBackend(api_key)
+    with _LOCK:
+        if key not in _BACKENDS:
+            _BACKENDS[key] = factory()
+        return _BACKENDS[key]
+
+
+def configuration_error() -> str | None:
+    """호출 전 점검용. 문제가 없으면 None, 있으면 사용자에게 보여줄 메시지."""
+    try:
+        get_backend()
+        return None
+    except ImportError:
+        return "⚠️ google-genai 패키지가 없습니다. `uv sync` 또는 `pip install google-genai` 후 재시작하세요."
+    except Exception as e:
+        return f"⚠️ {e}"
+
+
+# ── 공개 API ────────────────────────────────────────────────────
+
+def _record(site: str, started: float, usage: dict | None, error: bool) -> None:
+    metrics.record(site, "llm_latency_ms", (time.perf_counter() - started) * 1000)
+    metrics.record(site, "llm_error", 1 if error else 0)
+    if usage:
+        metrics.record(site, "llm_input_tokens", usage.get("input_tokens", 0))
+        metrics.record(site, "llm_output_tokens", usage.get("output_tokens", 0))
+        metrics.record(site, "llm_cached_tokens", usage.get("cached_tokens", 0))
+
+
+def _record_prefix(site: str, model: str, system: str | None) -> None:
+    """로컬 접두부 해시 기준 재사용 여부. 제공자 캐시 보고가 없어도 절감 가능량을 추적합니다."""
+    if not system:
+        return
+    hit = PREFIXES.seen(model, system)
+    metrics.record(site, "prefix_hit", 1 if hit else 0)
+    metrics.record(site, "prefix_tokens", estimate_tokens(system) if hit else 0)
+
+
+def token_savings(site: str | None = None) -> list[dict]:
+    """
+    site별 입력 토큰 절감 요약.
+    cached_tokens: 제공자가 캐시 적중으로 보고한 토큰, reusable_tokens: 로컬 해시상 재사용된 접두부 토큰(추정).
+    """
+    by_site: dict[str, dict] = {}
+    for row in metrics.summary(site):
+        by_site.setdefault(row["site"], {})[row["metric"]] = row
+
+    rows = []
+    for s, m in by_site.items():
+        if "llm_input_tokens" not in m:
+            continue
+        input_tokens = m["llm_input_tokens"]["total"]
+        cached = m.get("llm_cached_tokens", {}).get("total", 0)
+        rows.append({
+            "site":            s,
+            "calls":           m["llm_input_tokens"]["count"],
+            "input_tokens":    int(input_tokens),
+            "cached_tokens":   int(cached),
+            "saved_pct":       round(cached / input_tokens * 100, 1) if input_tokens else 0.0,
+            "prefix_hit_rate": round(m.get("prefix_hit", {}).get("mean", 0) * 100, 1),
+            "reusable_tokens": int(m.get("prefix_tokens", {}).get("total", 0)),
+        })
+    return rows
+
+
+# 429 재시도 정책 (generate·stream·agenerate 공통). tenacity는 코루틴 함수면 asyncio.sleep으로 대기
+RETRY_POLICY = dict(
+    retry=retry_if_exception(is_rate_limit_error),
+    stop=stop_after_attempt(5),
+    wait=wait_exponential(multiplier=2, min=4, max=60),
+    reraise=True,
+)
+# 지연·토큰·오류 지표는 시도마다, 접두부 재사용 지표(_record_prefix)는 논리 호출당 1번 기록
+
+
+def generate(contents, *, site: str, model: str | None = None, schema: dict | None = None,
+             system: str | None = None, timeout: float | None = None) -> str:
+    """
+    동기 호출. contents: str 또는 [str | image_part(...)] 리스트.
+    schema를 주면 JSON 응답을 강제하고, 429는 지수 백오프로 재시도합니다.
+    system에는 호출 간 불변인 정적 접두부만 넣으세요 (core.prompts.Prompt.system) — 캐시 키가 됩니다.
+    """
+    backend = get_backend()
+    model = model or GEMINI_MODEL_VER
+    _record_prefix(site, model, system)
+    return _generate(backend, site, model, contents, schema, system, timeout)
+
+
+@retry(**RETRY_POLICY)
+def _generate(backend, site, model, contents, schema, system, timeout) -> str:
+    started = time.perf_counter()
+    usage, error = None, True
+    try:
+        with backend.limiter.slot():
+            text, usage = backend.generate(model, contents, schema, system, timeout)
+        error = False
+        return text
+    finally:
+        _record(site, started, usage, error)
+
+
+def stream(contents, *, site: str, model: str | None = None, schema: dict | None = None,
+           system: str | None = None, timeout: float | None = None):
+    """
+    스트리밍 호출. 텍스트 조각을 yield. 응답이 끝날 때까지 한도 슬롯 1개를 점유합니다.
+    429는 첫 조각을 내보내기 전(스트림 연결 단계)까지만 generate와 같은 정책으로 재시도합니다.
+    """
+    backend = get_backend()
+    model = model or GEMINI_MODEL_VER
+    _record_prefix(site, model, system)
+    yielded = False
+    policy = dict(RETRY_POLICY, retry=retry_if_exception(lambda e: not yielded and is_rate_limit_error(e)))
+    for attempt in Retrying(**policy):
+        with attempt:
+            started = time.perf_counter()
+            usage, error = None, True
+            try:
+                with backend.limiter.slot():
+                    for chunk, chunk_usage in backend.stream(model, contents, schema, system, timeout):
+                        if chunk_usage is not None:
+                            usage = chunk_usage
+                        if chunk:
+                            yielded = True
+                            yield chunk
+                error = False
+            finally:
+                _record(site, started, usage, error)
+
+
+async def agenerate(contents, *, site: str, model: str | None = None, schema: dict | None = None,
+                    system: str | None = None, timeout: float | None = None) -> str:
+    """비동기 호출 (배치 작업 등 여러 건을 한 이벤트 루프에서 동시에 보낼 때). 429는 generate와 같이 재시도."""
+    backend = get_backend()
+    model = model or GEMINI_MODEL_VER
+    _record_prefix(site, model, system)
+    return await _agenerate(backend, site, model, contents, schema, system, timeout)
+
+
+@retry(**RETRY_POLICY)
+async def _agenerate(backend, site, model, contents, schema, system, timeout) -> str:
+    started = time.perf_counter()
+    usage, error = None, True
+    try:
+        async with backend.limiter.aslot():
+            text, usage = await backend.agenerate(model, contents, schema, system, timeout)
+        error = False
+        return text
+    finally:
+        _record(site, started, usage, error)
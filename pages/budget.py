@@ -18,36 +18,15 @@ from config import (
 from database import (
     load_data, save_budget, get_budgets, delete_budget,
     get_available_months, save_setting, get_setting,
-    clear_all_budgets, get_categories,
+    clear_all_budgets, get_categories, get_cube,
 )
+import llm
+import reports
 
 # ── _s() 헬퍼 및 상수 오버라이드 ──────────────────────
 def _s(key, default):
     return type(default)(get_setting(key) or default)
 
-# ── Gemini SDK: 신구 버전 모두 지원 ──────────────────
-# google-generativeai (구) : import google.generativeai as genai
-# google-genai       (신) : from google import genai
-GEMINI_AVAILABLE  = False
-GEMINI_SDK_NEW    = False   # True → 신규 SDK 사용
-
-try:
-    # 신규 SDK 우선 시도 (pip install google-genai)
-    from google import genai as _genai_new   # noqa: F401
-    GEMINI_AVAILABLE = True
-    GEMINI_SDK_NEW   = True
-except ImportError:
-    pass
-
-if not GEMINI_AVAILABLE:
-    try:
-        # 구 SDK 폴백 (pip install google-generativeai)
-        import google.generativeai as genai   # noqa: F401
-        GEMINI_AVAILABLE = True
-        GEMINI_SDK_NEW   = False
-    except ImportError:
-        pass
-
 # ══════════════════════════════════════════════════════
 # ▌ 3인 가구 육아 특성 반영 예산 배분 비중
 #   (통계청 소득 분위 비중을 베이스로,
@@ -159,16 +138,16 @@ st.caption(
     f"**{selected_month}**의 소비 현황을 AI에게 점검받아 보세요."
 )
 
+# 마감된 달 진단은 백그라운드에서 미리 생성 (프로세스당 1회, LLM 설정이 있을 때만)
+reports.start_pregeneration()
+
 # ── 데이터 로드 ───────────────────────────────────────
 expenses_df = load_data(selected_month)
 budgets_df  = get_budgets()
 
-if not expenses_df.empty:
-    spent_by_cat = expenses_df.groupby("category")["amount"].sum()
-    total_spent  = int(expenses_df["amount"].sum())
-else:
-    spent_by_cat = pd.Series(dtype=int)
-    total_spent  = 0
+cube         = get_cube()
+spent_by_cat = cube.rollup("category", month=selected_month)
+total_spent  = cube.sum(month=selected_month)
 
 tab1, tab2, tab3 = st.tabs(
     ["🎯 예산 추천 및 설정", "📊 소비 성향별 현황", "🤖 AI 예산 진단"]
@@ -618,100 +597,37 @@ with tab3:
         if budgets_df.empty or expenses_df.empty:
             st.info("예산과 지출 데이터가 모두 필요합니다.")
         else:
-            display_df2 = budgets_df.copy()
-            display_df2["spent"]     = display_df2["category"].map(spent_by_cat).fillna(0).astype(int)
-            display_df2["remaining"] = display_df2["amount"] - display_df2["spent"]
-            display_df2["percent"]   = (
-                display_df2["spent"] / display_df2["amount"].replace(0, 1) * 100
-            ).round(1)
-            # ★ 카테고리 오름차순 정렬
-            display_df2 = display_df2.sort_values("category").reset_index(drop=True)
-
-            over_budget_df = display_df2[display_df2["remaining"] < 0].sort_values("remaining")
-
-            # ── prompt 미리 조립 (버튼 안팎 모두 동일하게 사용) ──
-            budget_summary = "\n".join(
-                f"- {r['category']}: 예산 {r['amount']:,}원 / "
-                f"지출 {r['spent']:,}원 ({r['percent']}%)"
-                for _, r in display_df2.iterrows()
-            )
-            over_summary = (
-                "\n".join(
-                    f"- {r['category']}: {abs(r['remaining']):,}원 초과"
-                    for _, r in over_budget_df.iterrows()
+            # 버튼 안팎에서 같은 프롬프트를 사용 — 지문이 같으면 저장된 진단을 바로 표시
+            prompt = reports.build_budget_prompt(selected_month, expenses_df, budgets_df)
+            saved_report = reports.cached_report("budget", selected_month, prompt)
+            if saved_report:
+                st.caption(f"💾 {saved_report['created_at']} 생성된 진단 (이달 데이터 변동 없음)")
+                st.markdown(saved_report["content"])
+
+            api_error = llm.configuration_error()
+            if api_error and llm.get_api_key() is None:
+                api_key = st.text_input(
+                    "🔑 Gemini API 키를 입력하세요",
+                    type="password",
+                    placeholder="AIza...",
                 )
-                if not over_budget_df.empty
-                else "없음"
-            )
-            prompt = f"""당신은 한국의 맞벌이 가정 재무 코치입니다. 아래 정보를 바탕으로 한국어로 진단해 주세요.
-
-## 가구 프로필
-- 3인 가족 (38세/35세 부부, 1세 자녀)
-- 2029년 2월 목표: 서울·경기 상급지 84㎡ 아파트 자기자본 5억 확보 후 매수
-- 월 변동지출 목표: {VARIABLE_BUDGET_LIMIT:,}원 / 이번 달 실지출: {total_spent:,}원
-- 초과액: {excess:,}원
-
-## {selected_month} 카테고리별 예산 현황
-{budget_summary}
-
-## 초과 카테고리
-{over_summary}
-
-## 요청 사항
-1. 초과 원인을 2~3가지로 분석하세요.
-2. 각 초과 카테고리에 대해 구체적이고 즉시 실행 가능한 절약 팁을 제안하세요.
-3. 1세 영아 육아 가정이라는 특수성을 고려하여 현실적인 조언을 해주세요.
-4. '이달의 재무 점수'를 100점 만점으로 매기고 이유를 설명하세요.
-"""
-
-            if not GEMINI_AVAILABLE:
-                st.error(
-                    "🔧 **Gemini 패키지를 찾을 수 없습니다.**  \n"
-                    "터미널에서 아래 명령 중 하나를 실행한 뒤 앱을 재시작하세요.  \n\n"
-                    "```bash\n"
-                    "# 신규 SDK (권장)\n"
-                    "pip install google-genai\n\n"
-                    "# 또는 구 SDK\n"
-                    "pip install google-generativeai\n"
-                    "```"
-                )
-            else:
-                api_key = get_setting("gemini_api_key", "")
-                if not api_key:
-                    api_key = st.text_input(
-                        "🔑 Gemini API 키를 입력하세요",
-                        type="password",
-                        placeholder="AIza...",
-                    )
-                    if api_key:
-                        save_setting("gemini_api_key", api_key)
-                        st.rerun()
-
-                if api_key and st.button("🚀 AI 진단 시작", type="primary", use_container_width=True):
-                    with st.spinner("Gemini가 소비 패턴을 분석하고 있습니다..."):
-                        try:
-                            if GEMINI_SDK_NEW:
-                                # 신규 SDK: google-genai
-                                from google import genai as genai_new
-                                client = genai_new.Client(api_key=api_key)
-                                response = client.models.generate_content(
-                                    model=GEMINI_MODEL_VER,
-                                    contents=prompt,
-                                )
-                                result_text = response.text
-                            else:
-                                # 구 SDK: google-generativeai
-                                import google.generativeai as genai_old
-                                genai_old.configure(api_key=api_key)
-                                model_obj = genai_old.GenerativeModel(GEMINI_MODEL_VER)
-                                response  = model_obj.generate_content(prompt)
-                                result_text = response.text
-
-                            st.markdown(result_text)
-                        except Exception as e:
-                            st.error(
-                                f"AI 진단 중 오류가 발생했습니다.  \n"
-                                f"**오류 내용:** `{e}`  \n\n"
-                                f"API 키가 올바른지, 또는 `GEMINI_MODEL_VER`(현재: `{GEMINI_MODEL_VER}`)이 "
-                                f"유효한지 확인하세요."
-                            )
\ No newline at end of file
+                if api_key:
+                    save_setting("gemini_api_key", api_key)
+                    st.rerun()
+            elif api_error:
+                st.error(api_error)
+            elif st.button(
+                "🔄 다시 진단" if saved_report else "🚀 AI 진단 시작",
+                type="secondary" if saved_report else "primary", use_container_width=True,
+            ):
+                with st.spinner("Gemini가 소비 패턴을 분석하고 있습니다..."):
+                    try:
+                        result_text = reports.generate_report("budget", selected_month, prompt)
+                        st.markdown(result_text)
+                    except Exception as e:
+                        st.error(
+                            f"AI 진단 중 오류가 발생했습니다.  \n"
+                            f"**오류 내용:** `{e}`  \n\n"
+                            f"API 키가 올바른지, 또는 `GEMINI_MODEL_VER`(현재: `{GEMINI_MODEL_VER}`)이 "
+                            f"유효한지 확인하세요."
+                        )
@@ -0,0 +1,90 @@
+# pages/calendar_heatmap.py
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import streamlit as st
+import plotly.express as px
+from database import get_daily_totals
+from components.charts import make_calendar_heatmap
+from components.formatters import format_korean
+
+SPENDERS = ["전체", "공동", "남편", "아내", "아이"]
+
+
+# ── 페이지 설정 ──────────────────────────────────────────────────
+
+st.set_page_config(page_title="지출 캘린더", page_icon="🗓️", layout="wide")
+st.title("🗓️ 지출 캘린더")
+st.caption("날짜별 지출 강도를 연도 달력으로 봅니다. 쓰기 때마다 갱신되는 일별 합계만 읽으므로 여러 해도 바로 그려집니다.")
+
+
+# ── 데이터 로드 ──────────────────────────────────────────────────
+# (날짜 × 지출자 × 소비성향) 일별 합계 수천 행을 한 번 읽고 조건·분해는 pandas로
+
+daily_all = get_daily_totals(by=["spender", "type"])
+
+if daily_all.empty:
+    st.info("📭 지출 데이터가 없습니다. 먼저 지출을 입력해 주세요.")
+    st.stop()
+
+years = sorted({d[:4] for d in daily_all["date"]}, reverse=True)
+col_spender, col_type, col_year, col_value = st.columns(4)
+with col_spender:
+    spender_filter = st.selectbox("👤 사용자", SPENDERS)
+with col_type:
+    type_filter = st.selectbox("🏷️ 소비성향", ["전체"] + sorted(daily_all["type"].unique()))
+with col_year:
+    year_filter = st.selectbox("📅 연도", ["전체 기간"] + years)
+with col_value:
+    value_col = st.radio("표시 값", ["amount", "count"], horizontal=True,
+                         format_func=lambda v: "금액" if v == "amount" else "건수")
+
+scope = daily_all
+if year_filter != "전체 기간":
+    scope = scope[scope["date"].str.startswith(year_filter)]
+by_spender = scope if type_filter == "전체" else scope[scope["type"] == type_filter]
+by_type = scope if spender_filter == "전체" else scope[scope["spender"] == spender_filter]
+selected = by_type if type_filter == "전체" else by_type[by_type["type"] == type_filter]
+daily = selected.groupby("date", as_index=False)[["amount", "count"]].sum()
+
+if daily.empty:
+    st.warning("⚠️ 선택한 조건에 해당하는 지출이 없습니다.")
+    st.stop()
+
+
+# ── 요약 지표 ────────────────────────────────────────────────────
+
+top_day = daily.loc[daily["amount"].idxmax()]
+m1, m2, m3, m4 = st.columns(4)
+m1.metric("총 지출", f"{int(daily['amount'].sum()):,}원")
+m2.metric("지출한 날", f"{len(daily):,}일")
+m3.metric("지출일 평균", f"{int(daily['amount'].mean()):,}원")
+m4.metric("가장 많이 쓴 날", top_day["date"], format_korean(top_day["amount"]), delta_color="off")
+
+
+# ── 달력 히트맵 ──────────────────────────────────────────────────
+
+st.plotly_chart(
+    make_calendar_heatmap(daily, value=value_col, unit="원" if value_col == "amount" else "건"),
+    use_container_width=True,
+)
+
+
+# ── 지출자 · 소비성향별 분해 ─────────────────────────────────────
+# 각 분해는 자기 축 조건만 빼고 나머지 조건(연도, 다른 축)을 적용
+
+st.divider()
+col_left, col_right = st.columns(2)
+
+with col_left:
+    st.markdown("#### 👤 지출자별")
+    spender_totals = by_spender.groupby("spender", as_index=False)[["amount", "count"]].sum()
+    fig = px.bar(spender_totals, x="spender", y=value_col, text_auto=",.0f",
+                 labels={"spender": "지출자", "amount": "금액(원)", "count": "건수"})
+    st.plotly_chart(fig, use_container_width=True)
+
+with col_right:
+    st.markdown("#### 🏷️ 소비성향별")
+    type_totals = by_type.groupby("type", as_index=False)[["amount", "count"]].sum()
+    fig = px.pie(type_totals, names="type", values=value_col, hole=0.4)
+    st.plotly_chart(fig, use_container_width=True)
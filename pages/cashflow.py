@@ -2,12 +2,18 @@ import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime, date
 
 from database import load_data, get_available_months, get_budgets, get_fixed_expenses, save_monthly_income, get_monthly_income, save_setting
-from core.finance import calculate_fv as _sv_fv, calculate_asset_fv as _as_fv, calculate_max_loan
+from core.finance import (
+    calculate_max_loan, equity_projection_frame,
+    required_saving, earliest_month, required_return,
+)
+from components.charts import make_sensitivity_heatmap
+from components.sensitivity import SENS_RETURNS, SENS_SAVINGS, sensitivity_table
 from components.formatters import format_korean
 
 from config import TARGET_DATE_YEAR, TARGET_DATE_MONTH, TARGET_EQUITY, MONTHLY_SAVING_TARGET
@@ -35,32 +41,11 @@ def months_remaining(target: date = TARGET_DATE) -> int:
 
 
 def build_yearly_chart(pmt, pv, annual_rate, chongsek, jeonse):
-    """연도별 포인트 적립 추이 데이터 생성"""
-    today = date.today()
-    points = []
-    year = today.year
-    month = today.month
-
-    while True:
-        m = (TARGET_DATE.year - year) * 12 + (TARGET_DATE.month - month)
-        if m < 0:
-            break
-        elapsed = months_remaining(TARGET_DATE) - m
-        sv_fv = int(_sv_fv(pmt, annual_rate, elapsed))
-        as_fv = int(_as_fv(pv, annual_rate, elapsed))
-        total = sv_fv + as_fv + chongsek + jeonse
-        points.append({"date": f"{year}-{month:02d}", "총 자기자본": total})
-
-        # 다음 연도 같은 월 or 최종 목표월
-        year += 1
-        if year > TARGET_DATE.year or (year == TARGET_DATE.year and month > TARGET_DATE.month):
-            # 마지막 포인트: 목표 시점
-            sv_fv = int(_sv_fv(pmt, annual_rate, months_remaining(TARGET_DATE)))
-            as_fv = int(_as_fv(pv, annual_rate, months_remaining(TARGET_DATE)))
-            points.append({"date": f"{TARGET_DATE.year}-{TARGET_DATE.month:02d}", "총 자기자본": total})
-            break
-
-    return pd.DataFrame(points)
+    """연도별 자기자본 적립 추이 (오늘 월부터 1년 간격 + 목표 월) → DataFrame[date, 총 자기자본]"""
+    frame = equity_projection_frame(
+        date.today(), months_remaining(TARGET_DATE), pmt, annual_rate, pv, chongsek + jeonse,
+    )
+    return frame[["date", "총 자기자본"]].astype({"총 자기자본": int})
 
 
 # ── 페이지 ──────────────────────────────────────────────────────
@@ -241,4 +226,100 @@ else:
 annual_return = st.slider(
     "예상 투자 연수익률 (%)",
     min_value=0.0, max_value=8.0, value=3.0, step=0.5
-) / 100
\ No newline at end of file
+) / 100
+
+# ── 자기자본 적립 추이 ────────────────────────────────────────
+# 현재 자산은 온보딩 설정값 (월간 리뷰 reports.review_figures와 같은 키·기본값)
+eq_investment   = _s("asset_investment",      50_000_000)
+eq_jeonse       = _s("asset_jeonse_recovery", 260_000_000)
+eq_subscription = _s("asset_subscription",    25_000_000)
+goal_equity     = _s("goal_equity",           TARGET_EQUITY)
+
+yearly_df = build_yearly_chart(monthly_saving, eq_investment, annual_return, eq_subscription, eq_jeonse)
+final_equity = int(yearly_df["총 자기자본"].iloc[-1])
+
+ec1, ec2, ec3 = st.columns(3)
+ec1.metric("현재 자기자본", format_korean(int(yearly_df["총 자기자본"].iloc[0])))
+ec2.metric(f"{TARGET_DATE.year}년 {TARGET_DATE.month}월 예상", format_korean(final_equity))
+ec3.metric("목표 대비", format_korean(abs(final_equity - goal_equity)),
+           delta="달성" if final_equity >= goal_equity else "부족",
+           delta_color="normal" if final_equity >= goal_equity else "inverse")
+
+fig_equity = go.Figure(go.Scatter(
+    x=yearly_df["date"], y=yearly_df["총 자기자본"],
+    mode="lines+markers", name="총 자기자본",
+))
+fig_equity.add_hline(y=goal_equity, line_dash="dash", line_color="red",
+                     annotation_text=f"목표 {format_korean(goal_equity)}", annotation_position="top left")
+fig_equity.update_layout(xaxis_title="시점", yaxis_title="원", xaxis_type="category")
+st.plotly_chart(fig_equity, use_container_width=True)
+
+
+# ── 목표 역산: 필요 저축 · 최단 달성 시점 · 필요 수익률 ─────────
+st.subheader("🧮 목표 역산")
+fixed_assets = eq_subscription + eq_jeonse
+need_saving = float(required_saving(goal_equity, annual_return, remaining_months, eq_investment, fixed_assets))
+reach_months = float(earliest_month(goal_equity, monthly_saving, annual_return, eq_investment, fixed_assets))
+need_return = float(required_return(goal_equity, monthly_saving, remaining_months, eq_investment, fixed_assets))
+
+
+def _month_label(months_ahead: float) -> str:
+    if not np.isfinite(months_ahead):
+        return "도달 불가"
+    return (pd.Period(date.today(), freq="M") + int(months_ahead)).strftime("%Y년 %m월")
+
+
+gc1, gc2, gc3 = st.columns(3)
+gc1.metric(f"{TARGET_DATE.year}년 {TARGET_DATE.month}월 달성 필요 월 저축",
+           f"{need_saving:,.0f}원" if np.isfinite(need_saving) else "불가",
+           delta=f"{monthly_saving - need_saving:+,.0f}원 (현재 대비 여유)" if np.isfinite(need_saving) else None,
+           help=f"연 {annual_return:.1%} 수익률 가정")
+gc2.metric("현재 저축으로 가장 빠른 달성",
+           _month_label(reach_months),
+           delta=f"{reach_months:.0f}개월 후" if np.isfinite(reach_months) else None, delta_color="off")
+gc3.metric("목표 시점 달성 필요 연수익률",
+           f"{need_return:.2%}" if np.isfinite(need_return) else "50% 초과",
+           help=f"월 저축 {monthly_saving:,}원 유지 가정")
+
+# 목표 금액을 바꿔 가며 한 번에 역산 (벡터)
+goals = goal_equity + np.array([-100_000_000, 0, 100_000_000, 200_000_000])
+goals = goals[goals > 0]
+goal_table = pd.DataFrame({
+    "목표 자기자본": [format_korean(g) for g in goals],
+    "필요 월 저축": [f"{v:,.0f}원" if np.isfinite(v) else "불가"
+                    for v in required_saving(goals, annual_return, remaining_months, eq_investment, fixed_assets)],
+    "최단 달성": [_month_label(m) for m in earliest_month(goals, monthly_saving, annual_return, eq_investment, fixed_assets)],
+    "필요 연수익률": [f"{r:.2%}" if np.isfinite(r) else "50% 초과"
+                     for r in required_return(goals, monthly_saving, remaining_months, eq_investment, fixed_assets)],
+})
+st.dataframe(goal_table, use_container_width=True, hide_index=True)
+
+
+# ── 민감도 분석: 월 저축 × 수익률 × 기간 ──────────────────────
+st.subheader("🔬 민감도 분석 — 월 저축 × 수익률 × 기간")
+horizons = tuple(sorted({*range(12, remaining_months + 37, 12), remaining_months} - {0}))
+horizon = st.select_slider(
+    "평가 시점",
+    options=horizons,
+    value=remaining_months if remaining_months in horizons else horizons[0],
+    format_func=lambda m: f"{(pd.Period(date.today(), freq='M') + m).strftime('%Y-%m')} (+{m}개월)",
+)
+grid = sensitivity_table(eq_investment, eq_subscription + eq_jeonse, horizons)[:, :, horizons.index(horizon)]
+marker = (monthly_saving, annual_return)
+
+sc1, sc2 = st.columns(2)
+with sc1:
+    st.plotly_chart(make_sensitivity_heatmap(
+        grid / 1e8, SENS_SAVINGS, SENS_RETURNS, "예상 자기자본", "Blues", marker,
+    ), use_container_width=True)
+with sc2:
+    st.plotly_chart(make_sensitivity_heatmap(
+        np.maximum(goal_equity - grid, 0) / 1e8, SENS_SAVINGS, SENS_RETURNS,
+        f"목표({format_korean(goal_equity)}) 대비 부족액", "Reds", marker,
+    ), use_container_width=True)
+# 수익률별 목표 달성 필요 월 저축 (격자 근사 대신 닫힌 해)
+need = required_saving(goal_equity, SENS_RETURNS[::4], horizon, eq_investment, eq_subscription + eq_jeonse)
+st.caption("목표 달성에 필요한 월 저축: " + " · ".join(
+    f"{r * 100:.0f}% → {n / 10_000:,.0f}만" if np.isfinite(n) else f"{r * 100:.0f}% → 불가"
+    for r, n in zip(SENS_RETURNS[::4], need)
+))
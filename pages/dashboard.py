@@ -2,6 +2,9 @@ import streamlit as st
 import pandas as pd
 import sys
 import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 import plotly.express as px
 import plotly.graph_objects as go
 
@@ -32,9 +35,17 @@ except AttributeError:
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from database import (
-    load_data, delete_expense, update_expense, get_available_months, 
+    delete_expense, update_expense, get_available_months, 
     DB_NAME, get_categories, add_category, delete_category_safe,
-    get_category_mapping 
+    get_category_dim, get_cube, get_weekly_summary,
+    get_top_expenses, get_data_version, load_expense_page, expense_page_cursor, count_expenses,
+    load_shared, SHARED_FRAMES
+)
+from core.frames import SessionView
+from core import metrics
+from core.aggregates import (
+    MAX_CHART_POINTS, WEBGL_POINTS, choose_granularity, lttb_indices, patch_period_top_items,
+    period_top_items
 )
 
 st.set_page_config(page_title="가계부 대시보드", page_icon="📊", layout="wide")
@@ -94,6 +105,105 @@ def show_pie_detail_dialog(selected_label, filter_col, dataframe):
         )
 
 
+# ==========================================
+# 📈 [추이 차트] 기간이 길면 주/월 집계·LTTB + WebGL, 직렬화 결과는 데이터 버전별 캐시
+# ==========================================
+GRANULARITY_LABELS = {"D": "일별", "W": "주별", "M": "월별"}
+
+def trend_frame(granularity):
+    """세션 데이터의 기간별 총액·Top 3. 집계 단위별로 세션에 보관하고, 수정 시에는 바뀐 기간만 다시 계산."""
+    cache = st.session_state.setdefault('trend_cache', {})
+    if granularity not in cache:
+        cache[granularity] = period_top_items(st.session_state['dashboard_view'].frame(), granularity, k=3)
+    return cache[granularity]
+
+
+def apply_edit_deltas(deltas):
+    """
+    편집기에서 반영한 변경분 [{id, old: {date, category, amount}, new: {...} | None}]으로
+    보관 중인 추이 집계를 제자리 갱신. 합계·파이는 집계 큐브가 DB 변경 로그로 따라옵니다.
+    """
+    start = time.perf_counter()
+    dates = {d['old']['date'] for d in deltas} | {d['new']['date'] for d in deltas if d['new']}
+    cache = st.session_state.get('trend_cache', {})
+    for granularity, trend in cache.items():
+        cache[granularity] = patch_period_top_items(trend, st.session_state['dashboard_view'].frame(), granularity, dates, k=3)
+    metrics.record("dashboard", "edit_patch_ms", (time.perf_counter() - start) * 1000)
+    metrics.record("dashboard", "edit_deltas", len(deltas))
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def trend_figure_json(filter_key, data_version, granularity, _trend_df):
+    """(필터, 데이터 버전, 집계 단위)가 같으면 그림을 다시 만들지 않고 JSON을 재사용."""
+    start = time.perf_counter()
+    trend_df = _trend_df
+    if len(trend_df) > MAX_CHART_POINTS:
+        x = trend_df['date'].to_numpy().astype('datetime64[D]').astype(float)
+        trend_df = trend_df.iloc[lttb_indices(x, trend_df['총액'].to_numpy(), MAX_CHART_POINTS)]
+    trend_df = trend_df.assign(총액_만=trend_df['총액'] / 10000)
+
+    # Scattergl은 spline을 지원하지 않으므로 점이 많을 때는 직선으로 그림
+    webgl = len(trend_df) > WEBGL_POINTS
+    trace = go.Scattergl if webgl else go.Scatter
+    fig_line = go.Figure()
+    fig_line.add_trace(trace(
+        x=trend_df['date'], y=trend_df['총액_만'], mode='lines' if webgl else 'lines+markers',
+        line=dict(color='#4361EE', width=2 if webgl else 3, shape='linear' if webgl else 'spline'),
+        marker=dict(size=8, color='#4361EE', line=dict(width=2, color='white')),
+        fill='tozeroy', fillcolor='rgba(67, 97, 238, 0.1)',
+        customdata=trend_df[['총액', 'top_items']],
+        hovertemplate="<b>총 지출: %{customdata[0]:,.0f}원</b><br><span style='font-size:12px; color:gray;'>🏆 Top: %{customdata[1]}</span><extra></extra>"
+    ))
+    fig_line.update_layout(yaxis=dict(tickformat=".0f", ticksuffix="만"), hovermode="x unified", dragmode=False, height=350, margin=dict(t=10, b=10))
+    fig_json = fig_line.to_json()
+
+    metrics.record("dashboard", "trend_build_ms", (time.perf_counter() - start) * 1000)
+    metrics.record("dashboard", "trend_payload_bytes", len(fig_json.encode()))
+    metrics.record("dashboard", "trend_points", len(trend_df))
+    return fig_json
+
+
+# ==========================================
+# 📝 [상세 내역 편집기] (date, id) keyset 페이지 + 다음 페이지 미리 읽기
+# ==========================================
+EDITOR_PAGE_SIZE = 100
+EDITOR_SORTS = {
+    "최신순": ("date", True), "오래된순": ("date", False),
+    "금액 큰 순": ("amount", True), "금액 작은 순": ("amount", False),
+}
+
+@st.cache_resource
+def _prefetch_executor():
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="editor-prefetch")
+
+
+def _query_editor_page(sig, after):
+    month, spender, category, search, sort_label = sig
+    sort_col, descending = EDITOR_SORTS[sort_label]
+    page = load_expense_page(month, spender, category, search, sort_col, descending, after, EDITOR_PAGE_SIZE)
+    next_cursor = None
+    if len(page) == EDITOR_PAGE_SIZE:
+        next_cursor = expense_page_cursor(page.iloc[-1], sort_col)
+    page['date'] = pd.to_datetime(page['date'])
+    return page, next_cursor
+
+
+def fetch_editor_page(sig, after):
+    """
+    sig 조건의 after 다음 페이지 → (DataFrame, 다음 페이지 커서 | None).
+    미리 읽어 둔 결과가 있으면 재사용하고, 반환 전에 그 다음 페이지를 백그라운드로 읽기 시작합니다.
+    """
+    prefetch = st.session_state.get('editor_prefetch')
+    if prefetch and prefetch[0] == (sig, after):
+        page, next_cursor = prefetch[1].result()
+    else:
+        page, next_cursor = _query_editor_page(sig, after)
+    if next_cursor is not None:
+        future = _prefetch_executor().submit(_query_editor_page, sig, next_cursor)
+        st.session_state['editor_prefetch'] = ((sig, next_cursor), future)
+    return page, next_cursor
+
+
 # --- 1. 사이드바 (카테고리 성향 선택 기능) ---
 with st.sidebar:
     st.header("🔍 조회 설정")
@@ -119,7 +229,7 @@ with st.sidebar:
         if st.button("추가"):
             if new_cat and add_category(new_cat, cat_type):
                 st.success(f"'{new_cat}' ({cat_type}) 추가됨")
-                st.session_state.pop('dashboard_data', None)
+                st.session_state.pop('dashboard_view', None)
                 st.rerun()
         
         st.write("---")
@@ -128,22 +238,38 @@ with st.sidebar:
         if del_cat != "선택 안 함":
             if st.button(f"🗑️ '{del_cat}' 삭제"):
                 delete_category_safe(del_cat)
-                st.session_state.pop('dashboard_data', None)
+                st.session_state.pop('dashboard_view', None)
                 st.rerun()
 
 # --- 2. 데이터 로드 및 매핑 ---
-full_df = load_data("전체 기간", spender_filter)
-if not full_df.empty:
-    full_df['date'] = pd.to_datetime(full_df['date'])
-
-if 'dashboard_data' not in st.session_state or st.session_state.get('last_filter') != current_filter_key:
-    raw_df = load_data(selected_month, spender_filter)
-    if not raw_df.empty:
-        raw_df['date'] = pd.to_datetime(raw_df['date'])
-    st.session_state['dashboard_data'] = raw_df
+KEY_COLUMNS = {"date", "spender"}   # 공유 프레임 키(월, 지출자)를 정하는 열
+# 월 데이터는 모든 세션이 공유하는 읽기 전용 프레임 + 이 세션의 수정 오버레이(SessionView)로 봄
+view = st.session_state.get('dashboard_view')
+data_version = get_data_version()
+if view is None or st.session_state.get('last_filter') != current_filter_key:
+    view = None
+elif view.version != data_version:
+    # 날짜·지출자 수정은 행을 (월, 지출자) 키 밖으로 옮길 수 있으므로 접지 않고 DB에서 다시 읽음
+    moves_rows = any(KEY_COLUMNS & changes.keys() for changes in view.edits.values())
+    if view.version + view.pending_ops == data_version and not moves_rows:
+        # 그 사이 바뀐 건 이 세션의 수정뿐 → 오버레이를 접은 프레임을 새 버전으로 공유 (다시 읽지 않음)
+        folded = view.materialize()
+        SHARED_FRAMES.put((selected_month, spender_filter), data_version, folded)
+        view = SessionView(folded, data_version)
+    else:
+        view = None   # 다른 세션·프로세스의 쓰기 → 새 버전 공유 프레임으로 교체
+
+if view is None:
+    base, version = load_shared(selected_month, spender_filter)
+    view = SessionView(base, version)
     st.session_state['last_filter'] = current_filter_key
+    st.session_state.pop('trend_cache', None)
+st.session_state['dashboard_view'] = view
+
+df = view.frame()
 
-df = st.session_state['dashboard_data']
+if 'editor_toast' in st.session_state:
+    st.toast(st.session_state.pop('editor_toast'))
 
 if selected_month == "전체 기간":
     st.title("📊 전체 소비 분석")
@@ -155,13 +281,16 @@ if df.empty:
     st.stop()
 
 # DB에서 매핑을 불러와 동적으로 소비성향 부여
-category_mapping = get_category_mapping()
-df['소비성향'] = df['category'].map(lambda x: category_mapping.get(x, "미분류"))
+category_dim = get_category_dim()
+df['소비성향'] = category_dim.type_of(df['category'])
 
 # --- 3. 통계 (상단) ---
-total = df['amount'].sum()
-essential_total = df[df['소비성향'] == '필수소비 (Needs)']['amount'].sum()
-discretionary_total = df[df['소비성향'] == '선택소비 (Wants)']['amount'].sum()
+# 합계·성향별 합계는 집계 큐브에서 바로 꺼냄 (탭3 수정도 변경 로그로 바로 반영)
+cube = get_cube()
+type_totals = cube.rollup_types(category_dim.mapping, month=selected_month, spender=spender_filter)
+total = sum(type_totals.values())
+essential_total = type_totals.get('필수소비 (Needs)', 0)
+discretionary_total = type_totals.get('선택소비 (Wants)', 0)
 
 delta_str = None
 if selected_month != "전체 기간" and available_months:
@@ -169,8 +298,7 @@ if selected_month != "전체 기간" and available_months:
         current_idx = available_months.index(selected_month)
         if current_idx + 1 < len(available_months):
             prev_month_str = available_months[current_idx + 1]
-            prev_df = full_df[full_df['date'].dt.strftime('%Y-%m') == prev_month_str]
-            prev_total = prev_df['amount'].sum()
+            prev_total = cube.sum(month=prev_month_str, spender=spender_filter)
             
             diff = total - prev_total
             if diff > 0: delta_str = f"전월대비 {diff:,.0f}원 증가 🔺"
@@ -202,7 +330,7 @@ with tab1:
     
     with col_chart1:
         st.markdown("#### ⚖️ 필수 vs 선택 소비 비율")
-        type_df = df.groupby('소비성향')['amount'].sum().reset_index()
+        type_df = pd.DataFrame(sorted(type_totals.items()), columns=['소비성향', 'amount'])
         fig_type = go.Figure(data=[go.Pie(
             labels=type_df['소비성향'], 
             values=type_df['amount'], 
@@ -217,7 +345,7 @@ with tab1:
         
     with col_chart2:
         st.markdown("#### 🍕 세부 카테고리 비중")
-        cat_df = df.groupby('category')['amount'].sum().reset_index()
+        cat_df = cube.rollup('category', month=selected_month, spender=spender_filter).sort_index().rename_axis('category').reset_index()
         custom_colors = ['#FF9F40', '#FFCD56', '#4BC0C0', '#36A2EB', '#9966FF', '#FF6384', '#FDB45C', '#46BFBD', '#F7464A']
         fig_pie = go.Figure(data=[go.Pie(
             labels=cat_df['category'], 
@@ -258,46 +386,31 @@ with tab1:
 
     st.divider()
     
-    # --- 일별 지출 추이 (기존 코드 유지) ---
-    st.markdown("#### 📅 일별 지출 추이")
-    def format_item(item, amount):
-        short_item = item if len(item) <= 10 else item[:10] + ".."
-        return f"{short_item}({amount:,})"
-
-    daily_df = df.groupby('date').apply(
-        lambda x: pd.Series({
-            '총액': x['amount'].sum(),
-            'top_items': ' / '.join([format_item(row['item'], row['amount']) for _, row in x.sort_values('amount', ascending=False).head(3).iterrows()])
-        })
-    ).reset_index()
-    daily_df['총액_만'] = daily_df['총액'] / 10000
+    # --- 지출 추이 (기간이 길면 주/월 집계) ---
+    n_days = df['date'].nunique()
+    granularity = "D"
+    if n_days > MAX_CHART_POINTS:
+        choice = st.radio("집계 단위", ["자동", "일", "주", "월"], horizontal=True, key="trend_granularity")
+        granularity = {"일": "D", "주": "W", "월": "M"}.get(choice) or choose_granularity(n_days)
+    st.markdown(f"#### 📅 {GRANULARITY_LABELS[granularity]} 지출 추이")
+    if granularity == "D" and n_days > MAX_CHART_POINTS:
+        st.caption(f"💡 {n_days:,}일 중 모양을 대표하는 {MAX_CHART_POINTS}개 지점만 표시합니다 (LTTB).")
+
+    fig_json = trend_figure_json(current_filter_key, get_data_version(), granularity, trend_frame(granularity))
+    st.plotly_chart(json.loads(fig_json), use_container_width=True, config={'displayModeBar': False})
 
-    fig_line = go.Figure()
-    fig_line.add_trace(go.Scatter(
-        x=daily_df['date'], y=daily_df['총액_만'], mode='lines+markers',
-        line=dict(color='#4361EE', width=3, shape='spline'),
-        marker=dict(size=8, color='#4361EE', line=dict(width=2, color='white')),
-        fill='tozeroy', fillcolor='rgba(67, 97, 238, 0.1)',
-        customdata=daily_df[['총액', 'top_items']],
-        hovertemplate="<b>총 지출: %{customdata[0]:,.0f}원</b><br><span style='font-size:12px; color:gray;'>🏆 Top: %{customdata[1]}</span><extra></extra>"
-    ))
-    fig_line.update_layout(yaxis=dict(tickformat=".0f", ticksuffix="만"), hovermode="x unified", dragmode=False, height=350, margin=dict(t=10, b=10))
-    st.plotly_chart(fig_line, use_container_width=True, config={'displayModeBar': False})
-    
 
 with tab2:
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("#### 🗓️ 주차별 합산 지출")
-        df_week = df.copy()
-        df_week['주차(시작일)'] = df_week['date'].dt.to_period('W-MON').dt.start_time.dt.strftime('%Y-%m-%d (월)')
-        weekly_summary = df_week.groupby('주차(시작일)').agg(지출건수=('id', 'count'), 총합계=('amount', 'sum')).reset_index()
+        weekly_summary = get_weekly_summary(selected_month, spender_filter)
+        weekly_summary.insert(0, '주차(시작일)', weekly_summary.pop('week_start') + ' (월)')
         st.dataframe(weekly_summary, column_config={"총합계": st.column_config.NumberColumn(format="%d원")}, hide_index=True, use_container_width=True)
 
     with col2:
         st.markdown("#### 🏆 최다 지출 내역 Top 10")
-        top_expenses = df.sort_values('amount', ascending=False)[['date', 'item', 'category', 'amount']].head(10)
-        top_expenses['date'] = top_expenses['date'].dt.strftime('%Y-%m-%d')
+        top_expenses = get_top_expenses(selected_month, spender_filter, limit=10)
         st.dataframe(top_expenses, column_config={"amount": st.column_config.NumberColumn("금액", format="%d원")}, hide_index=True, use_container_width=True)
 
 
@@ -306,20 +419,47 @@ with tab3:
 
     @fragment
     def expense_editor_section():
-        current_df = st.session_state['dashboard_data']
         latest_categories = get_categories()
-        current_mapping = get_category_mapping()
+        current_dim = get_category_dim()
 
-        col_filter, _ = st.columns([1, 3])
+        col_filter, col_sort, col_search = st.columns([1, 1, 2])
         with col_filter:
             selected_editor_cat = st.selectbox("🏷️ 카테고리로 좁혀보기", ["전체보기"] + latest_categories, key="editor_cat_filter")
-
-        if selected_editor_cat != "전체보기":
-            display_df = current_df[current_df['category'] == selected_editor_cat].copy()
-        else:
-            display_df = current_df.copy()
-
-        edited_df = st.data_editor(
+        with col_sort:
+            sort_label = st.selectbox("↕️ 정렬", list(EDITOR_SORTS), key="editor_sort")
+        with col_search:
+            search = st.text_input("🔎 내역 검색", key="editor_search", placeholder="예: 스타벅스").strip()
+
+        # 조회 조건이 바뀌면 첫 페이지부터 다시
+        sig = (selected_month, spender_filter, None if selected_editor_cat == "전체보기" else selected_editor_cat, search or None, sort_label)
+        pager = st.session_state.get('editor_pager')
+        if pager is None or pager['sig'] != sig:
+            pager = {'sig': sig, 'cursors': [None], 'nonce': (pager or {}).get('nonce', 0) + 1, 'total': count_expenses(*sig[:4])}
+            pager.update(zip(('page', 'next_cursor'), fetch_editor_page(sig, None)))
+            pager.update(applied={}, deleted=set())
+            st.session_state['editor_pager'] = pager
+
+        page_no = len(pager['cursors'])
+        n_pages = max(-(-pager['total'] // EDITOR_PAGE_SIZE), 1)
+        col_prev, col_info, col_next = st.columns([1, 3, 1])
+        go_prev = col_prev.button("◀ 이전", disabled=page_no == 1, use_container_width=True, key="editor_prev")
+        go_next = col_next.button("다음 ▶", disabled=pager['next_cursor'] is None, use_container_width=True, key="editor_next")
+        if (go_prev and page_no > 1) or (go_next and pager['next_cursor'] is not None):
+            if go_next:
+                pager['cursors'].append(pager['next_cursor'])
+            else:
+                pager['cursors'].pop()
+            pager['page'], pager['next_cursor'] = fetch_editor_page(sig, pager['cursors'][-1])
+            pager.update(nonce=pager['nonce'] + 1, applied={}, deleted=set())
+            page_no = len(pager['cursors'])
+        col_info.caption(f"{page_no} / {n_pages} 페이지 · 총 {pager['total']:,}건")
+
+        # 편집기에 넘긴 페이지 프레임은 페이지를 옮길 때까지 고정 → 행 번호를 id로 되돌릴 때 어긋나지 않음
+        display_df = pager['page']
+        display_df['소비성향'] = current_dim.type_of(display_df['category'])
+        editor_key = f"editor_page_{pager['nonce']}"
+
+        st.data_editor(
             display_df,
             column_config={
                 "id": None,
@@ -331,42 +471,57 @@ with tab3:
             },
             hide_index=True,
             num_rows="dynamic",
-            key="editor_fragment",
+            key=editor_key,
             use_container_width=True
         )
 
-        editor_state = st.session_state.get("editor_fragment")
+        # 편집 상태는 누적값이므로 아직 반영하지 않은 (행, 열) 변경·삭제만 DB에 씀
+        editor_state = st.session_state.get(editor_key)
         if editor_state:
             updates = editor_state.get("edited_rows", {})
             deletes = editor_state.get("deleted_rows", [])
-            has_changes = False
-
-            if updates:
-                for idx, changes in updates.items():
-                    idx = int(idx)
-                    real_id = display_df.iloc[idx]['id']
-                    
-                    for col, val in changes.items():
-                        if col == 'date': val = str(val).split('T')[0]
-                        update_expense(real_id, col, val)
-                        st.session_state['dashboard_data'].loc[st.session_state['dashboard_data']['id'] == real_id, col] = val
-                        
-                        if col == 'category':
-                            new_type = current_mapping.get(val, "미분류")
-                            st.session_state['dashboard_data'].loc[st.session_state['dashboard_data']['id'] == real_id, '소비성향'] = new_type
-
-                    has_changes = True
-
-            if deletes:
-                for idx in sorted(deletes, reverse=True):
-                    real_id = display_df.iloc[idx]['id']
-                    delete_expense(real_id)
-                    st.session_state['dashboard_data'] = st.session_state['dashboard_data'][st.session_state['dashboard_data']['id'] != real_id]
-                
-                st.session_state['dashboard_data'].reset_index(drop=True, inplace=True)
-                has_changes = True
-
-            if has_changes:
-                st.toast("✅ 저장되었습니다! (상단 차트 갱신은 F5)")
+            view = st.session_state['dashboard_view']
+            deltas = []
+
+            def snapshot(real_id):
+                session_df = view.frame()
+                row = session_df[session_df['id'] == real_id]
+                row = row.iloc[0] if not row.empty else display_df[display_df['id'] == real_id].iloc[0]
+                return {'date': row['date'], 'category': row['category'], 'amount': row['amount']}
+
+            for idx, changes in updates.items():
+                idx = int(idx)
+                real_id = display_df.iloc[idx]['id']
+                pending = {}
+                for col, val in changes.items():
+                    if col == 'date': val = str(val).split('T')[0]
+                    if pager['applied'].get((idx, col)) != val:
+                        pending[col] = val
+                if not pending:
+                    continue
+
+                old = snapshot(real_id)
+                for col, val in pending.items():
+                    if update_expense(real_id, col, val):
+                        view.edit(real_id, col, pd.to_datetime(val) if col == 'date' else val)
+                    pager['applied'][(idx, col)] = val
+                deltas.append({'id': real_id, 'old': old, 'new': snapshot(real_id)})
+
+            for idx in deletes:
+                if idx in pager['deleted']:
+                    continue
+                real_id = display_df.iloc[idx]['id']
+                deltas.append({'id': real_id, 'old': snapshot(real_id), 'new': None})
+                delete_expense(real_id)
+                view.delete(real_id)
+                pager['deleted'].add(idx)
+
+            if deltas:
+                # 미리 읽어 둔 다음 페이지는 수정 전 내용일 수 있으므로 버림
+                st.session_state.pop('editor_prefetch', None)
+                apply_edit_deltas(deltas)
+                # 상단 지표·차트까지 다시 그리도록 앱 전체 재실행 (집계는 변경분만 반영된 상태)
+                st.session_state['editor_toast'] = f"✅ {len(deltas)}건 저장되었습니다! 상단 지표와 차트에도 반영했습니다."
+                st.rerun()
                 
-    expense_editor_section()
\ No newline at end of file
+    expense_editor_section()
@@ -5,8 +5,9 @@ import os
 from datetime import date
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from database import load_data, get_available_months, get_category_mapping, get_budgets, get_setting
+from database import load_data, get_available_months, get_category_dim, get_budgets, get_setting, get_cube
 from config import TARGET_DATE_YEAR, TARGET_DATE_MONTH, TARGET_EQUITY, VARIABLE_BUDGET_LIMIT, MONTHLY_SAVING_TARGET
+from core.categories import CategoryDim
 
 st.set_page_config(page_title="Claude Export", page_icon="📤", layout="wide")
 
@@ -39,7 +40,7 @@ def _anonymize(amount: int, total: int, label: str, anonymize: bool) -> str:
 def build_markdown(
     month_str: str,
     df: pd.DataFrame,
-    category_mapping: dict,
+    category_dim: CategoryDim,
     sections: dict,
     anonymize: bool = False,
 ) -> str:
@@ -60,7 +61,7 @@ def build_markdown(
     today_str = date.today().strftime("%Y-%m-%d")
 
     df = df.copy()
-    df["소비성향"] = df["category"].map(lambda x: category_mapping.get(x, "미분류"))
+    df["소비성향"] = category_dim.type_of(df["category"])
     total = int(df["amount"].sum())
 
     def pct(val):
@@ -203,18 +204,17 @@ with col_sel:
 
 # ── 데이터 로드 ──
 df = load_data(selected_month)
-category_mapping = get_category_mapping()
+category_dim = get_category_dim()
 
 if df.empty:
     st.warning(f"⚠️ {selected_month}에 해당하는 지출 내역이 없습니다.")
     st.stop()
 
 # ── 요약 지표 ──
-df_preview = df.copy()
-df_preview["소비성향"] = df_preview["category"].map(lambda x: category_mapping.get(x, "미분류"))
-total = int(df_preview["amount"].sum())
-needs = int(df_preview[df_preview["소비성향"] == "필수소비 (Needs)"]["amount"].sum())
-wants = int(df_preview[df_preview["소비성향"] == "선택소비 (Wants)"]["amount"].sum())
+type_totals = get_cube().rollup_types(category_dim.mapping, month=selected_month)
+total = sum(type_totals.values())
+needs = type_totals.get("필수소비 (Needs)", 0)
+wants = type_totals.get("선택소비 (Wants)", 0)
 
 st.markdown(f"### 📊 {selected_month} 요약")
 c1, c2, c3, c4 = st.columns(4)
@@ -264,7 +264,7 @@ sections = {
 st.divider()
 
 # ── 마크다운 생성 및 미리보기 ──
-md_content = build_markdown(selected_month, df, category_mapping, sections, anonymize)
+md_content = build_markdown(selected_month, df, category_dim, sections, anonymize)
 
 with st.expander("👀 마크다운 미리보기", expanded=False):
     st.code(md_content, language="markdown")
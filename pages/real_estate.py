@@ -1,4 +1,5 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import requests
 import xml.etree.ElementTree as ET
@@ -6,11 +7,12 @@ from datetime import datetime, date
 from dateutil.relativedelta import relativedelta
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from database import get_connection, load_data, get_available_months, get_budgets
+from database import get_connection, get_available_months, get_budgets
 import plotly.graph_objects as go
-from core.finance import calculate_fv as _fv, calculate_asset_fv as _afv, calculate_max_loan, opportunity_cost as _opp_cost, simulate_scenario_a, simulate_scenario_b, calc_education_opportunity_cost
-from core.real_estate import project_price
-from components.charts import make_radar_chart, make_gap_chart
+from core.finance import calculate_asset_fv as _afv, calculate_max_loan, equity_projection_frame, opportunity_cost as _opp_cost, project_equity, simulate_goal_probability, simulate_scenario_a, simulate_scenario_b, calc_education_opportunity_cost
+from core.real_estate import project_price_array
+from components.charts import make_radar_chart, make_gap_chart, make_sensitivity_heatmap
+from components.sensitivity import SENS_RETURNS, SENS_SAVINGS, sensitivity_table
 from components.formatters import format_korean
 
 # Import 상수 
@@ -21,7 +23,7 @@ from config import (
     TARGET_DATE_YEAR, TARGET_DATE_MONTH, MORTGAGE_RATE, MORTGAGE_YEARS,
     DSR_LIMIT, AREA_M2, PYEONG
 )
-from database import get_connection, load_data, get_available_months, get_budgets, get_setting
+from database import get_connection, get_available_months, get_budgets, get_setting, get_cube
 
 def _s(key, default):
     return type(default)(get_setting(key) or default)
@@ -40,6 +42,13 @@ TARGET_DATE_YEAR        = _s("goal_date_year",        TARGET_DATE_YEAR)
 TARGET_DATE_MONTH       = _s("goal_date_month",       TARGET_DATE_MONTH)
 MORTGAGE_RATE           = _s("mortgage_rate",         0.04)
 MORTGAGE_YEARS          = _s("mortgage_years",        30)
+ANNUAL_RETURN_RATE      = _s("annual_return_rate",    0.06)
+
+# ── 목표 달성 확률 (몬테카를로) 가정 ──────────────────────────
+RETURN_VOLATILITY  = 0.12   # 투자자산 연 수익률 표준편차
+HOUSE_PRICE_GROWTH = 0.03   # 목표 주택 연 상승률 — 목표 자기자본도 같은 비율로 커짐
+HOUSE_PRICE_VOL    = 0.05
+SAVING_HISTORY     = 12     # 저축액 변동성 표본으로 쓸 최근 개월 수
 
 # ── 입지 스코어카드 데이터 ────────────────────────────────────
 CANDIDATE_AREAS = {
@@ -226,12 +235,7 @@ def calc_savings_speed(manual_saving: int = None) -> dict:
 
     else:
         # 모드 3: DB 실지출 역산 (기존)
-        months = get_available_months()[:3]
-        savings = []
-        for m in months:
-            df = load_data(m)
-            if not df.empty:
-                savings.append(MONTHLY_INCOME - int(df["amount"].sum()))
+        savings = monthly_savings_history()[:3]
         if savings:
             avg = int(sum(savings) / len(savings))
         else:
@@ -240,12 +244,46 @@ def calc_savings_speed(manual_saving: int = None) -> dict:
 
     months_left     = months_until(TARGET_DATE_YEAR, TARGET_DATE_MONTH)
     expected_accum  = avg * months_left
-    expected_equity = (CURRENT_INVESTMENT + CURRENT_JEONSE_DEPOSIT
-                       + CURRENT_SAVINGS_DEPOSIT + expected_accum)
-    prob = min(expected_equity / TARGET_EQUITY * 100, 100.0)
+    # 몬테카를로와 같은 모델(투자자산 월복리 + 월말 적립)의 평균 수익률 경로 → 시뮬레이션 분포의 기댓값
+    expected_equity = float(project_equity(
+        avg, ANNUAL_RETURN_RATE, months_left, CURRENT_INVESTMENT,
+        CURRENT_JEONSE_DEPOSIT + CURRENT_SAVINGS_DEPOSIT,
+    )[-1])
+    mc = goal_probability(avg, months_left)
     return dict(avg_saving=avg, months_left=months_left,
                 expected_accum=expected_accum, expected_equity=expected_equity,
-                prob=prob, fallback_used=fallback_used)
+                prob=mc["prob"], prob_ci=(mc["ci_low"], mc["ci_high"]), mc=mc,
+                fallback_used=fallback_used)
+
+
+def monthly_savings_history() -> list[int]:
+    """최근 SAVING_HISTORY개월 (소득 - 지출) 실적, 최신 달부터. 월 합계는 집계 큐브에서."""
+    cube = get_cube()
+    return [MONTHLY_INCOME - cube.sum(month=m) for m in get_available_months()[:SAVING_HISTORY]]
+
+
+def goal_probability(avg_saving: int, months_left: int) -> dict:
+    """
+    월 평균 저축 avg_saving을 유지할 때 목표 시점 목표 자기자본 달성 확률 (몬테카를로 10만 경로).
+    저축액은 실적 달들의 평균 대비 편차를 avg_saving에 더한 표본에서 매월 복원추출.
+    """
+    history = monthly_savings_history()
+    if len(history) >= 2:
+        mean = sum(history) / len(history)
+        samples = tuple(avg_saving + h - mean for h in history)
+    else:
+        samples = (avg_saving,)
+    return _goal_probability(samples, months_left, CURRENT_INVESTMENT,
+                             CURRENT_JEONSE_DEPOSIT + CURRENT_SAVINGS_DEPOSIT, TARGET_EQUITY)
+
+
+@st.cache_data(show_spinner=False)
+def _goal_probability(samples: tuple, months_left: int, investment: int, fixed: int, target: int) -> dict:
+    return simulate_goal_probability(
+        target, months_left, samples, investment, fixed,
+        r_annual=ANNUAL_RETURN_RATE, r_vol=RETURN_VOLATILITY,
+        price_growth=HOUSE_PRICE_GROWTH, price_vol=HOUSE_PRICE_VOL,
+    )
 
 
 def calc_mortgage(price, equity, rate, years) -> dict:
@@ -569,13 +607,18 @@ with tab1:
         prob_delta_color = "inverse" if sp["prob"] < 80 else "normal"
         c3.metric("🎯 목표 달성 확률",
                   f"{sp['prob']:.1f}%",
-                  delta_color=prob_delta_color)
+                  delta_color=prob_delta_color,
+                  help=f"몬테카를로 {sp['mc']['n_paths']:,}개 경로: 연 수익률 {ANNUAL_RETURN_RATE:.0%}±{RETURN_VOLATILITY:.0%}, "
+                       f"최근 실적 기반 저축 변동, 목표 주택 연 {HOUSE_PRICE_GROWTH:.0%}±{HOUSE_PRICE_VOL:.0%} 상승 가정")
+        st.caption(f"달성 확률 95% 신뢰구간 {sp['prob_ci'][0]:.1f}~{sp['prob_ci'][1]:.1f}% · "
+                   f"만기 자기자본 분포 (10% / 50% / 90%): "
+                   f"{sp['mc']['p10']/1e8:.2f}억 / {sp['mc']['p50']/1e8:.2f}억 / {sp['mc']['p90']/1e8:.2f}억")
 
     st.progress(min(sp["prob"] / 100, 1.0))
 
     if sp["prob"] < 80:
         st.warning("🚨 현재 저축 속도로는 2029년 2월까지 목표 자기자본 5억 달성이 어렵습니다.")
-    elif sp["prob"] >= 100:
+    else:
         st.success("✅ 현재 속도를 유지하면 목표 달성 가능합니다!")
 
     st.markdown("#### 📊 저축 시나리오 비교")
@@ -588,7 +631,7 @@ with tab1:
         accum  = saving * sp["months_left"]
         equity = CURRENT_INVESTMENT + CURRENT_JEONSE_DEPOSIT + \
                  CURRENT_SAVINGS_DEPOSIT + accum
-        prob   = min(equity / TARGET_EQUITY * 100, 100.0)
+        prob   = goal_probability(saving, sp["months_left"])["prob"]
         short  = max(TARGET_EQUITY - equity, 0)
         scenarios.append({"시나리오": label,
                            "월 저축": f"{saving:,}원",
@@ -597,6 +640,26 @@ with tab1:
                            "부족액": f"{short/1e4:.0f}만원"})
     st.dataframe(pd.DataFrame(scenarios), use_container_width=True, hide_index=True)
 
+    with st.expander("🔬 민감도 분석 — 월 저축 × 수익률 × 기간"):
+        ml = sp["months_left"]
+        horizons = tuple(sorted({*range(12, ml + 37, 12), ml}))
+        horizon = st.select_slider(
+            "평가 시점", options=horizons, value=ml, key="sens_horizon",
+            format_func=lambda m: f"+{m}개월" + (" (목표 시점)" if m == ml else ""),
+        )
+        grid = sensitivity_table(CURRENT_INVESTMENT, CURRENT_JEONSE_DEPOSIT + CURRENT_SAVINGS_DEPOSIT,
+                                 horizons)[:, :, horizons.index(horizon)]
+        marker = (sp["avg_saving"], ANNUAL_RETURN_RATE)
+        hc1, hc2 = st.columns(2)
+        hc1.plotly_chart(make_sensitivity_heatmap(
+            grid / 1e8, SENS_SAVINGS, SENS_RETURNS, "예상 자기자본", "Blues", marker,
+        ), use_container_width=True)
+        hc2.plotly_chart(make_sensitivity_heatmap(
+            np.maximum(TARGET_EQUITY - grid, 0) / 1e8, SENS_SAVINGS, SENS_RETURNS,
+            f"목표({TARGET_EQUITY/1e8:.1f}억) 대비 부족액", "Reds", marker,
+        ), use_container_width=True)
+        st.caption("수익률 복리 반영 결정론적 추정입니다 (위 달성 확률은 수익률·저축 변동을 반영한 몬테카를로).")
+
     # ── 관심 단지 매수 가능성 ──────────────────────────────────
     # ★ Tab1은 폴백 데이터 기준 (API 호출 없음 — Tab3에서 실시간 조회)
     _active_wl    = get_watch_list(active_only=True)
@@ -946,11 +1009,14 @@ with tab5:
     }
     st.caption(f"교통 · 생활편의 · 자산성장 각 {remaining_w:.1f}% 자동 배분")
 
-    # 가중 합산 점수 계산
+    # 가중 합산 점수 계산 (예상가는 후보 지역 배열로 한 번에)
+    prices_2029 = project_price_array(
+        [d["price_2026"] for d in CANDIDATE_AREAS.values()],
+        [d["growth_rate"] for d in CANDIDATE_AREAS.values()],
+    )
     rows = []
-    for area, data in CANDIDATE_AREAS.items():
+    for (area, data), price_2029 in zip(CANDIDATE_AREAS.items(), prices_2029):
         score = sum(data[col] * weights[col] for col in RADAR_COLS)
-        price_2029 = project_price(data["price_2026"], data["growth_rate"])
         rows.append({
             "지역":        area,
             "교육":        data["교육"],
@@ -960,7 +1026,7 @@ with tab5:
             "종합점수":    round(score, 1),
             "price_2026":  data["price_2026"],
             "growth_rate": data["growth_rate"],
-            "2029 예상가(억)": round(price_2029, 2),
+            "2029 예상가(억)": round(float(price_2029), 2),
         })
 
     score_df = pd.DataFrame(rows).sort_values("종합점수", ascending=False).reset_index(drop=True)
@@ -1004,26 +1070,21 @@ with tab6:
     _EQUITY_FIXED  = 25_000_000 + 260_000_000  # 청약 + 전세보증금 회수
 
 
-    gap_rows = []
-    for yr in _GAP_YEARS:
-        elapsed = yr - 2026
-        ui_price = _UI_PRICE_0 * (1 + _UI_GROWTH) ** elapsed
-        sb_price = _SB_PRICE_0 * (1 + _SB_GROWTH) ** elapsed
-        n_months_gap = max(0, (yr - 2026) * 12)
-        equity = (
-            _fv(_EQUITY_PMT, _EQUITY_RATE, n_months_gap)
-            + _afv(_EQUITY_PV, _EQUITY_RATE, n_months_gap)
-            + _EQUITY_FIXED
-        ) / 1e8
-        gap_rows.append({
-            "연도":              yr,
-            "의정부 신일유토빌": round(ui_price, 2),
-            "성북구 길음뉴타운": round(sb_price, 2),
-            "내 자기자본":       round(equity, 2),
-            "Gap(성북-의정부)":  round(sb_price - ui_price, 2),
-        })
-
-    gap_df = pd.DataFrame(gap_rows)
+    # 연도별 자기자본은 월별 추이 엔진에서 12개월 간격으로, 가격은 연도 배열로 한 번에 계산
+    equity_df = equity_projection_frame(
+        date(_GAP_YEARS[0], 1, 1), (_GAP_YEARS[-1] - _GAP_YEARS[0]) * 12,
+        _EQUITY_PMT, _EQUITY_RATE, _EQUITY_PV, _EQUITY_FIXED,
+    )
+    elapsed  = np.array(_GAP_YEARS) - _GAP_YEARS[0]
+    ui_price = _UI_PRICE_0 * (1 + _UI_GROWTH) ** elapsed
+    sb_price = _SB_PRICE_0 * (1 + _SB_GROWTH) ** elapsed
+    gap_df = pd.DataFrame({
+        "연도":              _GAP_YEARS,
+        "의정부 신일유토빌": ui_price.round(2),
+        "성북구 길음뉴타운": sb_price.round(2),
+        "내 자기자본":       (equity_df["총 자기자본"].to_numpy() / 1e8).round(2),
+        "Gap(성북-의정부)":  (sb_price - ui_price).round(2),
+    })
 
     row_2029 = gap_df[gap_df["연도"] == 2029].iloc[0] if not gap_df[gap_df["연도"] == 2029].empty else None
     gap_2029 = row_2029["Gap(성북-의정부)"] if row_2029 is not None else 0.0
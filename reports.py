@@ -0,0 +1,321 @@
+# reports.py
+"""
+AI 리포트(예산 진단·월간 재무 서사) 생성 및 캐시.
+
+- 프롬프트는 (page, month, 데이터 지문, model) 키로 ai_reports 테이블에 저장되고,
+  같은 달 데이터가 바뀌지 않았다면 다시 볼 때 모델을 부르지 않고 바로 보여줍니다.
+- 지문 = 실제로 모델에 보낼 프롬프트 전체의 해시. 지출·예산·소득·목표 설정 중 하나라도 바뀌면 새로 생성.
+  마감된 달은 '남은 기간'을 그 달 말 기준(month_as_of)으로 고정해, 달력이 넘어가도 지문이 바뀌지 않습니다.
+- 마감된 달(이번 달 이전)은 백그라운드 스레드가 미리 생성해 둡니다 (start_pregeneration).
+"""
+from __future__ import annotations
+
+import threading
+from datetime import date
+
+import pandas as pd
+
+import llm
+from config import (
+    GEMINI_MODEL_VER, MONTHLY_SAVING_TARGET, TARGET_DATE_MONTH, TARGET_DATE_YEAR,
+    TARGET_EQUITY, VARIABLE_BUDGET_LIMIT,
+)
+from core import metrics
+from core.finance import calculate_asset_fv, calculate_fv
+from core.prompts import Prompt, prefix_hash
+from database import (
+    get_ai_report, get_available_months, get_budgets, get_fixed_expenses, get_monthly_income,
+    get_setting, load_data, save_ai_report,
+)
+
+PREGENERATE_MONTHS = 3   # 마감된 달 중 최근 몇 개월까지 미리 생성할지
+
+
+def _s(key, default):
+    return type(default)(get_setting(key) or default)
+
+
+# ── 예산 진단 (pages/budget.py 탭3) ─────────────────────────────
+
+def build_budget_prompt(month: str, expenses_df: pd.DataFrame, budgets_df: pd.DataFrame) -> Prompt:
+    """정적 접두부(역할·프로필·요청 사항)는 캐시되고, 이달 수치만 매번 전송."""
+    spent_by_cat = expenses_df.groupby("category")["amount"].sum()
+    total_spent = int(expenses_df["amount"].sum())
+    excess = total_spent - VARIABLE_BUDGET_LIMIT
+
+    display_df = budgets_df.copy()
+    display_df["spent"] = display_df["category"].map(spent_by_cat).fillna(0).astype(int)
+    display_df["remaining"] = display_df["amount"] - display_df["spent"]
+    display_df["percent"] = (display_df["spent"] / display_df["amount"].replace(0, 1) * 100).round(1)
+    display_df = display_df.sort_values("category").reset_index(drop=True)
+    over_budget_df = display_df[display_df["remaining"] < 0].sort_values("remaining")
+
+    budget_summary = "\n".join(
+        f"- {r['category']}: 예산 {r['amount']:,}원 / "
+        f"지출 {r['spent']:,}원 ({r['percent']}%)"
+        for _, r in display_df.iterrows()
+    )
+    over_summary = (
+        "\n".join(
+            f"- {r['category']}: {abs(r['remaining']):,}원 초과"
+            for _, r in over_budget_df.iterrows()
+        )
+        if not over_budget_df.empty
+        else "없음"
+    )
+    return Prompt(
+        system=f"""당신은 한국의 맞벌이 가정 재무 코치입니다. 사용자가 보내는 이달 예산 현황을 바탕으로 한국어로 진단해 주세요.
+
+## 가구 프로필
+- 3인 가족 (38세/35세 부부, 1세 자녀)
+- 2029년 2월 목표: 서울·경기 상급지 84㎡ 아파트 자기자본 5억 확보 후 매수
+- 월 변동지출 목표: {VARIABLE_BUDGET_LIMIT:,}원
+
+## 요청 사항
+1. 초과 원인을 2~3가지로 분석하세요.
+2. 각 초과 카테고리에 대해 구체적이고 즉시 실행 가능한 절약 팁을 제안하세요.
+3. 1세 영아 육아 가정이라는 특수성을 고려하여 현실적인 조언을 해주세요.
+4. '이달의 재무 점수'를 100점 만점으로 매기고 이유를 설명하세요.
+""",
+        user=f"""- 이번 달 실지출: {total_spent:,}원
+- 초과액: {excess:,}원
+
+## {month} 카테고리별 예산 현황
+{budget_summary}
+
+## 초과 카테고리
+{over_summary}
+""",
+    )
+
+
+# ── 월간 재무 서사 (pages/monthly_review.py 섹션 B) ──────────────
+
+_REVIEW_SYSTEM = """당신은 대한민국 맞벌이 가구를 위한 가계 재정 코치입니다.
+사용자가 보내는 가구 프로필과 이달 실적을 바탕으로 해당 월의 재무 리뷰를 작성하세요.
+
+[작성 지침]
+1. ## 이달의 재무 서사
+   3~5문장. 숫자를 해석해 이달의 재정 흐름을 서술하세요.
+   - 잘한 점과 아쉬운 점을 균형 있게 언급하세요.
+   - 목표 달성 속도(충분 / 주의 / 위험)를 판단해 포함하세요.
+   - 추상적 표현 금지. 숫자 근거를 제시하세요.
+
+2. ## 다음 달 액션 아이템
+   구체적 행동 3가지. 각 항목은 한 문장으로.
+   - 반드시 구체적 수치나 행동을 포함하세요 ("아끼세요" 수준 금지).
+   - 예: "외식/음료 예산을 X만원으로 고정하고 배달앱 주 2회로 제한"
+
+마크다운 형식으로 작성하세요."""
+
+
+def month_as_of(month: str) -> date:
+    """
+    리뷰 수치의 기준일. 마감된 달은 다음 달 1일(그 달 말 기준)로 고정하고, 이번 달·미래 달은 오늘.
+    기준일이 고정돼야 마감된 달 프롬프트(=지문)가 달력과 무관해져 사전 생성 캐시가 계속 적중합니다.
+    """
+    today = date.today()
+    if month >= today.strftime("%Y-%m"):
+        return today
+    y, m = map(int, month.split("-"))
+    return date(y + m // 12, m % 12 + 1, 1)
+
+
+def months_remaining(as_of: date | None = None) -> int:
+    today = as_of or date.today()
+    y = _s("goal_date_year",  TARGET_DATE_YEAR)
+    m = _s("goal_date_month", TARGET_DATE_MONTH)
+    target = date(y, m, 1)
+    return max(0, (target.year - today.year) * 12 + (target.month - today.month))
+
+
+def anonymize_amount(amount: int, total: int) -> str:
+    """금액 → 비율/등급. Gemini 전송용 (export_to_claude._anonymize와 동일 로직)."""
+    if total <= 0:
+        return "0% (매우낮음)"
+    pct = amount / total * 100
+    if pct >= 30:   grade = "매우높음"
+    elif pct >= 20: grade = "높음"
+    elif pct >= 10: grade = "보통"
+    elif pct >= 5:  grade = "낮음"
+    else:           grade = "매우낮음"
+    return f"총지출의 {pct:.0f}% ({grade})"
+
+
+def review_figures(df: pd.DataFrame, fixed_df: pd.DataFrame, monthly_income: int,
+                   as_of: date | None = None) -> dict:
+    """월간 리뷰 화면과 프롬프트가 함께 쓰는 저축·자기자본 수치. as_of: 남은 기간 기준일 (month_as_of)."""
+    total_expense = int(df["amount"].sum())
+
+    # 저축성 지출 분리
+    if not fixed_df.empty and "type" in fixed_df.columns:
+        fixed_expense_sum = int(fixed_df[fixed_df["type"] != "저축성지출"]["amount"].sum())
+        savings_type_sum  = int(fixed_df[fixed_df["type"] == "저축성지출"]["amount"].sum())
+    else:
+        fixed_expense_sum = int(fixed_df["amount"].sum()) if not fixed_df.empty else 0
+        savings_type_sum  = 0
+
+    # 실저축 = 소득 - 변동지출 - 순고정지출 - 저축성지출
+    actual_saving = monthly_income - total_expense - fixed_expense_sum - savings_type_sum
+    saving_target = _s("monthly_saving_target", MONTHLY_SAVING_TARGET)
+    saving_delta  = actual_saving - saving_target
+
+    # 현재 자기자본: 현재 투자자산(수익률 반영) + 전세보증금 회수예정 + 청약저축
+    eq_investment   = _s("asset_investment",      50_000_000)
+    eq_jeonse       = _s("asset_jeonse_recovery", 260_000_000)
+    eq_subscription = _s("asset_subscription",    25_000_000)
+    goal_equity     = _s("goal_equity",           TARGET_EQUITY)
+    annual_rate     = _s("annual_return_rate",    0.06)
+    months_rem      = months_remaining(as_of)
+
+    current_equity_est = eq_investment + eq_jeonse + eq_subscription
+    projected_equity = (
+        calculate_fv(saving_target, annual_rate, months_rem)
+        + calculate_asset_fv(eq_investment, annual_rate, months_rem)
+        + eq_jeonse
+        + eq_subscription
+    )
+    return {
+        "total_expense":      total_expense,
+        "fixed_expense_sum":  fixed_expense_sum,
+        "savings_type_sum":   savings_type_sum,
+        "actual_saving":      actual_saving,
+        "saving_target":      saving_target,
+        "saving_delta":       saving_delta,
+        "saving_delta_pct":   saving_delta / saving_target * 100 if saving_target > 0 else 0,
+        "eq_investment":      eq_investment,
+        "eq_jeonse":          eq_jeonse,
+        "eq_subscription":    eq_subscription,
+        "goal_equity":        goal_equity,
+        "annual_rate":        annual_rate,
+        "months_rem":         months_rem,
+        "current_equity_est": current_equity_est,
+        "equity_progress":    current_equity_est / goal_equity * 100 if goal_equity > 0 else 0,
+        "projected_equity":   projected_equity,
+        "projected_progress": projected_equity / goal_equity * 100 if goal_equity > 0 else 0,
+    }
+
+
+def build_review_prompt(
+    month: str, df: pd.DataFrame, budgets_df: pd.DataFrame, monthly_income: int, figures: dict,
+) -> Prompt:
+    year, mon = month.split("-")
+    f = figures
+
+    # 가구 프로필 (_s() 동적 삽입)
+    goal_year    = _s("goal_date_year",       TARGET_DATE_YEAR)
+    goal_month_v = _s("goal_date_month",      TARGET_DATE_MONTH)
+    goal_price   = _s("goal_purchase_price",  825_000_000)
+    retire_year  = _s("goal_retirement_year", 2048)
+    saving_rate  = f["actual_saving"] / monthly_income * 100 if monthly_income > 0 else 0
+
+    # 카테고리별 익명화
+    cat_summary = df.groupby("category")["amount"].sum().sort_values(ascending=False)
+    cat_lines   = "\n".join(
+        f"  - {cat}: {anonymize_amount(int(amt), f['total_expense'])}"
+        for cat, amt in cat_summary.items()
+    )
+
+    # 예산 초과 텍스트
+    if budgets_df.empty:
+        over_text = "예산 미설정"
+    else:
+        spent_by_cat = df.groupby("category")["amount"].sum()
+        over_items = [
+            f"{row['category']}({int(spent_by_cat.get(row['category'], 0)) - int(row['amount']):,}원 초과)"
+            for _, row in budgets_df.iterrows()
+            if int(spent_by_cat.get(row["category"], 0)) > int(row["amount"])
+        ]
+        over_text = ", ".join(over_items) if over_items else "예산 초과 없음"
+
+    return Prompt(_REVIEW_SYSTEM, f"""[대상 월] {year}년 {int(mon)}월
+
+[가구 프로필]
+- 내 집 마련 목표: {goal_year}년 {goal_month_v}월, 목표 매수가 {goal_price:,}원
+- 은퇴 목표 연도: {retire_year}년
+- 월 저축 목표: {f['saving_target']:,}원
+- 목표까지 남은 기간: {f['months_rem']}개월
+
+[이달 실적]
+- 저축 실적: 목표 대비 {f['saving_delta_pct']:+.1f}% ({'달성' if f['saving_delta'] >= 0 else '미달'})
+- 저축률: {saving_rate:.1f}%
+- 자기자본 현재 달성률: {f['equity_progress']:.1f}% (목표 시점 예상: {f['projected_progress']:.1f}%)
+- 예산 초과 현황: {over_text}
+
+[카테고리별 지출 비중 (익명화)]
+{cat_lines}""")
+
+
+# ── 캐시 조회 / 생성 ────────────────────────────────────────────
+
+def fingerprint(prompt: Prompt) -> str:
+    return prefix_hash(prompt.joined())
+
+
+def cached_report(page: str, month: str, prompt: Prompt, model: str | None = None) -> dict | None:
+    """저장된 리포트 {content, created_at} 또는 None. 적중 여부를 page별 report_cache_hit로 기록."""
+    report = get_ai_report(page, month, fingerprint(prompt), model or GEMINI_MODEL_VER)
+    metrics.record(page, "report_cache_hit", 1 if report else 0)
+    return report
+
+
+def generate_report(page: str, month: str, prompt: Prompt, model: str | None = None) -> str:
+    """모델 호출 후 저장. 화면 버튼('다시 생성' 포함)과 백그라운드 사전 생성이 함께 사용."""
+    model = model or GEMINI_MODEL_VER
+    text = llm.generate(prompt.user, site=page, model=model, system=prompt.system)
+    save_ai_report(page, month, fingerprint(prompt), model, text)
+    return text
+
+
+def month_prompts(month: str) -> dict[str, Prompt]:
+    """화면을 거치지 않고 DB만으로 해당 월의 페이지별 프롬프트를 조립 (사전 생성용)."""
+    df = load_data(month)
+    if df.empty:
+        return {}
+    budgets_df = get_budgets()
+    prompts = {}
+    if not budgets_df.empty:
+        prompts["budget"] = build_budget_prompt(month, df, budgets_df)
+    income = get_monthly_income(month, _s("income_monthly", 10_000_000))
+    figures = review_figures(df, get_fixed_expenses(), income, month_as_of(month))
+    prompts["monthly_review"] = build_review_prompt(month, df, budgets_df, income, figures)
+    return prompts
+
+
+# ── 마감된 달 백그라운드 사전 생성 ───────────────────────────────
+
+_PREGEN_LOCK = threading.Lock()
+_PREGEN_THREAD: threading.Thread | None = None
+_PREGEN_TRIED: set[tuple[str, str, str]] = set()   # 실패한 조합을 페이지 로드마다 재호출하지 않도록
+
+
+def _pregenerate(months: list[str]) -> None:
+    for month in months:
+        for page, prompt in month_prompts(month).items():
+            key = (page, month, fingerprint(prompt))
+            if key in _PREGEN_TRIED or get_ai_report(page, month, key[2], GEMINI_MODEL_VER):
+                continue
+            _PREGEN_TRIED.add(key)
+            try:
+                generate_report(page, month, prompt)
+                metrics.record("report_pregen", "generated", 1)
+            except Exception:
+                metrics.record("report_pregen", "generated", 0)
+
+
+def start_pregeneration(limit: int = PREGENERATE_MONTHS) -> bool:
+    """
+    이번 달 이전의 최근 limit개월 리포트를 데몬 스레드에서 미리 생성. 프로세스당 동시에 1개만 실행.
+    LLM 설정이 없으면 아무 것도 하지 않고 False.
+    """
+    global _PREGEN_THREAD
+    if llm.configuration_error():
+        return False
+    current = date.today().strftime("%Y-%m")
+    closed = [m for m in get_available_months() if m < current][:limit]
+    with _PREGEN_LOCK:
+        if _PREGEN_THREAD is not None and _PREGEN_THREAD.is_alive():
+            return True
+        _PREGEN_THREAD = threading.Thread(target=_pregenerate, args=(closed,), daemon=True, name="report-pregen")
+        _PREGEN_THREAD.start()
+    return True
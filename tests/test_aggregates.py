@@ -0,0 +1,138 @@
+# tests/test_aggregates.py
+"""
+core.aggregates 검사: top_k_per_group이 그룹별 정렬·join(groupby.apply)과 같은 라벨을 내는지,
+lttb_indices 다운샘플링이 구간마다 한 점씩 고르고 급등·급락을 남기는지,
+patch_period_top_items로 바뀐 기간만 다시 집계한 결과가 전체 재집계와 같은지.
+
+    uv run python -m pytest -q tests/test_aggregates.py
+    uv run python tests/test_aggregates.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.aggregates import (
+    item_amount_labels, lttb_indices, patch_period_top_items, period_top_items, top_k_per_group,
+)
+
+
+def random_expenses(rng, n: int, days: int = 60) -> pd.DataFrame:
+    return pd.DataFrame({
+        "date":   pd.Timestamp("2026-08-01") + pd.to_timedelta(rng.integers(0, days, n), unit="D"),
+        "item":   [f"품목{i}" * int(rng.integers(1, 4)) for i in rng.integers(0, 50, n)],
+        "amount": rng.integers(1, 20, n) * 1000,               # 같은 금액이 자주 나오도록
+    })
+
+
+def reference_top_k(df: pd.DataFrame, by: str, value: str, label, k: int, sep: str = " / ") -> pd.Series:
+    """그룹마다 안정 정렬 후 상위 k개 라벨을 join (원래 groupby.apply 방식)."""
+    out = {}
+    for key, group in df.groupby(by):
+        top = group.sort_values(value, ascending=False, kind="stable").head(k)
+        out[key] = sep.join(label(top))
+    return pd.Series(out, dtype=object)
+
+
+def test_top_k_matches_groupby_apply():
+    rng = np.random.default_rng(0)
+    for n in (1, 5, 300, 3000):
+        df = random_expenses(rng, n)
+        for k in (1, 3, 5):
+            got = top_k_per_group(df, "date", "amount", item_amount_labels, k=k)
+            want = reference_top_k(df, "date", "amount", item_amount_labels, k)
+            assert got.to_dict() == want.to_dict(), (n, k)
+            assert got.index.is_monotonic_increasing
+
+
+def test_top_k_ties_keep_original_order_and_empty_input():
+    df = pd.DataFrame({"g": ["a", "a", "a", "b"], "v": [5, 5, 9, 1], "item": ["x", "y", "z", "w"]})
+    got = top_k_per_group(df, "g", "v", lambda top: top["item"], k=2)
+    assert got.to_dict() == {"a": "z / x", "b": "w"}
+    assert top_k_per_group(df.iloc[:0], "g", "v", lambda top: top["item"]).empty
+
+
+def reference_lttb(x, y, n_out: int) -> list[int]:
+    """같은 구간 경계를 쓰는 점별 루프 LTTB."""
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    picked, a = [0], 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = sum(x[hi:next_hi]) / (next_hi - hi)
+        avg_y = sum(y[hi:next_hi]) / (next_hi - hi)
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        picked.append(best)
+        a = best
+    return picked + [n - 1]
+
+
+def test_lttb_matches_pointwise_loop():
+    rng = np.random.default_rng(1)
+    for n, n_out in ((10, 3), (100, 17), (1000, 400), (5000, 400)):
+        x = np.sort(rng.uniform(0, 1000, n))
+        y = rng.integers(0, 100, n) * 1000.0
+        got = lttb_indices(x, y, n_out)
+        assert got.tolist() == reference_lttb(x.tolist(), y.tolist(), n_out), (n, n_out)
+        assert len(got) == n_out and got[0] == 0 and got[-1] == n - 1
+        assert (np.diff(got) > 0).all()
+
+
+def test_lttb_keeps_spikes_and_passes_small_inputs_through():
+    n = 3000
+    x = np.arange(n, dtype=float)
+    y = np.full(n, 10_000.0)
+    spikes = [400, 1777, 2500]
+    y[spikes] = [900_000.0, 0.0, 1_500_000.0]                 # 급등 · 급락
+    got = lttb_indices(x, y, 100)
+    assert set(spikes) <= set(got.tolist())
+    for n_out in (n, n + 5, 2, 0):                            # 줄일 필요 없거나 3점 미만 요청
+        np.testing.assert_array_equal(lttb_indices(x, y, n_out), np.arange(n))
+
+
+def test_patch_matches_full_recompute():
+    rng = np.random.default_rng(2)
+    for freq in ("D", "W", "M"):
+        df = random_expenses(rng, 400, days=120)
+        trend = period_top_items(df, freq)
+        for _ in range(30):
+            # 금액 수정 · 날짜 이동 · 삭제 — 바뀐 날짜는 이전 날짜와 새 날짜 모두
+            rows = rng.choice(df.index, int(rng.integers(1, 6)), replace=False)
+            touched = df.loc[rows, "date"].tolist()
+            action = rng.integers(3)
+            if action == 0:
+                df.loc[rows, "amount"] = rng.integers(1, 50, len(rows)) * 1000
+            elif action == 1:
+                df.loc[rows, "date"] += pd.to_timedelta(rng.integers(-20, 20, len(rows)), unit="D")
+                touched += df.loc[rows, "date"].tolist()
+            else:
+                df = df.drop(index=rows)
+            trend = patch_period_top_items(trend, df, freq, touched)
+            pd.testing.assert_frame_equal(trend, period_top_items(df, freq), check_dtype=False, obj=freq)
+
+
+def test_patch_drops_emptied_periods():
+    df = random_expenses(np.random.default_rng(3), 50, days=10)
+    trend = period_top_items(df, "D")
+    day = df["date"].iloc[0]
+    rest = df[df["date"] != day]
+    patched = patch_period_top_items(trend, rest, "D", [day])
+    assert day not in set(patched["date"])
+    pd.testing.assert_frame_equal(patched, period_top_items(rest, "D"), check_dtype=False)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
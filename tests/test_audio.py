@@ -0,0 +1,100 @@
+# tests/test_audio.py
+"""
+core.audio 전처리 검사: 앞뒤 무음 자르기(trim_silence)와 조용한 지점에서 나누기(split_chunks).
+
+    uv run python -m pytest -q tests/test_audio.py
+    uv run python tests/test_audio.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.audio import (
+    FRAME_MS, SPLIT_SEARCH_SEC, TARGET_SAMPLE_RATE,
+    decode_wav, encode_wav, prepare_audio, split_chunks, trim_silence,
+)
+
+RATE = TARGET_SAMPLE_RATE
+FRAME = RATE * FRAME_MS // 1000
+
+
+def tone(sec: float, amp: float = 0.5, freq: float = 220.0) -> np.ndarray:
+    t = np.arange(int(sec * RATE)) / RATE
+    return (amp * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def silence(sec: float) -> np.ndarray:
+    return np.zeros(int(sec * RATE), dtype=np.float32)
+
+
+def test_trim_keeps_voice_with_one_frame_margin():
+    voice = tone(1.0)
+    samples = np.concatenate([silence(0.5), voice, silence(0.7)])
+    trimmed = trim_silence(samples, RATE)
+    # 프레임 경계에 맞춰진 앞뒤 한 프레임 여유만 남음
+    assert len(voice) <= len(trimmed) <= len(voice) + 3 * FRAME
+    start = int(0.5 * RATE) - FRAME
+    np.testing.assert_array_equal(trimmed, samples[start:start + len(trimmed)])
+
+
+def test_trim_all_silent_or_too_short_is_empty():
+    assert len(trim_silence(silence(2.0), RATE)) == 0
+    assert len(trim_silence(tone(0.005), RATE)) == 0          # 한 프레임도 안 됨
+    assert len(trim_silence(np.zeros(0, dtype=np.float32), RATE)) == 0
+
+
+def test_trim_without_silence_is_unchanged():
+    voice = tone(1.0)
+    np.testing.assert_array_equal(trim_silence(voice, RATE), voice)
+
+
+def test_short_recording_is_one_chunk():
+    samples = tone(5.0)
+    chunks = split_chunks(samples, RATE, chunk_sec=10)
+    assert len(chunks) == 1 and chunks[0] is samples
+
+
+def test_split_cuts_at_quiet_gap_and_covers_everything():
+    # 8초 말 + 0.5초 쉼 + 8초 말: 10초 한도에서 쉼 구간(끝 3초 검색 범위 안)에서 잘려야 함
+    samples = np.concatenate([tone(8.0), silence(0.5), tone(8.0)])
+    chunks = split_chunks(samples, RATE, chunk_sec=10)
+    assert len(chunks) == 2
+    cut = len(chunks[0])
+    assert int(8.0 * RATE) <= cut < int(8.5 * RATE)
+    np.testing.assert_array_equal(np.concatenate(chunks), samples)
+
+
+def test_split_respects_max_length_without_gaps():
+    rng = np.random.default_rng(0)
+    samples = (rng.standard_normal(int(95 * RATE)) * 0.3).astype(np.float32)
+    chunks = split_chunks(samples, RATE, chunk_sec=10)
+    assert all(len(c) <= 10 * RATE for c in chunks)
+    # 끝 SPLIT_SEARCH_SEC 안에서만 자르므로 마지막 조각 외에는 너무 짧지 않음
+    assert all(len(c) >= (10 - SPLIT_SEARCH_SEC) * RATE for c in chunks[:-1])
+    np.testing.assert_array_equal(np.concatenate(chunks), samples)
+
+
+def test_prepare_audio_downsamples_trims_and_splits():
+    src_rate = 48_000
+    t = np.arange(int(25 * src_rate)) / src_rate
+    voice = 0.5 * np.sin(2 * np.pi * 220 * t)
+    samples = np.concatenate([np.zeros(src_rate), voice, np.zeros(src_rate)]).astype(np.float32)
+    result = prepare_audio(encode_wav(samples, src_rate), chunk_sec=10)
+    assert len(result["chunks"]) == 3
+    assert abs(result["duration_sec"] - 25) < 0.1
+    assert result["bytes_sent"] < result["original_bytes"] / 2
+    decoded = [decode_wav(c) for c in result["chunks"]]
+    assert {rate for _, rate in decoded} == {RATE}
+    assert abs(sum(len(s) for s, _ in decoded) / RATE - result["duration_sec"]) < 1e-9
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
@@ -0,0 +1,121 @@
+# tests/test_cube.py
+"""
+core.cube.LedgerCube 검사: from_frame · apply(±변경분) · sum/rollup/rollup_types가 원본 행 groupby와 같은지.
+
+    uv run python -m pytest -q tests/test_cube.py
+    uv run python tests/test_cube.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.cube import AXES, LedgerCube
+
+MONTHS = ["2026-08", "2026-09", "2026-10"]
+CATEGORIES = ["식비", "교통비", "쇼핑", None]
+SPENDERS = ["공동", "남편", "아내", None]
+TYPES = {"식비": "필수소비 (Needs)", "교통비": "필수소비 (Needs)", "쇼핑": "선택소비 (Wants)"}
+
+
+def random_frame(rng, n: int) -> pd.DataFrame:
+    amount = rng.integers(1, 100, n).astype(float) * 1000
+    amount[rng.random(n) < 0.05] = np.nan                     # NULL 금액은 0원
+    return pd.DataFrame({
+        "date":     [f"{MONTHS[m]}-{d:02d}" for m, d in zip(rng.integers(0, 3, n), rng.integers(1, 29, n))],
+        "category": [CATEGORIES[i] for i in rng.integers(0, len(CATEGORIES), n)],
+        "spender":  [SPENDERS[i] for i in rng.integers(0, len(SPENDERS), n)],
+        "amount":   amount,
+    })
+
+
+def reference(df: pd.DataFrame) -> pd.DataFrame:
+    """큐브와 같은 라벨 정리 (월 = 앞 7자, 결측 카테고리 = 미분류, 결측 지출자 = 공동)."""
+    return pd.DataFrame({
+        "month":    df["date"].astype(str).str.slice(0, 7),
+        "category": df["category"].fillna("미분류"),
+        "spender":  df["spender"].fillna("공동"),
+        "amount":   df["amount"].fillna(0).astype("int64"),
+    })
+
+
+def assert_matches(cube: LedgerCube, df: pd.DataFrame) -> None:
+    ref = reference(df)
+    assert cube.sum() == ref["amount"].sum() and cube.total_count() == len(ref)
+    for axis in AXES:
+        assert cube.rollup(axis).to_dict() == ref.groupby(axis)["amount"].sum().to_dict(), axis
+    # 한 값 · 여러 값 선택
+    for month in MONTHS:
+        sub = ref[ref["month"] == month]
+        assert cube.sum(month=month) == sub["amount"].sum()
+        assert cube.rollup("category", month=month).to_dict() == sub.groupby("category")["amount"].sum().to_dict()
+    pair = ["남편", "아내"]
+    sub = ref[ref["spender"].isin(pair) & (ref["month"] == MONTHS[-1])]
+    assert cube.sum(month=MONTHS[-1], spender=pair) == sub["amount"].sum()
+    assert cube.total_count(month=MONTHS[-1], spender=pair) == len(sub)
+
+
+def test_from_frame_matches_groupby():
+    rng = np.random.default_rng(0)
+    for n in (0, 1, 50, 2000):
+        df = random_frame(rng, n)
+        assert_matches(LedgerCube.from_frame(df), df)
+
+
+def test_incremental_apply_matches_rebuild():
+    rng = np.random.default_rng(1)
+    df = random_frame(rng, 500)
+    cube = LedgerCube.from_frame(df)
+    for _ in range(50):
+        # 삭제 · 수정(이전 -1, 새 값 +1) · 추가를 섞은 변경분
+        drop = rng.choice(df.index, 5, replace=False)
+        edit = rng.choice(df.index.difference(drop), 5, replace=False)
+        new_rows = random_frame(rng, 5)
+        edited = df.loc[edit].copy()
+        edited[["category", "amount"]] = random_frame(rng, 5)[["category", "amount"]].to_numpy()
+        old = pd.concat([df.loc[drop], df.loc[edit]])
+        new = pd.concat([edited, new_rows])
+        changes = pd.concat([old, new], ignore_index=True)
+        signs = [-1] * len(old) + [1] * len(new)
+        cube.apply(changes["date"].tolist(), changes["category"].tolist(),
+                   changes["spender"].tolist(), changes["amount"].tolist(), signs)
+        df = pd.concat([df.drop(index=np.concatenate([drop, edit])), edited, new_rows], ignore_index=True)
+        assert_matches(cube, df)
+
+
+def test_unknown_labels_and_emptied_cells():
+    cube = LedgerCube.from_frame(random_frame(np.random.default_rng(2), 20))
+    assert cube.sum(month="1999-01") == 0 and cube.rollup("category", month="1999-01").empty
+    cube.apply(["2027-01-05"], ["새 카테고리"], ["공동"], [7000])
+    assert cube.rollup("category", month="2027-01").to_dict() == {"새 카테고리": 7000}
+    cube.apply(["2027-01-05"], ["새 카테고리"], ["공동"], [7000], -1)
+    assert "새 카테고리" not in cube.rollup("category")       # 건수 0인 라벨은 빠짐
+    assert cube.rollup("month", month="2027-01").empty
+
+
+def test_rollup_types_matches_mapped_groupby():
+    df = random_frame(np.random.default_rng(3), 1000)
+    cube = LedgerCube.from_frame(df)
+    ref = reference(df)
+    ref["type"] = ref["category"].map(TYPES).fillna("미분류")
+    for month in [None] + MONTHS:
+        for spender in (None, "아내"):
+            sub = ref
+            if month:
+                sub = sub[sub["month"] == month]
+            if spender:
+                sub = sub[sub["spender"] == spender]
+            want = sub.groupby("type")["amount"].sum().to_dict()
+            assert cube.rollup_types(TYPES, month=month, spender=spender) == want, (month, spender)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
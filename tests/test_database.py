@@ -0,0 +1,310 @@
+# tests/test_database.py
+"""
+database.py 검사: 트리거가 유지하는 data_versions · expense_changes · daily_totals,
+편집기 keyset 페이지(load_expense_page), 보정 일괄 반영(apply_expense_patch).
+
+    uv run python -m pytest -q tests/test_database.py
+    uv run python tests/test_database.py
+
+테스트마다 임시 디렉터리에 새 DB를 만들어(init_db) 실제 SQLite 트리거를 그대로 거칩니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import database
+from config import get_flat_categories
+from core.cube import LedgerCube
+
+SPENDERS = ["공동", "남편", "아내"]
+
+
+def fresh_db() -> None:
+    database.DB_NAME = os.path.join(tempfile.mkdtemp(), "ledger.db")
+    database.init_db()
+
+
+def random_entries(rng, n: int) -> list[dict]:
+    categories = get_flat_categories() + ["미분류"]
+    days = pd.date_range("2026-08-01", "2026-10-31").strftime("%Y-%m-%d").tolist()
+    return [
+        {
+            "date":     days[rng.integers(len(days))],
+            "item":     f"항목{i}",
+            "amount":   int(rng.integers(1, 200)) * 500,
+            "category": categories[rng.integers(len(categories))],
+            "spender":  SPENDERS[rng.integers(len(SPENDERS))],
+        }
+        for i in range(n)
+    ]
+
+
+def query(sql: str, params=()) -> pd.DataFrame:
+    conn = database.get_connection()
+    try:
+        return pd.read_sql(sql, conn, params=params)
+    finally:
+        conn.close()
+
+
+def execute(sql: str, params=()) -> None:
+    conn = database.get_connection()
+    try:
+        conn.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def expense_ids() -> list[int]:
+    return query("SELECT id FROM expenses ORDER BY id")["id"].tolist()
+
+
+# ── data_versions ──────────────────────────────────────────────
+
+def test_data_version_bumps_on_every_write_path():
+    fresh_db()
+    assert database.get_data_version() == 0
+    database.insert_expense(random_entries(np.random.default_rng(0), 3))
+    assert database.get_data_version() == 3                  # 행 트리거: 삽입 1건당 +1
+    first = expense_ids()[0]
+    database.update_expense(first, "amount", 1234)
+    assert database.get_data_version() == 4
+    database.delete_expense(first)
+    assert database.get_data_version() == 5
+    execute("UPDATE expenses SET item = '직접 수정'")          # 함수 밖 쓰기도 트리거가 잡음
+    assert database.get_data_version() == 7
+
+
+# ── expense_changes · get_cube ─────────────────────────────────
+
+def random_edits(rng, rounds: int) -> None:
+    """추가 · 금액/카테고리/날짜/지출자 수정 · 삭제를 무작위로 섞어 실행."""
+    for _ in range(rounds):
+        ids = expense_ids()
+        action = rng.integers(4)
+        if action == 0 or not ids:
+            database.insert_expense(random_entries(rng, int(rng.integers(1, 4))))
+        elif action == 1:
+            database.delete_expense(ids[rng.integers(len(ids))])
+        else:
+            target = ids[rng.integers(len(ids))]
+            column = ["amount", "category", "date", "spender"][rng.integers(4)]
+            value = random_entries(rng, 1)[0][column]
+            database.update_expense(target, column, value)
+
+
+def assert_cube_matches_table(cube) -> None:
+    want = LedgerCube.from_frame(query("SELECT date, category, spender, amount FROM expenses"))
+    for axis in ("month", "category", "spender"):
+        pd.testing.assert_series_equal(cube.rollup(axis).sort_index(), want.rollup(axis).sort_index())
+    assert cube.sum() == want.sum() and cube.total_count() == want.total_count()
+
+
+def test_change_log_replays_to_current_table():
+    fresh_db()
+    random_edits(np.random.default_rng(1), 200)
+    log = query("SELECT date, category, spender, amount, sign FROM expense_changes ORDER BY seq")
+    replayed = LedgerCube()
+    replayed.apply(log["date"], log["category"], log["spender"], log["amount"], log["sign"])
+    assert_cube_matches_table(replayed)
+
+
+def test_get_cube_stays_in_sync_incrementally():
+    fresh_db()
+    rng = np.random.default_rng(2)
+    cube = database.get_cube()
+    for _ in range(20):
+        random_edits(rng, 10)
+        assert database.get_cube() is cube                    # 같은 큐브에 변경분만 더함
+        assert_cube_matches_table(cube)
+
+
+def test_get_cube_rebuilds_after_log_truncation():
+    fresh_db()
+    rng = np.random.default_rng(3)
+    keep = database.CHANGE_LOG_KEEP
+    database.CHANGE_LOG_KEEP = 5
+    try:
+        cube = database.get_cube()
+        database.insert_expense(random_entries(rng, 30))
+        database.get_cube()                                   # 로그가 한도의 2배를 넘어 앞부분 삭제
+        assert len(query("SELECT seq FROM expense_changes")) == database.CHANGE_LOG_KEEP
+        database._CUBE["seq"] = 0                             # 삭제된 구간을 놓친 큐브
+        rebuilt = database.get_cube()
+        assert rebuilt is not cube
+        assert_cube_matches_table(rebuilt)
+    finally:
+        database.CHANGE_LOG_KEEP = keep
+
+
+# ── daily_totals ───────────────────────────────────────────────
+
+def expected_daily_totals() -> pd.DataFrame:
+    """expenses × 현재 categories.type을 직접 groupby 한 일별 합계 (트리거 결과와 비교용)."""
+    df = query(
+        "SELECT substr(e.date, 1, 10) AS date, COALESCE(e.spender, '공동') AS spender, "
+        "COALESCE(NULLIF(c.type, ''), '미분류') AS type, COALESCE(e.amount, 0) AS amount "
+        "FROM expenses e LEFT JOIN categories c ON c.name = e.category"
+    )
+    return (
+        df.groupby(["date", "spender", "type"]).agg(amount=("amount", "sum"), count=("amount", "size"))
+        .reset_index().astype({"amount": "int64", "count": "int64"})
+    )
+
+
+def assert_daily_totals_match() -> None:
+    got = query("SELECT date, spender, type, amount, count FROM daily_totals ORDER BY date, spender, type")
+    want = expected_daily_totals().sort_values(["date", "spender", "type"], ignore_index=True)
+    pd.testing.assert_frame_equal(got.astype({"amount": "int64", "count": "int64"}), want)
+
+
+def test_daily_totals_follow_expense_writes():
+    fresh_db()
+    rng = np.random.default_rng(4)
+    for _ in range(10):
+        random_edits(rng, 20)
+        assert_daily_totals_match()
+    first = expense_ids()[0]
+    database.update_expense(first, "amount", None)            # NULL 금액은 0원 1건
+    assert_daily_totals_match()
+    for expense_id in expense_ids():
+        database.delete_expense(expense_id)
+    assert query("SELECT * FROM daily_totals").empty            # 건수 0인 칸은 남지 않음
+
+
+def test_daily_totals_follow_category_type_changes():
+    fresh_db()
+    rng = np.random.default_rng(5)
+    entries = random_entries(rng, 60)
+    for entry in entries[:20]:
+        entry["category"] = "새 카테고리"                       # 카테고리 등록 전 지출 = 미분류
+    database.insert_expense(entries)
+    assert_daily_totals_match()
+    database.add_category("새 카테고리", "선택소비 (Wants)")
+    assert_daily_totals_match()
+    execute("UPDATE categories SET type = '필수소비 (Needs)' WHERE name = '새 카테고리'")
+    assert_daily_totals_match()
+    execute("UPDATE categories SET type = '' WHERE name = '쇼핑'")
+    assert_daily_totals_match()
+    database.delete_category_safe("교통비")
+    assert_daily_totals_match()
+    assert set(query("SELECT type FROM daily_totals")["type"]) <= {"필수소비 (Needs)", "선택소비 (Wants)", "미분류"}
+
+
+def test_daily_totals_backfill_is_idempotent():
+    fresh_db()
+    database.insert_expense(random_entries(np.random.default_rng(6), 100))
+    before = query("SELECT * FROM daily_totals ORDER BY date, spender, type")
+    for _ in range(2):
+        execute(database.MIGRATIONS[16])
+    pd.testing.assert_frame_equal(query("SELECT * FROM daily_totals ORDER BY date, spender, type"), before)
+    assert_daily_totals_match()
+
+
+# ── load_expense_page ─────────────────────────────────────────
+
+def walk_pages(sort_col: str, descending: bool, limit: int, **filters) -> list[int]:
+    ids, after = [], None
+    while True:
+        page = database.load_expense_page(sort_col=sort_col, descending=descending, after=after, limit=limit, **filters)
+        ids += page["id"].tolist()
+        if len(page) < limit:
+            return ids
+        after = database.expense_page_cursor(page.iloc[-1], sort_col)
+
+
+def test_keyset_pages_match_full_sort():
+    fresh_db()
+    rng = np.random.default_rng(7)
+    entries = random_entries(rng, 250)
+    for entry in entries[::7]:
+        entry["amount"] = None                                 # NULL 금액은 0원 자리에 정렬
+    for entry in entries[::5]:
+        entry["amount"] = 5000                                 # 같은 키가 페이지 경계에 걸리도록
+    database.insert_expense(entries)
+    df = query("SELECT id, date, item, amount, category, spender FROM expenses")
+    df["amount_key"] = df["amount"].fillna(0)
+    cases = [
+        {},
+        {"month_str": "2026-09"},
+        {"spender_filter": "아내", "category": "쇼핑"},
+        {"search": "항목1"},
+    ]
+    for filters in cases:
+        mask = pd.Series(True, index=df.index)
+        if "month_str" in filters:
+            mask &= df["date"].str.startswith(filters["month_str"])
+        if "spender_filter" in filters:
+            mask &= (df["spender"] == filters["spender_filter"]) & (df["category"] == filters["category"])
+        if "search" in filters:
+            mask &= df["item"].str.contains(filters["search"])
+        subset = df[mask]
+        assert database.count_expenses(**filters) == len(subset)
+        for sort_col, key in (("date", "date"), ("amount", "amount_key")):
+            for descending in (True, False):
+                want = subset.sort_values([key, "id"], ascending=not descending)["id"].tolist()
+                for limit in (3, 100):
+                    assert walk_pages(sort_col, descending, limit, **filters) == want, (filters, sort_col, descending, limit)
+
+
+def test_unknown_sort_column_is_rejected():
+    fresh_db()
+    try:
+        database.load_expense_page(sort_col="item; DROP TABLE expenses")
+    except ValueError:
+        return
+    raise AssertionError("정렬 열 검증 없음")
+
+
+# ── apply_expense_patch ───────────────────────────────────────
+
+def test_patch_applies_updates_inserts_and_deletes_together():
+    fresh_db()
+    rng = np.random.default_rng(8)
+    ids = database.insert_expense_returning_ids(random_entries(rng, 5))
+    assert ids == expense_ids()
+    extra = random_entries(rng, 2)
+    ok = database.apply_expense_patch(
+        updates=[(ids[0], "amount", 9900), (ids[1], "category", "교통비")],
+        inserts=extra,
+        deletes=[ids[2]],
+    )
+    assert ok
+    rows = query("SELECT * FROM expenses ORDER BY id").set_index("id")
+    assert rows.loc[ids[0], "amount"] == 9900 and rows.loc[ids[1], "category"] == "교통비"
+    assert ids[2] not in rows.index and len(rows) == 6
+    assert rows["item"].iloc[-2:].tolist() == [e["item"] for e in extra]
+    assert_daily_totals_match()
+
+
+def test_patch_rolls_back_on_any_failure():
+    fresh_db()
+    rng = np.random.default_rng(9)
+    ids = database.insert_expense_returning_ids(random_entries(rng, 3))
+    before = query("SELECT * FROM expenses ORDER BY id")
+    version = database.get_data_version()
+    bad_patches = [
+        {"updates": [(ids[0], "amount", 1), (ids[1], "id", 999)]},             # 허용되지 않은 열
+        {"updates": [(ids[0], "amount", 1)], "inserts": [{"item": "날짜 없음"}]},
+        {"deletes": [ids[0]], "inserts": [dict(random_entries(rng, 1)[0], date=None)]},   # NOT NULL 위반
+    ]
+    for patch in bad_patches:
+        assert database.apply_expense_patch(**patch) is False, patch
+        pd.testing.assert_frame_equal(query("SELECT * FROM expenses ORDER BY id"), before)
+    assert database.get_data_version() == version
+    assert_daily_totals_match()
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
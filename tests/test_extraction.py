@@ -0,0 +1,131 @@
+# tests/test_extraction.py
+"""
+core.extraction의 응답 파싱(JsonItemStream · salvage_items)과 깨진 조각 복구(repair_fragments) 검사.
+
+    uv run python -m pytest -q tests/test_extraction.py
+    uv run python tests/test_extraction.py
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.extraction import (
+    MAX_REPAIR_ATTEMPTS, JsonItemStream, parse_expense_response, repair_fragments, salvage_items,
+)
+
+ITEMS = [
+    {"date": "2026-10-01", "item": "스타벅스 {라떼}", "amount": 4500, "category": "외식/음료"},
+    {"date": "2026-10-01", "item": "택시 \"심야\"", "amount": "12,300", "category": "교통"},
+    {"date": "2026-10-02", "item": "이마트\\장보기", "amount": 56000, "category": "식비"},
+]
+BROKEN = '{"date": "2026-10-02", "item": "약국", "amount": 9,000원, "category": "의료"}'
+RESPONSE = (
+    "다음은 추출 결과입니다.\n```json\n[\n"
+    + ",\n".join(json.dumps(i, ensure_ascii=False) for i in ITEMS[:2])
+    + ",\n" + BROKEN + ",\n"
+    + json.dumps(ITEMS[2], ensure_ascii=False)
+    + "\n]\n```\n끝."
+)
+
+
+def feed_in_chunks(text: str, sizes) -> tuple[list[dict], list[str]]:
+    stream = JsonItemStream()
+    items, pos = [], 0
+    for size in sizes:
+        items += stream.feed(text[pos:pos + size])
+        pos += size
+    items += stream.feed(text[pos:])
+    return items, stream.close()
+
+
+def test_salvage_keeps_valid_items_around_broken_one():
+    items, failed = salvage_items(RESPONSE)
+    assert items == ITEMS
+    assert failed == [BROKEN]
+
+
+def test_chunk_boundaries_do_not_change_result():
+    # 문자열 안 중괄호·이스케이프된 따옴표·역슬래시가 조각 경계에 걸려도 결과가 같아야 함
+    whole = salvage_items(RESPONSE)
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        sizes = rng.integers(1, 12, len(RESPONSE)).tolist()
+        assert feed_in_chunks(RESPONSE, sizes) == whole
+    assert feed_in_chunks(RESPONSE, [1] * len(RESPONSE)) == whole
+
+
+def test_items_are_emitted_as_soon_as_closed():
+    stream = JsonItemStream()
+    first = json.dumps(ITEMS[0], ensure_ascii=False)
+    assert stream.feed("[" + first[:-1]) == []
+    assert stream.feed("}, {") == [ITEMS[0]]
+    assert stream.close() == ["{"]
+
+
+def test_invalid_objects_go_to_failed():
+    text = '{"item": "금액 없음"} {"item": "x", "amount": "삼천"} {"item": "ok", "amount": 3000}'
+    items, failed = salvage_items(text)
+    assert items == [{"item": "ok", "amount": 3000}]
+    assert failed == ['{"item": "금액 없음"}', '{"item": "x", "amount": "삼천"}']
+
+
+def test_truncated_tail_is_reported_on_close():
+    items, failed = salvage_items('[{"item": "a", "amount": 1}, {"item": "b", "amo')
+    assert items == [{"item": "a", "amount": 1}]
+    assert failed == ['{"item": "b", "amo']
+    assert salvage_items("") == ([], [])
+    assert salvage_items(None) == ([], [])
+
+
+def test_repair_retries_each_fragment_up_to_limit():
+    calls = []
+
+    def generate_text(prompt):
+        calls.append(prompt)
+        if "약국" in prompt and len([c for c in calls if "약국" in c]) == 1:
+            return "죄송합니다, 다시 시도하겠습니다."
+        if "고칠 수 없음" in prompt:
+            raise RuntimeError("모델 오류")
+        return '```json\n{"date": "2026-10-02", "item": "약국", "amount": 9000, "category": "의료"}\n```'
+
+    recovered = repair_fragments([BROKEN, "{고칠 수 없음"], generate_text)
+    assert recovered == [{"date": "2026-10-02", "item": "약국", "amount": 9000, "category": "의료"}]
+    # 첫 조각: 실패 1회 + 성공 1회, 둘째 조각: 매번 예외 → 한도까지 시도 후 포기
+    assert len(calls) == 2 + MAX_REPAIR_ATTEMPTS
+    assert all(BROKEN in c for c in calls[:2])
+
+
+def test_parse_response_repairs_only_broken_fragments():
+    prompts = []
+
+    def generate_text(prompt):
+        prompts.append(prompt)
+        return '{"item": "약국", "amount": 9000, "category": "의료"}'
+
+    entries = parse_expense_response(RESPONSE, "아내", "2026-10-19", generate_text=generate_text)
+    assert len(prompts) == 1 and BROKEN in prompts[0]
+    assert [e["amount"] for e in entries] == [4500, 12300, 56000, 9000]
+    assert {e["spender"] for e in entries} == {"아내"}
+    assert entries[-1]["date"] == "2026-10-19"       # 날짜가 빠진 복구 항목은 오늘 날짜
+
+
+def test_parse_response_without_items_raises():
+    for text in ("", "항목이 없습니다", BROKEN):
+        try:
+            parse_expense_response(text, "공동", "2026-10-19")
+        except ValueError:
+            continue
+        raise AssertionError(text)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
@@ -0,0 +1,132 @@
+# tests/test_finance.py
+"""
+core.finance 목표 역산(required_saving · earliest_month · required_return)이
+calculate_total_equity로 되돌려 계산했을 때 목표에 맞게 닿는지,
+몬테카를로 목표 달성 확률(simulate_goal_probability)의 결정적 경우·재현성·병렬 불변성을 검사합니다.
+
+    uv run python -m pytest -q tests/test_finance.py
+    uv run python tests/test_finance.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.finance import (
+    MC_CHUNK, calculate_total_equity, earliest_month, required_return, required_saving,
+    simulate_goal_probability,
+)
+
+TRIALS = 300
+
+
+def equity(saving, r_annual, n_months, current_investment, fixed_assets) -> float:
+    return calculate_total_equity(saving, r_annual, int(n_months), current_investment, fixed_assets, 0.0)
+
+
+def random_goal(rng):
+    """(목표, 연수익률, 개월, 현재 투자자산, 고정자산) — 수익률 0과 이미 닿은 목표 포함."""
+    return (
+        float(rng.uniform(1e8, 2e9)),
+        float(rng.choice([0.0, rng.uniform(0.001, 0.2)])),
+        int(rng.integers(1, 481)),
+        float(rng.choice([0.0, rng.uniform(0, 5e8)])),
+        float(rng.choice([0.0, rng.uniform(0, 1e9)])),
+    )
+
+
+def test_required_saving_reaches_target_exactly():
+    rng = np.random.default_rng(0)
+    for _ in range(TRIALS):
+        target, r, n, pv, fixed = random_goal(rng)
+        s = float(required_saving(target, r, n, pv, fixed))
+        got = equity(s, r, n, pv, fixed)
+        if s > 0:
+            assert abs(got - target) <= 1e-6 * target, (target, r, n, pv, fixed, s, got)
+        else:
+            assert equity(0, r, n, pv, fixed) >= target
+    assert required_saving(1e9, 0.05, 0, 1e8) == np.inf        # 기간 0인데 모자람
+    assert required_saving(1e8, 0.05, 0, 1e8) == 0
+
+
+def test_earliest_month_is_first_month_reaching_target():
+    rng = np.random.default_rng(1)
+    for _ in range(TRIALS):
+        target, r, _, pv, fixed = random_goal(rng)
+        s = float(rng.uniform(0, 1e7))
+        m = float(earliest_month(target, s, r, pv, fixed))
+        if m == np.inf:
+            assert equity(s, r, 1200, pv, fixed) < target
+            continue
+        assert equity(s, r, m, pv, fixed) >= target * (1 - 1e-9), (target, s, r, pv, fixed, m)
+        if m > 0:
+            assert equity(s, r, m - 1, pv, fixed) < target, (target, s, r, pv, fixed, m)
+    assert earliest_month(1e9, 0, 0.0, 1e8) == np.inf              # 저축·수익 없음
+    assert earliest_month(1e8, 0, 0.0, 1e8) == 0
+
+
+def test_required_return_reaches_target_within_tolerance():
+    rng = np.random.default_rng(2)
+    for _ in range(TRIALS):
+        target, _, n, pv, fixed = random_goal(rng)
+        s = float(rng.uniform(0, 5e6))
+        r = float(required_return(target, s, n, pv, fixed))
+        if np.isnan(r):
+            assert equity(s, 0.5, n, pv, fixed) < target            # 연 50%로도 못 닿음
+        elif r == 0:
+            assert equity(s, 0.0, n, pv, fixed) >= target
+        else:
+            assert abs(equity(s, r, n, pv, fixed) - target) <= 1.0, (target, s, n, pv, fixed, r)
+
+
+def test_solvers_broadcast_over_targets():
+    targets = np.array([[3e8], [6e8], [9e8]])
+    months = np.array([60, 120, 240])
+    assert required_saving(targets, 0.05, months, 1e8).shape == (3, 3)
+    assert earliest_month(targets, 2e6, 0.05, 1e8).shape == (3, 1)
+    got = required_return(targets, 2e6, months, 1e8)
+    assert got.shape == (3, 3)
+    for (i, j), r in np.ndenumerate(got):
+        assert r == required_return(float(targets[i, 0]), 2e6, int(months[j]), 1e8) or np.isnan(r)
+
+
+def test_simulation_without_volatility_is_deterministic():
+    # 수익률 변동 0 · 저축액 하나 · 주택가격 고정 → 모든 경로가 calculate_total_equity와 같은 값
+    want = equity(2_000_000, 0.06, 120, 1e8, 3e8)
+    for target, prob in ((want * 0.999, 100.0), (want * 1.001, 0.0)):
+        result = simulate_goal_probability(target, 120, [2_000_000], 1e8, 3e8, r_vol=0.0, n_paths=1000)
+        assert result["prob"] == prob
+        for key in ("p10", "p50", "p90"):
+            assert abs(result[key] - want) <= 1e-6 * want
+
+
+def test_simulation_is_reproducible_and_worker_invariant():
+    args = dict(target_equity=8e8, n_months=120, saving_samples=[1_500_000, 2_000_000, 3_000_000],
+                current_investment=1e8, fixed_assets=2e8, price_growth=0.02, price_vol=0.05,
+                n_paths=3 * MC_CHUNK + 123)
+    first = simulate_goal_probability(**args, seed=7)
+    assert simulate_goal_probability(**args, seed=7) == first
+    assert simulate_goal_probability(**args, seed=7, workers=4) == first   # 묶음별 난수열 → 병렬과 같음
+    assert simulate_goal_probability(**args, seed=8) != first
+    assert first["n_paths"] == args["n_paths"]
+
+
+def test_simulation_interval_and_monotonicity():
+    probs = []
+    for target in (4e8, 6e8, 8e8, 1e9, 1.5e9):
+        result = simulate_goal_probability(target, 120, [2_000_000], 1e8, 2e8, n_paths=20_000, seed=1)
+        assert 0 <= result["ci_low"] <= result["prob"] <= result["ci_high"] <= 100
+        assert result["p10"] <= result["p50"] <= result["p90"]
+        probs.append(result["prob"])
+    assert probs == sorted(probs, reverse=True) and probs[0] > probs[-1]   # 같은 경로 → 목표가 클수록 확률 감소
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
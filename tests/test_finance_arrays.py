@@ -0,0 +1,129 @@
+# tests/test_finance_arrays.py
+"""
+core.finance / core.real_estate 배열 버전(*_array)이 스칼라 함수와 같은 값을 내는지 검사합니다.
+
+    uv run python -m pytest -q tests/test_finance_arrays.py
+    uv run python tests/test_finance_arrays.py
+
+시행마다 무작위 모양(스칼라 · 1차원 · 서로 브로드캐스트되는 2차원 조합)과 무작위 값
+(수익률 0 · 음수 수익률 · 0에 아주 가까운 수익률 · 0개월 같은 경계값 포함)을 뽑아
+배열 결과를 원소마다 스칼라 함수와 비교합니다. 시드가 고정되어 있어 실패는 항상 재현됩니다.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.finance import (
+    calculate_asset_fv, calculate_asset_fv_array,
+    calculate_fv, calculate_fv_array,
+    calculate_max_loan, calculate_max_loan_array,
+    opportunity_cost, opportunity_cost_array,
+)
+from core.real_estate import project_price, project_price_array
+
+TRIALS = 500
+RTOL = 1e-9
+
+# 수익률 경계값: 0(별도 분기), 음수, 0에 아주 가까운 값
+EDGE_RATES = np.array([0.0, 0.0, -0.02, 1e-12])
+
+
+def money(rng, shape):
+    return rng.choice([0.0, 1.0, 3_250_000.0, 5e8, -1e6], shape) * rng.uniform(0.5, 2.0, shape)
+
+
+def rates(rng, shape):
+    r = rng.uniform(-0.1, 0.3, shape)
+    edge = rng.random(shape) < 0.2
+    return np.where(edge, rng.choice(EDGE_RATES, shape), r)
+
+
+def months(rng, shape):
+    return rng.integers(0, 481, shape)
+
+
+def years(rng, shape):
+    return rng.integers(0, 41, shape)
+
+
+# 함수 이름 → (스칼라, 배열, 인자별 표본 생성기)
+CASES = {
+    "calculate_fv":       (calculate_fv, calculate_fv_array, (money, rates, months)),
+    "calculate_asset_fv": (calculate_asset_fv, calculate_asset_fv_array, (money, rates, months)),
+    "calculate_max_loan": (calculate_max_loan, calculate_max_loan_array, (money, rates, years)),
+    "opportunity_cost":   (opportunity_cost, opportunity_cost_array, (money, rates, years)),
+    "project_price":      (project_price, project_price_array, (money, rates, years)),
+}
+
+
+def random_shapes(rng, n_args):
+    """인자마다 (), (k,), (m, 1), (1, k) 중 하나 — 서로 브로드캐스트되는 조합."""
+    m, k = rng.integers(1, 6, 2)
+    pool = [(), (k,), (m, 1), (1, k)]
+    return [pool[i] for i in rng.integers(0, len(pool), n_args)]
+
+
+def sample(gen, rng, shape):
+    value = gen(rng, shape)
+    return value.item() if shape == () else value
+
+
+def random_args(gens, rng):
+    return [sample(g, rng, s) for g, s in zip(gens, random_shapes(rng, len(gens)))]
+
+
+def assert_close(got, want, context):
+    assert abs(got - want) <= RTOL * max(1.0, abs(want)), (*context, got, want)
+
+
+def test_array_matches_scalar_elementwise():
+    rng = np.random.default_rng(0)
+    for name, (scalar, vector, gens) in CASES.items():
+        for _ in range(TRIALS):
+            args = random_args(gens, rng)
+            got = np.asarray(vector(*args))
+            it = np.nditer([np.asarray(a) for a in args], flags=["multi_index"])
+            for values in it:
+                point = [v.item() for v in values]
+                assert_close(got[it.multi_index], scalar(*point), (name, point))
+
+
+def test_broadcast_shape():
+    rng = np.random.default_rng(1)
+    for name, (_, vector, gens) in CASES.items():
+        for _ in range(TRIALS):
+            args = random_args(gens, rng)
+            assert np.shape(vector(*args)) == np.broadcast_shapes(*(np.shape(a) for a in args)), name
+
+
+def test_scalar_inputs_return_float():
+    rng = np.random.default_rng(2)
+    for name, (scalar, vector, gens) in CASES.items():
+        for _ in range(TRIALS):
+            args = [g(rng, ()).item() for g in gens]
+            got = vector(*args)
+            assert np.ndim(got) == 0 and isinstance(got, float), (name, args, type(got))
+            assert_close(got, scalar(*args), (name, args))
+
+
+def test_zero_rate_branch():
+    # r = 0은 식이 0/0이 되므로 스칼라와 같이 별도 분기(pmt·n, 한도/12·n)를 타야 함
+    n = np.arange(0, 481, 12)
+    np.testing.assert_array_equal(calculate_fv_array(1_000_000, 0.0, n), 1_000_000.0 * n)
+    np.testing.assert_array_equal(
+        calculate_max_loan_array(5_000_000, 0.0, n // 12),
+        [calculate_max_loan(5_000_000, 0.0, int(y)) for y in n // 12],
+    )
+    assert np.isfinite(calculate_fv_array(1_000_000, [0.0, 0.05], [0, 0])).all()
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
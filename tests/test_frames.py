@@ -0,0 +1,147 @@
+# tests/test_frames.py
+"""
+core.frames 검사: SessionView 오버레이(수정·삭제)를 접은 프레임이 DB를 다시 읽은 프레임과 같은지,
+공유 프레임이 제자리 수정되지 않는지, SharedFrames의 버전 교체·동시 로드.
+
+    uv run python -m pytest -q tests/test_frames.py
+    uv run python tests/test_frames.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import database
+from core.frames import SessionView, SharedFrames
+
+MONTH = "2026-10"
+CATEGORIES = ["생활소비", "교통비", "쇼핑", "외식/음료/간식"]
+
+
+def fresh_db(rng, n: int) -> None:
+    database.DB_NAME = os.path.join(tempfile.mkdtemp(), "ledger.db")
+    database.init_db()
+    database.SHARED_FRAMES = SharedFrames()
+    database.insert_expense([
+        {
+            "date":     f"{MONTH}-{int(rng.integers(1, 32)):02d}",
+            "item":     f"항목{i}",
+            "amount":   int(rng.integers(1, 200)) * 500,
+            "category": CATEGORIES[rng.integers(len(CATEGORIES))],
+            "spender":  "공동",
+        }
+        for i in range(n)
+    ])
+
+
+def by_id(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values("id", ignore_index=True)
+
+
+def test_folded_overlay_equals_reload():
+    rng = np.random.default_rng(0)
+    fresh_db(rng, 200)
+    base, version = database.load_shared(MONTH)
+    snapshot = base.copy(deep=True)
+    view = SessionView(base, version)
+    ids = base["id"].tolist()
+    # 대시보드 편집기처럼 DB에 쓰고 같은 변경을 오버레이에도 기록 (키 열이 아닌 수정·삭제)
+    for _ in range(60):
+        target = ids[rng.integers(len(ids))]
+        if target in view.deleted:
+            continue
+        if rng.random() < 0.2:
+            database.delete_expense(target)
+            view.delete(target)
+            continue
+        column = ["amount", "category", "item"][rng.integers(3)]
+        value = {
+            "amount":   int(rng.integers(1, 200)) * 100,
+            "category": CATEGORIES[rng.integers(len(CATEGORIES))],
+            "item":     f"수정{rng.integers(1000)}",
+        }[column]
+        database.update_expense(target, column, value)
+        view.edit(target, column, value)
+
+    # 그 사이 쓰기는 이 세션 것뿐 → 접어도 되는 조건
+    assert view.version + view.pending_ops == database.get_data_version()
+    folded = view.materialize()
+    reloaded, _ = database.load_shared(MONTH)
+    assert reloaded is not base
+    pd.testing.assert_frame_equal(by_id(folded), by_id(reloaded), check_dtype=False)
+    pd.testing.assert_frame_equal(base, snapshot)               # 공유 프레임은 그대로
+
+
+def test_frame_is_private_and_cached_until_overlay_changes():
+    rng = np.random.default_rng(1)
+    fresh_db(rng, 20)
+    base, version = database.load_shared(MONTH)
+    view = SessionView(base, version)
+    frame = view.frame()
+    frame["소비성향"] = "x"                                     # 세션 파생 열
+    assert "소비성향" not in base.columns
+    assert view.frame() is frame
+    target = base["id"].iloc[3]
+    view.edit(target, "amount", 1)
+    patched = view.frame()
+    assert patched is not frame
+    assert patched.loc[patched["id"] == target, "amount"].item() == 1
+    assert base.loc[base["id"] == target, "amount"].item() != 1
+    # 수정되지 않은 열은 공유 프레임 배열을 그대로 씀 (얕은 복사)
+    assert np.shares_memory(patched["id"].to_numpy(), base["id"].to_numpy())
+
+
+def test_overlay_ignores_rows_outside_the_frame():
+    rng = np.random.default_rng(2)
+    fresh_db(rng, 10)
+    base, version = database.load_shared(MONTH)
+    view = SessionView(base, version)
+    view.edit(10_000, "amount", 1)
+    view.delete(20_000)
+    pd.testing.assert_frame_equal(view.materialize(), base)
+
+
+def test_shared_frames_versioning():
+    frames = SharedFrames()
+    a1, b1, a2 = (pd.DataFrame({"v": [i]}) for i in range(3))
+    assert frames.get("a", 1, lambda: a1) is a1
+    assert frames.get("a", 1, lambda: a2) is a1                 # 같은 버전은 캐시
+    frames.put("b", 1, b1)
+    frames.put("a", 2, a2)                                      # 새 버전 → 더 오래된 키 전부 버림
+    assert frames.get("b", 2, lambda: None) is None
+    frames.put("a", 1, a1)                                      # 늦게 도착한 옛 버전은 무시
+    assert frames.get("a", 2, lambda: a1) is a2
+
+
+def test_shared_frames_load_once_under_concurrency():
+    frames = SharedFrames()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return pd.DataFrame({"v": [1]})
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(frames.get("k", 1, loader))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and frames.loads == 1
+    assert all(r is results[0] for r in results)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
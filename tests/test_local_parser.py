@@ -0,0 +1,71 @@
+# tests/test_local_parser.py
+"""
+core.local_parser(규칙 기반 fast-path) 검사: 단위·구분자·날짜 표현·confidence 점수.
+
+    uv run python -m pytest -q tests/test_local_parser.py
+    uv run python tests/test_local_parser.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.local_parser import ACCEPT_CONFIDENCE, CATEGORY_KEYWORDS, parse_local
+
+CATEGORIES = list(CATEGORY_KEYWORDS) + ["기타"]
+TODAY = "2026-10-19"
+
+
+def entry(item, amount, category="기타", date=TODAY):
+    return {"date": date, "item": item, "amount": amount, "category": category}
+
+
+def test_units_and_separators():
+    items, confidence = parse_local("커피 4500원, 택시 1.2만원\n선물 3천원; 관리비 23만 원", CATEGORIES, TODAY)
+    assert [(i["item"], i["amount"]) for i in items] == [
+        ("커피", 4500), ("택시", 12_000), ("선물", 3_000), ("관리비", 230_000),
+    ]
+    assert [i["category"] for i in items] == ["외식/음료/간식", "교통비", "경조/교제비", "공과금/주거"]
+    assert confidence == 1.0 >= ACCEPT_CONFIDENCE
+
+
+def test_dictation_without_commas_splits_after_won():
+    items, _ = parse_local("스타벅스 4500원 택시 12,000원", CATEGORIES, TODAY)
+    assert [(i["item"], i["amount"]) for i in items] == [("스타벅스", 4500), ("택시", 12_000)]
+
+
+def test_relative_and_month_day_dates():
+    items, _ = parse_local("어제 점심 9,000원\n그저께 약국 5000원\n10/3 주유 5만원\n9월 28일 책 15000원", CATEGORIES, TODAY)
+    assert [i["date"] for i in items] == ["2026-10-18", "2026-10-17", "2026-10-03", "2026-09-28"]
+    assert [i["item"] for i in items] == ["점심", "약국", "주유", "책"]
+
+
+def test_confidence_levels():
+    # 카테고리 미확정 0.6, 금액 없는 세그먼트 0, 금액이 여럿인 세그먼트 0.3 → 평균
+    items, confidence = parse_local("무언가 5000원", CATEGORIES, TODAY)
+    assert items == [entry("무언가", 5000)] and confidence == 0.6
+    items, confidence = parse_local("커피 4500원, 뭔가 샀음", CATEGORIES, TODAY)
+    assert len(items) == 1 and confidence == 0.5
+    items, confidence = parse_local("커피 2잔 9000원", CATEGORIES, TODAY)
+    assert items == [entry("커피 2잔", 9000, "외식/음료/간식")] and confidence == 1.0
+    items, confidence = parse_local("택시 1만원 2만원", CATEGORIES, TODAY)
+    assert confidence < ACCEPT_CONFIDENCE
+
+
+def test_category_must_be_in_user_list():
+    items, confidence = parse_local("커피 4500원", ["교통비"], TODAY)
+    assert items == [entry("커피", 4500)] and confidence == 0.6
+
+
+def test_nothing_to_parse():
+    for text in ("", None, "   ", "뭔가 샀음", "오늘 12345"):
+        assert parse_local(text, CATEGORIES, TODAY) == ([], 0.0)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
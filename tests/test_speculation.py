@@ -0,0 +1,80 @@
+# tests/test_speculation.py
+"""
+core.speculation 검사: 로컬 미리보기 항목과 LLM 항목 짝짓기(match_entries), 보정 계획(reconcile).
+
+    uv run python -m pytest -q tests/test_speculation.py
+    uv run python tests/test_speculation.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.speculation import FIELDS, match_entries, reconcile
+
+TODAY = "2026-10-19"
+
+
+def entry(item, amount, category="기타", date=TODAY):
+    return {"date": date, "item": item, "amount": amount, "category": category}
+
+
+def test_match_prefers_equal_amounts_then_order():
+    local = [entry("커피", 4500), entry("택시", 12_000), entry("빵", 3000)]
+    final = [entry("택시비", 12_000), entry("카페라떼", 5000), entry("베이커리", 3000), entry("껌", 1000)]
+    assert sorted(match_entries(local, final), key=str) == sorted(
+        [(1, 0), (2, 2), (0, 1), (None, 3)], key=str,
+    )
+    assert match_entries(local, []) == [(0, None), (1, None), (2, None)]
+    assert match_entries([], final[:2]) == [(None, 0), (None, 1)]
+
+
+def test_every_index_is_paired_exactly_once():
+    local = [entry(f"l{i}", a) for i, a in enumerate([1000, 1000, 2000, 3000, 5000])]
+    final = [entry(f"f{i}", a) for i, a in enumerate([2000, 1000, 4000, 1000, 1000, 7000])]
+    pairs = match_entries(local, final)
+    assert sorted(i for i, _ in pairs if i is not None) == list(range(len(local)))
+    assert sorted(j for _, j in pairs if j is not None) == list(range(len(final)))
+
+
+def test_reconcile_hit_when_identical():
+    local = [entry("커피", 4500, "외식/음료/간식")]
+    plan = reconcile(local, [dict(local[0])], ids=[7])
+    assert plan["hit"] and plan["field_accuracy"] == 1.0
+    assert plan["updates"] == plan["inserts"] == plan["deletes"] == [] and plan["patched_fields"] == 0
+
+
+def test_reconcile_plan_turns_saved_local_rows_into_final():
+    local = [entry("커피", 4500), entry("택시", 12_000), entry("영수증", 999)]
+    final = [entry("택시", 12_000, "교통비"), entry("커피", 4500, "외식/음료/간식"), entry("빵", 3000, date="2026-10-18")]
+    ids = [101, 102, 103]
+    plan = reconcile(local, final, ids)
+
+    rows = {i: dict(e) for i, e in zip(ids, local)}
+    for row_id, col, val in plan["updates"]:
+        rows[row_id][col] = val
+    for row_id in plan["deletes"]:
+        del rows[row_id]
+    result = list(rows.values()) + plan["inserts"]
+    key = lambda e: tuple(str(e[f]) for f in FIELDS)
+    assert sorted(result, key=key) == sorted(final, key=key)
+    assert not plan["hit"]
+    assert plan["patched_fields"] == len(plan["updates"]) == 2 + 3   # 카테고리 2개 + 영수증→빵 3필드
+    assert plan["field_accuracy"] == (12 - 5) / 12
+
+
+def test_reconcile_without_ids_only_scores():
+    plan = reconcile([entry("커피", 4500)], [entry("커피", 4500), entry("빵", 3000)])
+    assert plan["updates"] == [] and plan["deletes"] == []
+    assert plan["inserts"] == [entry("빵", 3000)]
+    assert plan["field_accuracy"] == 0.5 and not plan["hit"]
+    assert reconcile([], [])["field_accuracy"] == 0.0
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")